@@ -0,0 +1,6 @@
+"""
+Benchmark scripts for the document extraction system.
+
+Each module is runnable on its own, e.g.:
+    python -m benchmarks.bench_pdf_text_memory
+"""
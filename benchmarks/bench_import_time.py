@@ -0,0 +1,89 @@
+"""
+Import-time benchmark for the package entry points.
+
+Runs each entry point (the CLI's --help, `import src`, the router and
+each extractor module) in a fresh interpreter under `python -X importtime`
+and reports the total time spent importing modules plus which heavy
+libraries (PyMuPDF, python-docx, python-pptx, openpyxl, numpy, pydantic)
+were loaded. Startup should only pay for the libraries of the format
+being extracted.
+
+Usage:
+    python -m benchmarks.bench_import_time [--repeat N]
+"""
+
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Top-level modules of the document libraries behind the extractors
+HEAVY_MODULES = ("fitz", "docx", "pptx", "openpyxl", "numpy", "pydantic")
+
+# Entry point name -> interpreter arguments
+ENTRY_POINTS = {
+    "python -m src --help": ["-m", "src", "--help"],
+    "import src": ["-c", "import src"],
+    "import src.router": ["-c", "import src.router"],
+    "pdf_extractor": ["-c", "import src.extractors.pdf_extractor"],
+    "docx_extractor": ["-c", "import src.extractors.docx_extractor"],
+    "pptx_extractor": ["-c", "import src.extractors.pptx_extractor"],
+    "xlsx_extractor": ["-c", "import src.extractors.xlsx_extractor"],
+}
+
+
+def import_profile(args: list[str]) -> tuple[dict[str, int], int]:
+    """Run a fresh interpreter under -X importtime.
+
+    Args:
+        args: Interpreter arguments after `-X importtime`.
+
+    Returns:
+        (modules, total): dict of every imported module name to its
+        cumulative import time, and the summed time of all top-level
+        imports, both in microseconds.
+
+    Raises:
+        subprocess.CalledProcessError: If the interpreter fails.
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = {}
+    total = 0
+    for line in completed.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, module = line.split("|")
+        modules[module.strip()] = int(cumulative)
+        # Nested imports are indented by two spaces per level
+        if not module[1:].startswith(" "):
+            total += int(cumulative)
+    return modules, total
+
+
+def main() -> int:
+    """Profile every entry point and print a table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'entry point':<24}{'imports (ms)':>13}  libraries loaded")
+    for name, entry_args in ENTRY_POINTS.items():
+        # Best of N: the first runs also pay for a cold file cache
+        runs = [import_profile(entry_args) for _ in range(args.repeat)]
+        best = min(total for _, total in runs)
+        loaded = [module for module in HEAVY_MODULES if module in runs[0][0]]
+        print(f"{name:<24}{best / 1000:>13.1f}  {', '.join(loaded) or '-'}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,91 @@
+"""
+Peak-memory benchmark for PDF text extraction.
+
+Compares PDFExtractor.extract_text() with the lean text-only TextPage
+flags against PyMuPDF's default "dict" flags, which also decode every
+image on the page into the text dict. Uses a synthetic photo-heavy PDF
+(one incompressible image per page) so the difference is visible.
+
+Usage:
+    python -m benchmarks.bench_pdf_text_memory [--pages N] [--image-size PX]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import fitz  # pymupdf
+
+from src.extractors.pdf_extractor import PDFExtractor
+
+
+def build_photo_pdf(path: Path, pages: int, image_size: int) -> None:
+    """Write a PDF with a heading, body text and one noise image per page.
+
+    Args:
+        path: Output file path.
+        pages: Number of pages to generate.
+        image_size: Width and height of each image in pixels.
+    """
+    doc = fitz.open()
+    for page_num in range(1, pages + 1):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Photo {page_num}", fontsize=16)
+        page.insert_text((72, 100), "Caption text for the photo below.", fontsize=11)
+        # Random samples do not compress, like real photographs
+        pix = fitz.Pixmap(fitz.csRGB, image_size, image_size,
+                          os.urandom(image_size * image_size * 3), False)
+        page.insert_image(fitz.Rect(72, 120, 520, 568), pixmap=pix)
+    doc.save(path)
+    doc.close()
+
+
+def measure(path: Path, lean_text: bool) -> tuple[float, int, str]:
+    """Run extract_text once and record wall time and Python peak memory.
+
+    Args:
+        path: PDF to extract.
+        lean_text: Value passed to PDFExtractor.
+
+    Returns:
+        Tuple of (seconds, peak traced bytes, markdown).
+    """
+    extractor = PDFExtractor(path, lean_text=lean_text)
+    tracemalloc.start()
+    start = time.perf_counter()
+    markdown = extractor.extract_text()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, markdown
+
+
+def main() -> int:
+    """Build the corpus, run both modes and print a comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, default=40)
+    parser.add_argument("--image-size", type=int, default=800)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "photos.pdf"
+        build_photo_pdf(path, args.pages, args.image_size)
+        print(f"{args.pages} pages, {args.image_size}px images, "
+              f"{path.stat().st_size / 1e6:.1f} MB on disk")
+
+        full_time, full_peak, full_md = measure(path, lean_text=False)
+        lean_time, lean_peak, lean_md = measure(path, lean_text=True)
+
+    print(f"{'mode':<8}{'time (s)':>12}{'peak (MB)':>12}")
+    print(f"{'full':<8}{full_time:>12.3f}{full_peak / 1e6:>12.1f}")
+    print(f"{'lean':<8}{lean_time:>12.3f}{lean_peak / 1e6:>12.1f}")
+    print(f"peak reduction: {(full_peak - lean_peak) / 1e6:.1f} MB, "
+          f"identical output: {full_md == lean_md}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,112 @@
+"""
+Latency benchmark for DocumentRouter.probe() against extract_metadata().
+
+Builds one large synthetic document per format (a long DOCX, a PPTX with
+many slides, a many-page PDF and a multi-sheet XLSX) and times reading
+its metadata through the probe and through get_extractor() followed by
+extract_metadata(), which is what callers had to do before. PPTX and
+XLSX extractors are stubs without metadata, so only the probe is timed.
+
+Usage:
+    python -m benchmarks.bench_probe [--size N] [--repeat N]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import fitz  # pymupdf
+from docx import Document
+from openpyxl import Workbook
+from pptx import Presentation
+
+from src.router import DocumentRouter
+
+PROSE = (
+    "Operating results for the period reflect steady demand across all "
+    "segments, with margins supported by lower input costs."
+)
+
+
+def build_corpus(directory: Path, size: int) -> list[Path]:
+    """Write one document per format.
+
+    Args:
+        directory: Output directory.
+        size: Paragraphs (DOCX), pages (PDF), slides (PPTX) and
+            rows (XLSX, spread over 10 sheets).
+
+    Returns:
+        Paths of the generated documents.
+    """
+    docx = Document()
+    for i in range(size):
+        docx.add_paragraph(f"{i}. {PROSE}")
+    docx.core_properties.title = "Long report"
+    docx.save(directory / "long.docx")
+
+    pdf = fitz.open()
+    for i in range(size):
+        pdf.new_page().insert_text((72, 72), f"Page {i + 1}. {PROSE}", fontsize=10)
+    pdf.set_metadata({"title": "Long report"})
+    pdf.save(directory / "long.pdf")
+    pdf.close()
+
+    pptx = Presentation()
+    for i in range(size // 10 or 1):
+        slide = pptx.slides.add_slide(pptx.slide_layouts[1])
+        slide.shapes.title.text = f"Slide {i + 1}"
+    pptx.save(directory / "long.pptx")
+
+    xlsx = Workbook()
+    for sheet_num in range(10):
+        sheet = xlsx.active if sheet_num == 0 else xlsx.create_sheet()
+        for row in range(size // 10 or 1):
+            sheet.append([row, PROSE])
+    xlsx.save(directory / "long.xlsx")
+
+    return sorted(directory.iterdir())
+
+
+def measure(call, repeat: int) -> float:
+    """Average seconds per call over repeat runs.
+
+    Args:
+        call: Zero-argument callable to time.
+        repeat: Number of runs.
+
+    Returns:
+        Mean wall time in seconds.
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        call()
+    return (time.perf_counter() - start) / repeat
+
+
+def main() -> int:
+    """Build the corpus, time both paths and print a comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    router = DocumentRouter()
+    print(f"{'file':<12}{'extract (ms)':>14}{'probe (ms)':>12}{'speedup':>9}{'pages':>7}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for path in build_corpus(Path(tmp), args.size):
+            probe = measure(lambda: router.probe(path), args.repeat)
+            pages = router.probe(path).page_count
+            try:
+                full = measure(lambda: router.get_extractor(path).extract_metadata(), args.repeat)
+            except NotImplementedError:
+                print(f"{path.name:<12}{'n/a':>14}{probe * 1000:>12.2f}{'-':>9}{pages:>7}")
+                continue
+            print(f"{path.name:<12}{full * 1000:>14.2f}{probe * 1000:>12.2f}"
+                  f"{full / probe:>8.0f}x{pages if pages is not None else '-':>7}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,123 @@
+"""
+Latency benchmark for content-based format sniffing.
+
+Builds a mixed corpus of PDF, DOCX, PPTX and XLSX files (some deliberately
+misnamed with another format's extension) and times sniff_format() per
+file, checking that every file is detected as its real format. The aim
+is well under a millisecond per file.
+
+Usage:
+    python -m benchmarks.bench_sniff [--files N] [--pages N] [--repeat N]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import fitz  # pymupdf
+from docx import Document
+from openpyxl import Workbook
+from pptx import Presentation
+
+from src.models import FileFormat
+from src.sniff import sniff_format
+from src.source import DocumentSource
+
+# Extension each format is misnamed with for every other file
+WRONG_EXTENSIONS = {
+    FileFormat.PDF: ".docx",
+    FileFormat.DOCX: ".pdf",
+    FileFormat.PPTX: ".xlsx",
+    FileFormat.XLSX: ".pptx",
+}
+
+
+def build_templates(directory: Path, pages: int) -> dict[FileFormat, bytes]:
+    """Create one document per format and return their bytes.
+
+    Args:
+        directory: Scratch directory.
+        pages: Pages (PDF), paragraphs (DOCX), slides (PPTX) or rows (XLSX).
+
+    Returns:
+        Dict of format to document bytes.
+    """
+    pdf = fitz.open()
+    for i in range(pages):
+        pdf.new_page().insert_text((72, 72), f"Page {i + 1}", fontsize=11)
+    pdf.save(directory / "t.pdf")
+    pdf.close()
+
+    docx = Document()
+    for i in range(pages):
+        docx.add_paragraph(f"Paragraph {i + 1}")
+    docx.save(directory / "t.docx")
+
+    pptx = Presentation()
+    for i in range(pages):
+        pptx.slides.add_slide(pptx.slide_layouts[6])
+    pptx.save(directory / "t.pptx")
+
+    xlsx = Workbook()
+    for i in range(pages):
+        xlsx.active.append([i, f"Row {i + 1}"])
+    xlsx.save(directory / "t.xlsx")
+
+    return {
+        file_format: (directory / f"t.{file_format.value}").read_bytes()
+        for file_format in WRONG_EXTENSIONS
+    }
+
+
+def build_corpus(directory: Path, files: int, pages: int) -> list[tuple[Path, FileFormat]]:
+    """Write a mixed corpus where every other file has a wrong extension.
+
+    Args:
+        directory: Output directory.
+        files: Number of files to write.
+        pages: Size of each document (see build_templates).
+
+    Returns:
+        List of (path, real format).
+    """
+    templates = build_templates(directory, pages)
+    formats = list(templates)
+    corpus = []
+    for i in range(files):
+        file_format = formats[i % len(formats)]
+        ext = WRONG_EXTENSIONS[file_format] if i % 2 else f".{file_format.value}"
+        path = directory / f"doc_{i}{ext}"
+        path.write_bytes(templates[file_format])
+        corpus.append((path, file_format))
+    return corpus
+
+
+def main() -> int:
+    """Build the corpus, sniff every file and print latency figures."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=400)
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = build_corpus(Path(tmp), args.files, args.pages)
+        sources = [(DocumentSource.from_input(path), real) for path, real in corpus]
+
+        wrong = 0
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for source, real in sources:
+                wrong += sniff_format(source) != real
+        elapsed = time.perf_counter() - start
+
+    per_file = elapsed / (args.repeat * len(sources))
+    print(f"{len(sources)} files, half misnamed, {args.repeat} rounds")
+    print(f"per file: {per_file * 1e6:.0f} µs  ({1 / per_file:,.0f} files/s)")
+    print(f"misdetected: {wrong}")
+    return 0 if wrong == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
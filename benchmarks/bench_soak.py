@@ -0,0 +1,130 @@
+"""
+Memory soak test for long batches.
+
+Extracts a small PDF and a small DOCX over and over (10,000 extractions
+by default) and samples the resident memory of the extracting processes
+along the way: this process with --workers 1, otherwise the batch
+workers of process_many(). Prints the samples and the growth between
+the first sample after warm-up and the last, and fails if it exceeds
+--max-growth. Run with --recycle-after / --recycle-memory to see worker
+recycling keep the curve flat.
+
+Usage:
+    python -m benchmarks.bench_soak [--extractions N] [--workers N]
+        [--recycle-after N] [--recycle-memory MB] [--max-growth MB]
+"""
+
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+from itertools import chain, repeat
+from pathlib import Path
+
+import fitz  # pymupdf
+from docx import Document
+
+from src.models import WorkerRecycling
+from src.router import DocumentRouter
+from src.sandbox import resident_bytes
+
+# Samples printed over the run
+SAMPLES = 20
+
+
+def build_documents(directory: Path) -> list[Path]:
+    """Write a two-page PDF with a table and a DOCX with a table.
+
+    Args:
+        directory: Output directory.
+
+    Returns:
+        Paths of the two documents.
+    """
+    pdf = fitz.open()
+    for i in range(2):
+        page = pdf.new_page()
+        page.insert_text((72, 72), f"Section {i + 1}", fontsize=16)
+        page.insert_textbox(fitz.Rect(72, 100, 520, 300), "Quarterly figures. " * 40, fontsize=10)
+        for row in range(4):
+            for col in range(3):
+                rect = fitz.Rect(72 + col * 120, 320 + row * 20, 192 + col * 120, 340 + row * 20)
+                page.draw_rect(rect)
+                page.insert_text((rect.x0 + 4, rect.y1 - 6), f"r{row}c{col}", fontsize=9)
+    pdf.save(directory / "soak.pdf")
+    pdf.close()
+
+    docx = Document()
+    docx.add_heading("Status", level=1)
+    for i in range(10):
+        docx.add_paragraph(f"Item {i} is on track.")
+    table = docx.add_table(rows=3, cols=3)
+    for row in table.rows:
+        for cell in row.cells:
+            cell.text = "x"
+    docx.save(directory / "soak.docx")
+    return [directory / "soak.pdf", directory / "soak.docx"]
+
+
+def worker_rss(workers: int) -> int:
+    """Largest resident memory among the extracting processes.
+
+    Args:
+        workers: Worker count of the run; 1 means this process.
+
+    Returns:
+        Resident bytes, 0 if unreadable.
+    """
+    if workers == 1:
+        return resident_bytes(os.getpid()) or 0
+    sizes = [resident_bytes(child.pid) or 0 for child in multiprocessing.active_children()]
+    return max(sizes, default=0)
+
+
+def main() -> int:
+    """Run the soak and print the memory samples."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--extractions", type=int, default=10_000)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--recycle-after", type=int)
+    parser.add_argument("--recycle-memory", type=int, metavar="MB")
+    parser.add_argument("--max-growth", type=int, default=64, metavar="MB")
+    args = parser.parse_args()
+
+    recycle = WorkerRecycling(
+        max_documents=args.recycle_after,
+        max_rss_bytes=args.recycle_memory and args.recycle_memory << 20,
+    )
+    every = max(1, args.extractions // SAMPLES)
+    warm_up = every  # the first interval fills caches and allocator pools
+
+    with tempfile.TemporaryDirectory() as tmp:
+        documents = build_documents(Path(tmp))
+        paths = chain.from_iterable(repeat(documents, (args.extractions + 1) // 2))
+        batch = DocumentRouter().process_many(
+            paths, workers=args.workers, ordered=True, recycle=recycle
+        )
+
+        print(f"{'extractions':>12}{'rss MB':>9}{'seconds':>9}")
+        started = time.perf_counter()
+        baseline = last = 0
+        failed = 0
+        for count, (_, result) in enumerate(batch, 1):
+            failed += bool(result.errors)
+            if count % every == 0:
+                last = worker_rss(args.workers)
+                if count == warm_up:
+                    baseline = last
+                print(f"{count:>12}{last / 2**20:>9.1f}{time.perf_counter() - started:>9.1f}")
+
+    growth = (last - baseline) / 2**20
+    print(f"growth after warm-up: {growth:+.1f} MB (limit {args.max_growth} MB)")
+    if failed:
+        print(f"{failed} extractions failed")
+        return 1
+    return 0 if growth <= args.max_growth else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
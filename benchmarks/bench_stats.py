@@ -0,0 +1,99 @@
+"""
+Overhead benchmark for ExtractionOptions.record_stats.
+
+Builds a PDF of prose and tables and a DOCX and extracts each repeatedly with stats
+recording off and on. Each round runs both, in alternating order, and
+the overhead is the median of the per-round ratios, so drift in machine
+load cancels out. Prints the best time of each mode and the overhead,
+and fails if it exceeds --max-overhead percent on any file.
+
+Usage:
+    python -m benchmarks.bench_stats [--pages N] [--paragraphs N] [--rounds N]
+        [--max-overhead PERCENT]
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import fitz  # pymupdf
+from docx import Document
+
+from src.models import ExtractionOptions
+from src.router import DocumentRouter
+
+PROSE = (
+    "Operating results for the period reflect steady demand across all "
+    "segments, with margins supported by lower input costs."
+)
+
+
+def build_documents(directory: Path, pages: int, paragraphs: int) -> list[Path]:
+    """Write a PDF with a ruled table every fourth page and a DOCX.
+
+    Args:
+        directory: Output directory.
+        pages: Pages of the PDF.
+        paragraphs: Paragraphs of the DOCX, with a heading every ten.
+
+    Returns:
+        Paths of the two documents.
+    """
+    pdf = fitz.open()
+    for i in range(pages):
+        page = pdf.new_page()
+        page.insert_text((72, 72), f"Section {i + 1}", fontsize=16)
+        page.insert_textbox(fitz.Rect(72, 100, 520, 500), PROSE * 5, fontsize=10)
+        if i % 4 == 0:
+            for row in range(4):
+                for col in range(3):
+                    rect = fitz.Rect(72 + col * 120, 520 + row * 20, 192 + col * 120, 540 + row * 20)
+                    page.draw_rect(rect)
+                    page.insert_text((rect.x0 + 4, rect.y1 - 6), f"r{row}c{col}", fontsize=9)
+    pdf.save(directory / "stats.pdf")
+    pdf.close()
+
+    docx = Document()
+    for i in range(paragraphs):
+        if i % 10 == 0:
+            docx.add_heading(f"Part {i // 10 + 1}", level=1)
+        docx.add_paragraph(f"{i}. {PROSE}")
+    docx.save(directory / "stats.docx")
+    return [directory / "stats.pdf", directory / "stats.docx"]
+
+
+def main() -> int:
+    """Time extractions with and without stats and print the overhead."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, default=100)
+    parser.add_argument("--paragraphs", type=int, default=300)
+    parser.add_argument("--rounds", type=int, default=30)
+    parser.add_argument("--max-overhead", type=float, default=1.0, metavar="PERCENT")
+    args = parser.parse_args()
+
+    router = DocumentRouter()
+    modes = {False: ExtractionOptions(), True: ExtractionOptions(record_stats=True)}
+    worst = 0.0
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'file':<12}{'off ms':>9}{'on ms':>9}{'overhead':>10}")
+        for path in build_documents(Path(tmp), args.pages, args.paragraphs):
+            router.process_document(path)  # warm up imports and caches
+            times: dict[bool, list[float]] = {False: [], True: []}
+            for round_ in range(args.rounds):
+                for record in (False, True) if round_ % 2 else (True, False):
+                    start = time.perf_counter()
+                    router.process_document(path, modes[record])
+                    times[record].append(time.perf_counter() - start)
+            ratios = [on / off for off, on in zip(times[False], times[True])]
+            overhead = (statistics.median(ratios) - 1) * 100
+            worst = max(worst, overhead)
+            off, on = (min(times[record]) * 1000 for record in (False, True))
+            print(f"{path.name:<12}{off:>9.1f}{on:>9.1f}{overhead:>9.2f}%")
+    print(f"worst overhead {worst:+.2f}% (limit {args.max_overhead}%)")
+    return 0 if worst <= args.max_overhead else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,97 @@
+"""
+Throughput benchmark for the PDF table-detection prefilter.
+
+Builds a prose-heavy synthetic corpus (mostly text pages, a ruled table
+every N pages, a horizontal rule in every page footer) and times
+PDFExtractor.extract_tables() with and without the prefilter that skips
+find_tables() on pages that cannot hold a ruled table.
+
+Usage:
+    python -m benchmarks.bench_table_prefilter [--pages N] [--table-every N]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import fitz  # pymupdf
+
+from src.extractors.pdf_extractor import PDFExtractor
+
+PROSE = (
+    "Operating results for the period reflect steady demand across all "
+    "segments, with margins supported by lower input costs and a favourable "
+    "product mix. Management continues to invest in capacity and tooling."
+)
+
+
+def build_prose_pdf(path: Path, pages: int, table_every: int) -> None:
+    """Write a mostly-prose PDF with an occasional ruled table.
+
+    Args:
+        path: Output file path.
+        pages: Number of pages to generate.
+        table_every: Put a 4x3 ruled table on every N-th page.
+    """
+    doc = fitz.open()
+    for page_num in range(1, pages + 1):
+        page = doc.new_page()
+        page.insert_text((72, 60), f"Section {page_num}", fontsize=14)
+        page.insert_textbox(fitz.Rect(72, 80, 540, 400), PROSE * 6, fontsize=10)
+        # Footer rule below the text: a drawing, but no table
+        page.draw_line((72, 780), (540, 780), color=(0, 0, 0), width=0.5)
+
+        if page_num % table_every == 0:
+            top = 450
+            for row in range(5):
+                page.draw_line((72, top + row * 20), (372, top + row * 20))
+            for col in range(4):
+                page.draw_line((72 + col * 100, top), (72 + col * 100, top + 80))
+            for row in range(4):
+                for col in range(3):
+                    page.insert_text((76 + col * 100, top + 14 + row * 20),
+                                     f"r{row}c{col}", fontsize=9)
+    doc.save(path)
+    doc.close()
+
+
+def measure(path: Path, table_prefilter: bool) -> tuple[float, int]:
+    """Time extract_tables once.
+
+    Args:
+        path: PDF to extract.
+        table_prefilter: Value passed to PDFExtractor.
+
+    Returns:
+        Tuple of (seconds, number of tables found).
+    """
+    extractor = PDFExtractor(path, table_prefilter=table_prefilter)
+    start = time.perf_counter()
+    tables = extractor.extract_tables()
+    return time.perf_counter() - start, len(tables)
+
+
+def main() -> int:
+    """Build the corpus, run both modes and print a comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--table-every", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "prose.pdf"
+        build_prose_pdf(path, args.pages, args.table_every)
+        off_time, off_tables = measure(path, table_prefilter=False)
+        on_time, on_tables = measure(path, table_prefilter=True)
+
+    print(f"{args.pages} pages, a table every {args.table_every} pages")
+    print(f"{'prefilter':<10}{'time (s)':>10}{'pages/s':>10}{'tables':>8}")
+    print(f"{'off':<10}{off_time:>10.3f}{args.pages / off_time:>10.0f}{off_tables:>8}")
+    print(f"{'on':<10}{on_time:>10.3f}{args.pages / on_time:>10.0f}{on_tables:>8}")
+    print(f"speedup: {off_time / on_time:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
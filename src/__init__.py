@@ -6,12 +6,51 @@ PDF, DOCX, PPTX, and XLSX documents.
 
 Exports:
     DocumentRouter: Routes files to appropriate extractors
+    AsyncDocumentRouter: Awaitable router for asyncio applications
     process_document: Convenience function for one-line extraction
     ExtractionResult: Unified output model from all extractors
+    ExtractionOptions: Stages, page range and limits to extract
+    ExtractionStage: Enum of extraction stages
     FileFormat: Enum of supported file formats
+
+Exports are imported on first access, so `python -m src --help` starts
+without loading pydantic or any document library.
 """
 
-from .router import DocumentRouter, process_document
-from .models import ExtractionResult, FileFormat
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .aio import AsyncDocumentRouter
+    from .router import DocumentRouter, process_document
+    from .models import ExtractionOptions, ExtractionResult, ExtractionStage, FileFormat
+
+# Module defining each export
+_EXPORT_MODULES = {
+    "DocumentRouter": ".router",
+    "AsyncDocumentRouter": ".aio",
+    "process_document": ".router",
+    "ExtractionResult": ".models",
+    "ExtractionOptions": ".models",
+    "ExtractionStage": ".models",
+    "FileFormat": ".models",
+}
+
+__all__ = [
+    "DocumentRouter",
+    "AsyncDocumentRouter",
+    "process_document",
+    "ExtractionResult",
+    "ExtractionOptions",
+    "ExtractionStage",
+    "FileFormat",
+]
+
 
-__all__ = ["DocumentRouter", "process_document", "ExtractionResult", "FileFormat"]
+def __getattr__(name: str):
+    """Import an export on first access (PEP 562)."""
+    if name not in _EXPORT_MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORT_MODULES[name], __name__), name)
+    globals()[name] = value
+    return value
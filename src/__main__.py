@@ -2,7 +2,12 @@
 CLI entry point for document extraction.
 
 Usage:
-    python -m src <input_file> [-o <output_file>]
+    python -m src <input_file> [-o <output_file>] [--stages STAGES]
+                  [--pages FIRST-LAST] [--max-tables N] [--max-images N]
+    python -m src <input_dir> [--recursive] [--workers N] [--output-dir DIR]
+                  [--recycle-after N] [--recycle-memory MB] ...
+    Either form also takes [--timeout SECONDS] [--max-memory MB] [--no-stats]
+    [--trace FILE] [--profile DIR].
 
 Examples:
     python -m src report.pdf
@@ -10,13 +15,84 @@ Examples:
 
     python -m src report.pdf -o results.json
     # Creates results.json
+
+    python -m src report.pdf --stages tables --pages 1-5
+    # Only the tables on pages 1 to 5
+
+    python -m src report.pdf --no-stats
+    # No timings or counts: "stats" is null
+
+    python -m src archive/ -r --trace trace.json
+    # Chrome trace of every document, stage and PDF page, for a trace viewer
+
+    python -m src report.pdf --profile prof/
+    # Per-stage pstats and flamegraph stacks in prof/, hot functions printed
+
+    python -m src archive/ --recursive --workers 8 --output-dir out/
+    # Creates out/<path>.json per document plus out/manifest.jsonl;
+    # re-running skips documents that are unchanged since the last run
+
+    python -m src archive/ -r --timeout 120 --max-memory 2048
+    # Each document in a child process, killed after 2 minutes or 2 GB;
+    # results streamed back from the child carry no "stats" section
+
+    python -m src archive/ -r --recycle-after 500 --recycle-memory 1024
+    # Fresh workers every 500 documents or once one holds 1 GB
 """
 
 import argparse
 import sys
+from contextlib import nullcontext
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .models import ExtractionOptions, ExtractionStage, WorkerRecycling
+    from .router import DocumentRouter
+
+# The router, models and document libraries are imported inside main()
+# and the argument parsers, so --help and usage errors return without
+# paying their import cost.
+
+
+def parse_stages(value: str) -> "frozenset[ExtractionStage]":
+    """Parse a comma-separated list of stage names.
 
-from .router import DocumentRouter
+    Args:
+        value: e.g. "text,tables".
+
+    Returns:
+        Selected stages.
+
+    Raises:
+        argparse.ArgumentTypeError: If a name is not a known stage.
+    """
+    from .models import ExtractionStage
+
+    try:
+        return frozenset(ExtractionStage(name.strip()) for name in value.split(","))
+    except ValueError:
+        choices = ", ".join(stage.value for stage in ExtractionStage)
+        raise argparse.ArgumentTypeError(f"invalid stages {value!r} (choose from {choices})")
+
+
+def parse_page_range(value: str) -> tuple[int, int]:
+    """Parse a 1-based page range such as "3" or "1-5".
+
+    Args:
+        value: Single page or inclusive FIRST-LAST range.
+
+    Returns:
+        (first, last) page numbers.
+
+    Raises:
+        argparse.ArgumentTypeError: If the value is not a page range.
+    """
+    first, _, last = value.partition("-")
+    try:
+        return int(first), int(last or first)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid page range {value!r} (expected N or FIRST-LAST)")
 
 
 def main() -> int:
@@ -32,29 +108,184 @@ def main() -> int:
     parser.add_argument(
         "input_file",
         type=Path,
-        help="Document to process (.pdf, .docx, .pptx, .xlsx)",
+        help="Document to process (.pdf, .docx, .pptx, .xlsx), or a directory of them",
     )
     parser.add_argument(
         "-o", "--output",
         type=Path,
         help="Output JSON file (default: <input>_extracted.json)",
     )
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        help="Output directory; for a directory input it mirrors the input tree "
+             "and holds the resume manifest (default: <input_dir>_extracted)",
+    )
+    parser.add_argument(
+        "-r", "--recursive",
+        action="store_true",
+        help="Also extract documents in subdirectories of a directory input",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Worker processes for a directory input (default: number of CPUs)",
+    )
+    parser.add_argument(
+        "--recycle-after",
+        type=int,
+        metavar="N",
+        help="Replace the worker processes once one has extracted this many documents",
+    )
+    parser.add_argument(
+        "--recycle-memory",
+        type=int,
+        metavar="MB",
+        help="Replace the worker processes once one holds more resident memory than this",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        help="Extract each document in a child process killed after this many seconds",
+    )
+    parser.add_argument(
+        "--max-memory",
+        type=int,
+        metavar="MB",
+        help="Extract each document in a child process killed above this resident memory",
+    )
+    parser.add_argument(
+        "--stages",
+        type=parse_stages,
+        help="Comma-separated stages to run: text, tables, images, metadata (default: all)",
+    )
+    parser.add_argument(
+        "--pages",
+        type=parse_page_range,
+        help="Pages, slides or sheets to extract, as N or FIRST-LAST (default: all)",
+    )
+    parser.add_argument(
+        "--max-tables",
+        type=int,
+        help="Stop after extracting this many tables",
+    )
+    parser.add_argument(
+        "--max-images",
+        type=int,
+        help="Stop after extracting this many images",
+    )
+    parser.add_argument(
+        "--no-stats",
+        action="store_true",
+        help="Leave out the output's stats of per-stage timings, counts and memory "
+        "(never recorded with --timeout or --max-memory)",
+    )
+    parser.add_argument(
+        "--trace",
+        type=Path,
+        metavar="FILE",
+        help="Write a Chrome trace-event JSON of every extraction, stage and PDF page",
+    )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        metavar="DIR",
+        help="Profile the extraction in-process, write pstats and collapsed stacks per "
+        "stage to DIR and print the hottest functions by stage and library",
+    )
     args = parser.parse_args()
 
     # Validate input file exists
     if not args.input_file.exists():
         print(f"Error: File not found: {args.input_file}", file=sys.stderr)
         return 1
+    if args.input_file.is_dir() and args.output:
+        print("Error: -o/--output takes a file; use --output-dir for a directory", file=sys.stderr)
+        return 1
+    if args.workers is not None and args.workers < 1:
+        print("Error: --workers must be at least 1", file=sys.stderr)
+        return 1
+    if args.profile and (args.timeout is not None or args.max_memory is not None or args.trace):
+        print("Error: --profile cannot be combined with --timeout, --max-memory or --trace", file=sys.stderr)
+        return 1
+    if args.profile and args.workers not in (None, 1):
+        print("Error: --profile runs in-process; use --workers 1 or leave it out", file=sys.stderr)
+        return 1
 
+    from .models import ExtractionOptions, ExtractionStage, SandboxLimits, WorkerRecycling
+    from .router import DocumentRouter
+
+    try:
+        options = ExtractionOptions(
+            stages=args.stages or frozenset(ExtractionStage),
+            page_range=args.pages,
+            max_tables=args.max_tables,
+            max_images=args.max_images,
+            record_stats=not args.no_stats,
+        )
+        sandbox = None
+        if args.timeout is not None or args.max_memory is not None:
+            sandbox = SandboxLimits(
+                timeout_seconds=args.timeout,
+                max_memory_bytes=args.max_memory and args.max_memory << 20,
+            )
+        recycle = WorkerRecycling(
+            max_documents=args.recycle_after,
+            max_rss_bytes=args.recycle_memory and args.recycle_memory << 20,
+        )
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    router = DocumentRouter(sandbox=sandbox)
+    tracer = nullcontext()
+    if args.trace:
+        from .tracing import ChromeTraceExporter
+        tracer = ChromeTraceExporter(args.trace)
+    elif args.profile:
+        # The profiler only sees this process, so keep every document in it
+        from .profiling import StageProfiler
+        tracer = StageProfiler()
+        args.workers = 1
+
+    with tracer:
+        if args.input_file.is_dir():
+            code = extract_dir(args, router, options, recycle)
+        else:
+            code = extract_file(args, router, options)
+    if args.profile:
+        tracer.write(args.profile)
+        print(tracer.report())
+        print(f"Profile written to: {args.profile}")
+    return code
+
+
+def extract_file(
+    args: argparse.Namespace, router: "DocumentRouter", options: "ExtractionOptions"
+) -> int:
+    """Extract a single document to one JSON file.
+
+    Args:
+        args: Parsed command line.
+        router: Router configured from the command line.
+        options: Extraction options built from the command line.
+
+    Returns:
+        Exit code: 0 on success, 1 on error.
+    """
     # Determine output path
-    output_path = args.output or args.input_file.with_name(
-        f"{args.input_file.stem}_extracted.json"
-    )
+    output_name = f"{args.input_file.stem}_extracted.json"
+    if args.output:
+        output_path = args.output
+    elif args.output_dir:
+        args.output_dir.mkdir(parents=True, exist_ok=True)
+        output_path = args.output_dir / output_name
+    else:
+        output_path = args.input_file.with_name(output_name)
 
     # Process document
-    router = DocumentRouter()
     try:
-        result = router.process_document(args.input_file)
+        result = router.process_document(args.input_file, options)
     except ValueError as e:
         print(f"Error: {e}", file=sys.stderr)
         return 1
@@ -65,5 +296,48 @@ def main() -> int:
     return 0
 
 
+def extract_dir(
+    args: argparse.Namespace,
+    router: "DocumentRouter",
+    options: "ExtractionOptions",
+    recycle: "WorkerRecycling",
+) -> int:
+    """Extract every supported document in a directory in parallel.
+
+    Args:
+        args: Parsed command line.
+        router: Router configured from the command line.
+        options: Extraction options built from the command line.
+        recycle: Worker recycling policy built from the command line.
+
+    Returns:
+        Exit code: 0 if no document failed, 1 otherwise.
+    """
+    from .batch import extract_directory
+
+    input_dir = args.input_file
+    output_dir = args.output_dir or input_dir.with_name(f"{input_dir.name}_extracted")
+
+    def report(entry) -> None:
+        if entry.status != "ok":
+            print(f"{entry.status}: {entry.path}: {entry.error or 'see output errors'}", file=sys.stderr)
+
+    summary = extract_directory(
+        input_dir,
+        output_dir,
+        recursive=args.recursive,
+        workers=args.workers,
+        options=options,
+        router=router,
+        on_result=report,
+        recycle=recycle,
+    )
+    print(
+        f"Extracted {summary.extracted}, partial {summary.partial}, failed {summary.failed}, "
+        f"skipped {summary.skipped} unchanged; output in {output_dir}"
+    )
+    return 1 if summary.failed else 0
+
+
 if __name__ == "__main__":
     sys.exit(main())
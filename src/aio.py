@@ -0,0 +1,317 @@
+"""
+Asyncio front end for the document router.
+
+Extraction is CPU-bound and blocks for seconds on large PDFs, so an
+event loop must never run it directly. AsyncDocumentRouter hands the
+work to a thread or process executor, caps how many documents run at
+once with a semaphore, and awaits the result, leaving the loop free.
+
+Threads keep the loop responsive but share one interpreter; a
+ProcessPoolExecutor gives real parallelism for sources that can be
+pickled (paths and bytes). Streaming always runs on a thread, since
+events come from an extractor that stays open while they are read.
+"""
+
+import asyncio
+import os
+import threading
+from collections.abc import AsyncIterator, Callable, Iterable
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from itertools import islice
+from pathlib import Path
+
+from .models import ExtractionEvent, ExtractionOptions, ExtractionResult
+from .router import DocumentRouter, failed_result
+from .source import SourceInput
+
+# Events buffered between the extraction thread and the consumer
+DEFAULT_EVENT_BUFFER = 64
+
+# Marks the end of an event stream
+_END = object()
+
+
+class AsyncDocumentRouter:
+    """Awaitable wrapper around a DocumentRouter.
+
+    Cancelling an awaiting task, or hitting a timeout, drops documents
+    still queued in the executor. A document already being extracted
+    cannot be interrupted: it finishes in the background, its result
+    is discarded, and it keeps its concurrency slot until then, so the
+    executor is never oversubscribed.
+
+    Example:
+        async with AsyncDocumentRouter(max_concurrency=4) as router:
+            result = await router.aprocess_document("report.pdf", timeout=30)
+    """
+
+    def __init__(
+        self,
+        router: DocumentRouter | None = None,
+        executor: Executor | None = None,
+        max_concurrency: int | None = None,
+    ) -> None:
+        """Initialize the async router.
+
+        Args:
+            router: Router that does the extraction, with its cache and
+                sniff settings. Defaults to a plain DocumentRouter.
+            executor: Thread or process executor to run extractions on.
+                Defaults to a thread pool owned by this object and shut
+                down by close().
+            max_concurrency: Documents extracted at once. Defaults to
+                the number of CPUs.
+
+        Raises:
+            ValueError: If max_concurrency is less than 1.
+        """
+        if max_concurrency is None:
+            max_concurrency = os.cpu_count() or 1
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.router = router or DocumentRouter()
+        self.executor = executor
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._own_threads: ThreadPoolExecutor | None = None
+
+    async def aprocess_document(
+        self,
+        source: SourceInput,
+        options: ExtractionOptions | None = None,
+        filename: str | None = None,
+        timeout: float | None = None,
+    ) -> ExtractionResult:
+        """Process a document without blocking the event loop.
+
+        Args:
+            source: Path or str to the document file, or the document
+                itself as bytes, memoryview, mmap or binary file object.
+                A process executor needs a picklable source.
+            options: Stages, page range and limits to extract.
+            filename: Name of an in-memory document.
+            timeout: Seconds to wait for the result, including time
+                spent waiting for a concurrency slot.
+
+        Returns:
+            ExtractionResult from the appropriate extractor.
+
+        Raises:
+            TimeoutError: If the timeout expires first.
+            FileNotFoundError: If the file does not exist.
+            ValueError: If the file format is not supported.
+        """
+        return await asyncio.wait_for(
+            self._run(self._executor(), self.router.process_document, source, options, filename),
+            timeout,
+        )
+
+    async def aprocess_many(
+        self,
+        paths: Iterable[Path | str],
+        options: ExtractionOptions | None = None,
+        ordered: bool = False,
+        timeout: float | None = None,
+    ) -> AsyncIterator[tuple[Path | str, ExtractionResult]]:
+        """Process many documents, yielding results as they complete.
+
+        At most max_concurrency documents are taken from paths ahead of
+        the consumer. As with DocumentRouter.process_many(), a file that
+        fails or times out yields a result with the error in its errors
+        list instead of ending the batch.
+
+        Args:
+            paths: Document paths; may be a lazy iterable.
+            options: Stages, page range and limits to extract.
+            ordered: Yield results in input order instead of completion
+                order.
+            timeout: Per-document timeout in seconds.
+
+        Yields:
+            (path, ExtractionResult) for every path, as given.
+
+        Example:
+            async for path, result in router.aprocess_many(paths, timeout=60):
+                await store(path, result)
+        """
+        paths = iter(paths)
+        pending: dict[asyncio.Task, Path | str] = {}
+
+        def submit(path: Path | str) -> None:
+            pending[asyncio.ensure_future(self._process_isolated(path, options, timeout))] = path
+
+        try:
+            for path in islice(paths, self.max_concurrency):
+                submit(path)
+            while pending:
+                if ordered:
+                    # Dicts keep insertion order: the oldest submission
+                    done = [next(iter(pending))]
+                    await asyncio.wait(done)
+                else:
+                    done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    path = pending.pop(task)
+                    for next_path in islice(paths, 1):
+                        submit(next_path)
+                    yield path, task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def aiter_extract(
+        self,
+        source: SourceInput,
+        options: ExtractionOptions | None = None,
+        filename: str | None = None,
+        max_buffered: int = DEFAULT_EVENT_BUFFER,
+    ) -> AsyncIterator[ExtractionEvent]:
+        """Stream a document's extraction events to the event loop.
+
+        The extractor's iter_extract() runs on a thread and hands each
+        event over through a bounded queue: when the consumer falls
+        behind by max_buffered events, extraction pauses. Leaving the
+        loop early, or cancelling the consumer, stops extraction after
+        the event in progress and closes the extractor.
+
+        Args:
+            source: Path or str to the document file, or the document
+                itself as bytes, memoryview, mmap or binary file object.
+            options: Stages, page range and limits to extract.
+            filename: Name of an in-memory document.
+            max_buffered: Events extracted ahead of the consumer.
+
+        Yields:
+            ExtractionEvent objects, in the order iter_extract() yields them.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+            ValueError: If the file format is not supported.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(max_buffered)
+        stop = threading.Event()
+
+        def produce() -> None:
+            try:
+                with self.router.get_extractor(source, options, filename) as extractor:
+                    for event in extractor.iter_extract():
+                        if stop.is_set():
+                            return
+                        asyncio.run_coroutine_threadsafe(queue.put(event), loop).result()
+            finally:
+                if not stop.is_set():
+                    asyncio.run_coroutine_threadsafe(queue.put(_END), loop).result()
+
+        producer = asyncio.wrap_future(await self._submit(self._thread_executor(), produce))
+        try:
+            while (event := await queue.get()) is not _END:
+                yield event
+            # Re-raise anything the producer failed with
+            await producer
+        finally:
+            stop.set()
+            # Free the slot a blocked put() is waiting for
+            while not queue.empty():
+                queue.get_nowait()
+
+    def close(self) -> None:
+        """Shut down the thread pool this object created, if any.
+
+        An executor passed to __init__ belongs to the caller and is left
+        running.
+        """
+        if self._own_threads is not None:
+            self._own_threads.shutdown(wait=False, cancel_futures=True)
+            self._own_threads = None
+
+    async def __aenter__(self) -> "AsyncDocumentRouter":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.close()
+
+    async def _process_isolated(
+        self, path: Path | str, options: ExtractionOptions | None, timeout: float | None
+    ) -> ExtractionResult:
+        """Process one batch file, turning failures and timeouts into a result.
+
+        Args:
+            path: Document path.
+            options: Stages, page range and limits to extract.
+            timeout: Seconds to wait for the result.
+
+        Returns:
+            ExtractionResult, with the error recorded if extraction
+            failed or timed out.
+        """
+        try:
+            return await self.aprocess_document(path, options, timeout=timeout)
+        except TimeoutError:
+            return failed_result(path, f"timed out after {timeout:g}s")
+        except Exception as e:
+            return failed_result(path, e)
+
+    async def _run(self, executor: Executor, fn: Callable, *args):
+        """Run a call on an executor within the concurrency limit.
+
+        Args:
+            executor: Executor to run the call on.
+            fn: Callable to run.
+            *args: Arguments for fn.
+
+        Returns:
+            Return value of fn.
+        """
+        return await asyncio.wrap_future(await self._submit(executor, fn, *args))
+
+    async def _submit(self, executor: Executor, fn: Callable, *args) -> Future:
+        """Wait for a concurrency slot, then submit a call to an executor.
+
+        The slot is released when the call finishes or is cancelled
+        before it starts, not when its awaiter gives up on it.
+
+        Args:
+            executor: Executor to run the call on.
+            fn: Callable to run.
+            *args: Arguments for fn.
+
+        Returns:
+            concurrent.futures.Future of the call.
+        """
+        await self._semaphore.acquire()
+        try:
+            future = executor.submit(fn, *args)
+        except BaseException:
+            self._semaphore.release()
+            raise
+
+        loop = asyncio.get_running_loop()
+
+        def release(_: Future) -> None:
+            # Runs on the worker thread, or on the loop if cancelled there
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(self._semaphore.release)
+
+        future.add_done_callback(release)
+        return future
+
+    def _executor(self) -> Executor:
+        """Executor that runs whole-document extractions."""
+        return self.executor or self._thread_executor()
+
+    def _thread_executor(self) -> Executor:
+        """Thread pool that runs streaming producers.
+
+        Returns:
+            The caller's executor if it is a thread pool, otherwise a
+            pool owned by this object.
+        """
+        if isinstance(self.executor, ThreadPoolExecutor):
+            return self.executor
+        if self._own_threads is None:
+            self._own_threads = ThreadPoolExecutor(
+                max_workers=self.max_concurrency, thread_name_prefix="extract"
+            )
+        return self._own_threads
@@ -7,40 +7,84 @@ knowing format-specific details. Adding a new format means creating a
 new class that inherits from BaseExtractor — no existing code changes.
 """
 
+import re
 from abc import ABC, abstractmethod
-from pathlib import Path
+from collections.abc import Iterable, Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
 
+from . import tracing
+from .source import DocumentSource, SourceInput
 from .models import (
     ExtractionResult,
     DocumentMetadata,
     TableData,
     ImageData,
     FileFormat,
+    ExtractionEvent,
+    ExtractionOptions,
+    ExtractionStage,
+    MetadataEvent,
+    HeadingEvent,
+    ParagraphEvent,
+    TableEvent,
+    ImageEvent,
+    ErrorEvent,
 )
+from .stats import StatsRecorder
+from .utils.markdown_helpers import clean_text, heading_to_markdown, normalize_whitespace
+
+# Prefix of error messages per stage, e.g. "Table extraction failed: ..."
+STAGE_LABELS = {
+    ExtractionStage.TEXT: "Text",
+    ExtractionStage.TABLES: "Table",
+    ExtractionStage.IMAGES: "Image",
+    ExtractionStage.METADATA: "Metadata",
+}
+
+# A markdown heading line as produced by heading_to_markdown()
+HEADING_PATTERN = re.compile(r"^(#{1,6}) (.*)$", re.DOTALL)
 
 
 class BaseExtractor(ABC):
     """Abstract base class for all document format extractors.
 
     Subclasses must implement the four extraction methods.
-    The `extract_all()` method orchestrates them into a unified result.
+    `iter_extract()` streams their output as events, and `extract_all()`
+    collects those events into a unified result. Subclasses can override
+    `iter_extract()` to stream natively instead of stage by stage.
+
+    Attributes:
+        version: Output version of the extractor. Bump it in a subclass
+            whenever its output changes, so cached results are not reused.
+        file_format: Format reported when metadata was not requested.
     """
 
-    def __init__(self, file_path: Path | str) -> None:
-        """Initialize extractor with the path to the document.
+    version: str = "1"
+    file_format: FileFormat = FileFormat.UNKNOWN
+
+    def __init__(
+        self, source: SourceInput | DocumentSource, options: ExtractionOptions | None = None
+    ) -> None:
+        """Initialize extractor with the document to read.
 
         Args:
-            file_path: Path to the document file. Must exist and be readable.
+            source: Path to the document file, or the document itself as
+                bytes, memoryview, mmap or binary file object. Wrap a
+                buffer in DocumentSource.from_input() to give it a name.
+            options: Stages, page range and limits to extract. Defaults
+                to extracting everything.
 
         Raises:
             FileNotFoundError: If the file does not exist.
             ValueError: If the file path is not a file.
+            TypeError: If source is not a supported document source.
         """
-        self.file_path = Path(file_path)
-        if not self.file_path.exists():
-            raise FileNotFoundError(f"File not found: {self.file_path}")
-        if not self.file_path.is_file():
-            raise ValueError(f"Path is not a file: {self.file_path}")
+        self.source = DocumentSource.from_input(source)
+        # None for in-memory documents
+        self.file_path = self.source.path
+        self.options = options or ExtractionOptions()
+        # Set while extract_all() records stats
+        self._stats_recorder: StatsRecorder | None = None
 
     @abstractmethod
     def extract_text(self) -> str:
@@ -80,55 +124,269 @@ class BaseExtractor(ABC):
         """
         ...
 
+    def iter_extract(self) -> Iterator[ExtractionEvent]:
+        """Stream the document content as extraction events.
+
+        The default implementation runs the extraction methods of the
+        selected stages in turn and converts their results to events,
+        capped at the options' limits. A failing stage yields an
+        ErrorEvent instead of raising. Subclasses that can restrict the
+        work itself (page ranges, early stops) override this.
+
+        Yields:
+            MetadataEvent first, then heading/paragraph, table and image
+            events, with an ErrorEvent for each stage that failed.
+        """
+        options = self.options
+        if options.wants(ExtractionStage.METADATA):
+            try:
+                with self._measure(ExtractionStage.METADATA):
+                    metadata = self.extract_metadata()
+            except Exception as e:
+                yield self._stage_error(ExtractionStage.METADATA, e)
+            else:
+                yield MetadataEvent(metadata=metadata)
+
+        if options.wants(ExtractionStage.TEXT):
+            try:
+                with self._measure(ExtractionStage.TEXT):
+                    markdown = self.extract_text()
+            except Exception as e:
+                yield self._stage_error(ExtractionStage.TEXT, e)
+            else:
+                for block in markdown.split("\n\n") if markdown else []:
+                    match = HEADING_PATTERN.match(block)
+                    if match:
+                        yield HeadingEvent(text=match.group(2), level=len(match.group(1)))
+                    else:
+                        yield ParagraphEvent(text=block)
+
+        if options.wants(ExtractionStage.TABLES):
+            try:
+                with self._measure(ExtractionStage.TABLES):
+                    tables = self.extract_tables()
+            except Exception as e:
+                yield self._stage_error(ExtractionStage.TABLES, e)
+            else:
+                for table in tables[:options.max_tables]:
+                    yield TableEvent(table=table)
+
+        if options.wants(ExtractionStage.IMAGES):
+            try:
+                with self._measure(ExtractionStage.IMAGES):
+                    images = self.extract_images()
+            except Exception as e:
+                yield self._stage_error(ExtractionStage.IMAGES, e)
+            else:
+                for image in images[:options.max_images]:
+                    yield ImageEvent(image=image)
+
     def extract_all(self) -> ExtractionResult:
         """Run all extraction methods and return unified result.
 
-        Implements partial success — individual extraction failures
-        are captured in the errors list rather than raising exceptions.
+        Collects the events of `iter_extract()`. Implements partial
+        success — individual extraction failures are captured in the
+        errors list rather than raising exceptions. With
+        options.record_stats, timings and counts are attached as stats.
 
         Returns:
             ExtractionResult containing all extractable content
             and a list of any non-fatal errors encountered.
         """
-        errors: list[str] = []
+        with self._trace_extraction():
+            self._start_stats()
+            return self._finish_stats(self._collect_events(self.iter_extract()))
 
-        # Extract text (critical — if this fails, report but continue)
-        try:
-            markdown = self.extract_text()
-        except Exception as e:
-            markdown = ""
-            errors.append(f"Text extraction failed: {e}")
+    def _trace_extraction(self) -> AbstractContextManager[None]:
+        """Span of one extract_all() call, for the installed tracer.
 
-        # Extract tables
-        try:
-            tables = self.extract_tables()
-        except Exception as e:
-            tables = []
-            errors.append(f"Table extraction failed: {e}")
+        Returns:
+            Context manager reporting the "extract_all" span.
+        """
+        return tracing.span(
+            "extract_all",
+            extractor=type(self).__name__,
+            document=self.source.name,
+            file_format=self.file_format.value,
+        )
+
+    def _start_stats(self) -> None:
+        """Start recording stats for extract_all() if the options ask for them."""
+        self._stats_recorder = StatsRecorder() if self.options.record_stats else None
+
+    def _finish_stats(self, result: ExtractionResult) -> ExtractionResult:
+        """Attach the stats recorded since _start_stats() to a result.
+
+        Args:
+            result: Result of the extraction.
 
-        # Extract images
-        try:
-            images = self.extract_images()
-        except Exception as e:
+        Returns:
+            The same result, with stats if they were recorded.
+        """
+        if self._stats_recorder is not None:
+            result.stats = self._stats_recorder.finish(result)
+            self._stats_recorder = None
+        return result
+
+    def _measure(self, stage: ExtractionStage, trace: bool = True) -> AbstractContextManager[None]:
+        """Charge the work of a with block to a stage.
+
+        The block is timed while recording stats and reported as a span
+        named after the stage while a tracer is installed.
+
+        Args:
+            stage: Stage doing the work.
+            trace: Whether to report a span. Pass False for work done in
+                many small pieces, such as single paragraphs.
+
+        Returns:
+            Context manager measuring the block; a no-op one when
+            neither stats nor tracing are on.
+        """
+        timed = nullcontext() if self._stats_recorder is None else self._stats_recorder.stage(stage)
+        if not trace or tracing.get_tracer() is None:
+            return timed
+        return _nested(timed, tracing.span(stage.value))
+
+    def _collect_events(self, events: Iterable[ExtractionEvent]) -> ExtractionResult:
+        """Build an ExtractionResult from a stream of this extractor's events.
+
+        Args:
+            events: Events as yielded by iter_extract().
+
+        Returns:
+            ExtractionResult built by collect_events().
+        """
+        return self.collect_events(events, self.source)
+
+    @classmethod
+    def collect_events(
+        cls, events: Iterable[ExtractionEvent], source: DocumentSource
+    ) -> ExtractionResult:
+        """Build an ExtractionResult from a stream of events.
+
+        Text blocks are joined and cleaned exactly as extract_text()
+        does. Content of a stage that reported an error is dropped, and
+        errors are listed in stage order. A classmethod so events
+        streamed from another process can be collected without opening
+        the document again.
+
+        Args:
+            events: Events as yielded by iter_extract().
+            source: Document the events came from.
+
+        Returns:
+            ExtractionResult containing all extractable content
+            and a list of any non-fatal errors encountered.
+        """
+        lines: list[str] = []
+        tables: list[TableData] = []
+        images: list[ImageData] = []
+        metadata: DocumentMetadata | None = None
+        failures: dict[ExtractionStage, str] = {}
+
+        for event in events:
+            if isinstance(event, HeadingEvent):
+                lines.append(heading_to_markdown(event.text, event.level))
+            elif isinstance(event, ParagraphEvent):
+                lines.append(event.text)
+            elif isinstance(event, TableEvent):
+                tables.append(event.table)
+            elif isinstance(event, ImageEvent):
+                images.append(event.image)
+            elif isinstance(event, MetadataEvent):
+                metadata = event.metadata
+            elif isinstance(event, ErrorEvent):
+                failures.setdefault(event.stage, event.message)
+
+        markdown = ""
+        if ExtractionStage.TEXT not in failures:
+            markdown = normalize_whitespace(clean_text("\n\n".join(lines)))
+        if ExtractionStage.TABLES in failures:
+            tables = []
+        if ExtractionStage.IMAGES in failures:
             images = []
-            errors.append(f"Image extraction failed: {e}")
-
-        # Extract metadata (should rarely fail, but protect anyway)
-        try:
-            metadata = self.extract_metadata()
-        except Exception as e:
-            # Metadata is required by the model, so build a minimal one
-            metadata = DocumentMetadata(
-                file_format=FileFormat.UNKNOWN,
-                file_size_bytes=self.file_path.stat().st_size,
-                source_filename=self.file_path.name,
-            )
-            errors.append(f"Metadata extraction failed: {e}")
+        if metadata is None or ExtractionStage.METADATA in failures:
+            metadata = cls.fallback_metadata(source, failed=ExtractionStage.METADATA in failures)
 
         return ExtractionResult(
             markdown=markdown,
             tables=tables,
             images=images,
             metadata=metadata,
-            errors=errors,
+            errors=[failures[stage] for stage in ExtractionStage if stage in failures],
         )
+
+    def __enter__(self) -> "BaseExtractor":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release resources held by the extractor.
+
+        The base implementation holds none. Subclasses that open the
+        document must release it here, and allow close() to be called
+        more than once. Extraction methods must not be called after
+        close().
+        """
+
+    def _fallback_metadata(self, failed: bool) -> DocumentMetadata:
+        """Build the minimal metadata used when none was extracted.
+
+        Args:
+            failed: Whether the metadata stage failed.
+
+        Returns:
+            DocumentMetadata built by fallback_metadata().
+        """
+        return self.fallback_metadata(self.source, failed)
+
+    @classmethod
+    def fallback_metadata(cls, source: DocumentSource, failed: bool) -> DocumentMetadata:
+        """Build the minimal metadata used when none was extracted.
+
+        Metadata is required by ExtractionResult, so file-level fields
+        stand in for it when the stage failed or was not requested.
+
+        Args:
+            source: Document the metadata is for.
+            failed: Whether the metadata stage failed. The extractor's
+                format is only trusted when it did not.
+
+        Returns:
+            DocumentMetadata with format, size and file name only.
+        """
+        return DocumentMetadata(
+            file_format=FileFormat.UNKNOWN if failed else cls.file_format,
+            file_size_bytes=source.size,
+            source_filename=source.name,
+        )
+
+    @staticmethod
+    def _stage_error(stage: ExtractionStage, error: Exception | str) -> ErrorEvent:
+        """Build the ErrorEvent reported when a stage fails.
+
+        Args:
+            stage: Stage that failed.
+            error: Exception raised by the stage, or its message.
+
+        Returns:
+            ErrorEvent whose message matches the errors list entry.
+        """
+        return ErrorEvent(stage=stage, message=f"{STAGE_LABELS[stage]} extraction failed: {error}")
+
+
+@contextmanager
+def _nested(
+    outer: AbstractContextManager[None], inner: AbstractContextManager[None]
+) -> Iterator[None]:
+    """Enter two context managers as one.
+
+    Args:
+        outer: Entered first, exited last.
+        inner: Entered second, exited first.
+    """
+    with outer, inner:
+        yield
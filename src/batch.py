@@ -0,0 +1,318 @@
+"""
+Directory extraction with a resumable manifest.
+
+extract_directory() finds the supported documents under a directory,
+extracts them across worker processes with DocumentRouter.process_many()
+and writes one JSON result per document into an output tree that
+mirrors the input tree.
+
+Every finished document is appended to a JSON Lines manifest in the
+output directory, recording its size, mtime, content digest, status and
+duration, along with the extractor version and options that produced
+the output. A re-run skips documents whose manifest entry is still
+current, so an interrupted run picks up where it stopped and a nightly
+run only extracts what changed. Changing the options or upgrading an
+extractor makes the affected entries stale.
+"""
+
+import hashlib
+import os
+import time
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import Literal
+
+from pydantic import BaseModel, ValidationError
+
+from .cache import file_digest
+from .models import ExtractionOptions, ExtractionResult, WorkerRecycling
+from .router import DocumentRouter
+from .source import DocumentSource
+
+# Manifest file name inside the output directory
+MANIFEST_NAME = "manifest.jsonl"
+
+# Suffix of the per-document output files, appended to the input name
+OUTPUT_SUFFIX = ".json"
+
+
+class ManifestEntry(BaseModel):
+    """One processed document, as recorded in the manifest.
+
+    extractor and options identify how the output was produced; entries
+    written before they were recorded leave them empty and are stale.
+    """
+    path: str
+    size: int
+    mtime: float
+    digest: str
+    status: Literal["ok", "partial", "failed"]
+    duration_seconds: float
+    error: str | None = None
+    extractor: str = ""
+    options: str = ""
+
+
+class BatchSummary(BaseModel):
+    """Counts of documents handled by one extract_directory() run."""
+    extracted: int = 0
+    partial: int = 0
+    failed: int = 0
+    skipped: int = 0
+
+
+class Manifest:
+    """Append-only record of processed documents.
+
+    Each entry is one JSON line, flushed as soon as its document is
+    done, so a crash loses at most the documents still in flight. When
+    a path appears more than once, the last entry wins.
+
+    Attributes:
+        path: Manifest file.
+        entries: Latest entry per input path, relative to the input
+            directory.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Load the manifest, if it exists.
+
+        Unreadable lines (e.g. a line cut short by a crash) are ignored,
+        so their documents are processed again.
+
+        Args:
+            path: Manifest file.
+        """
+        self.path = path
+        self.entries: dict[str, ManifestEntry] = {}
+        if path.exists():
+            for line in path.read_text().splitlines():
+                try:
+                    entry = ManifestEntry.model_validate_json(line)
+                except ValidationError:
+                    continue
+                self.entries[entry.path] = entry
+
+    def is_current(
+        self, relative: str, file_path: Path, output_path: Path, extractor: str, options: str
+    ) -> bool:
+        """Check whether a document can be skipped.
+
+        A document is current when it was extracted (fully or
+        partially) by the same extractor version with the same options,
+        its output still exists, and its content is unchanged: size and
+        mtime match, or, after a touch or copy, the size and content
+        digest do. Failed documents are retried.
+
+        Args:
+            relative: Document path relative to the input directory.
+            file_path: Document file.
+            output_path: Where its output is written.
+            extractor: Extractor that would read the document now, from
+                extractor_tag().
+            options: Options of this run, from options_digest().
+
+        Returns:
+            True if the document needs no extraction.
+        """
+        entry = self.entries.get(relative)
+        if entry is None or entry.status == "failed" or not output_path.exists():
+            return False
+        if entry.extractor != extractor or entry.options != options:
+            return False
+        stat = file_path.stat()
+        if stat.st_size != entry.size:
+            return False
+        if stat.st_mtime == entry.mtime:
+            return True
+        if file_digest(file_path) != entry.digest:
+            return False
+        self.record(entry.model_copy(update={"mtime": stat.st_mtime}))
+        return True
+
+    def record(self, entry: ManifestEntry) -> None:
+        """Append an entry and flush it to disk.
+
+        Args:
+            entry: Entry to record.
+        """
+        self.entries[entry.path] = entry
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(entry.model_dump_json() + "\n")
+
+
+def extractor_tag(router: DocumentRouter, document: Path) -> str:
+    """Name and version of the extractor the router picks for a document.
+
+    Args:
+        router: Router that extracts the document.
+        document: Document file.
+
+    Returns:
+        "<class name>:<version>", or "" if no extractor supports it.
+    """
+    try:
+        extractor_class = router._extractor_class(DocumentSource.from_input(document))
+    except (OSError, ValueError):
+        return ""
+    return f"{extractor_class.__name__}:{extractor_class.version}"
+
+
+def options_digest(options: ExtractionOptions | None) -> str:
+    """Hash the options of a run, for comparison with later runs.
+
+    Args:
+        options: Options of the run; None means the defaults.
+
+    Returns:
+        Hex digest of the options' JSON.
+    """
+    dumped = (options or ExtractionOptions()).model_dump_json()
+    return hashlib.blake2b(dumped.encode(), digest_size=16).hexdigest()
+
+
+def discover_documents(directory: Path, recursive: bool = False) -> list[Path]:
+    """List the supported documents in a directory.
+
+    Documents are found by extension; the router still sniffs each
+    file's content when it is extracted.
+
+    Args:
+        directory: Directory to search.
+        recursive: Also search subdirectories.
+
+    Returns:
+        Sorted paths of files with a supported extension.
+    """
+    supported = set(DocumentRouter.supported_formats())
+    candidates = directory.rglob("*") if recursive else directory.iterdir()
+    return sorted(
+        path for path in candidates
+        if path.suffix.lower() in supported and path.is_file()
+    )
+
+
+def output_path_for(document: Path, input_dir: Path, output_dir: Path) -> Path:
+    """Map a document to its output file.
+
+    The output keeps the document's full name, so report.pdf and
+    report.docx in one directory do not collide.
+
+    Args:
+        document: Document inside input_dir.
+        input_dir: Directory being extracted.
+        output_dir: Root of the output tree.
+
+    Returns:
+        output_dir / <relative path> + OUTPUT_SUFFIX.
+    """
+    relative = document.relative_to(input_dir)
+    return output_dir / relative.with_name(relative.name + OUTPUT_SUFFIX)
+
+
+def extract_directory(
+    input_dir: Path,
+    output_dir: Path,
+    recursive: bool = False,
+    workers: int | None = None,
+    options: ExtractionOptions | None = None,
+    router: DocumentRouter | None = None,
+    on_result: Callable[[ManifestEntry], None] | None = None,
+    recycle: WorkerRecycling | None = None,
+) -> BatchSummary:
+    """Extract every supported document under a directory.
+
+    Args:
+        input_dir: Directory to extract.
+        output_dir: Root of the output tree; also holds the manifest.
+            Created if missing.
+        recursive: Also extract documents in subdirectories.
+        workers: Worker processes. Defaults to the number of CPUs.
+        options: Stages, page range and limits to extract.
+        router: Router to extract with. Defaults to a plain router.
+        on_result: Optional callable(entry) called after each document
+            is recorded, e.g. to report progress.
+        recycle: When to replace the worker processes (see
+            DocumentRouter.process_many()).
+
+    Returns:
+        BatchSummary of extracted, partial, failed and skipped documents.
+    """
+    router = router or DocumentRouter()
+    if workers is None:
+        workers = os.cpu_count() or 1
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest = Manifest(output_dir / MANIFEST_NAME)
+    summary = BatchSummary()
+    run_options = options_digest(options)
+
+    pending = []
+    extractors: dict[Path, str] = {}
+    for document in discover_documents(input_dir, recursive):
+        relative = document.relative_to(input_dir).as_posix()
+        extractors[document] = extractor_tag(router, document)
+        output_path = output_path_for(document, input_dir, output_dir)
+        if manifest.is_current(relative, document, output_path, extractors[document], run_options):
+            summary.skipped += 1
+        else:
+            pending.append(document)
+
+    # process_many() pulls each path just before submitting it; one file
+    # in flight per worker keeps queue time out of the durations
+    started: dict[Path, float] = {}
+
+    def submitted() -> Iterator[Path]:
+        for document in pending:
+            started[document] = time.perf_counter()
+            yield document
+
+    batch = router.process_many(
+        submitted(), options, workers=workers, max_in_flight=workers, recycle=recycle
+    )
+    for document, result in batch:
+        duration = time.perf_counter() - started.pop(document)
+        status = _status(result)
+        if status != "failed":
+            output_path = output_path_for(document, input_dir, output_dir)
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            output_path.write_text(result.model_dump_json(indent=2))
+
+        stat = document.stat() if document.exists() else None
+        entry = ManifestEntry(
+            path=document.relative_to(input_dir).as_posix(),
+            size=stat.st_size if stat else 0,
+            mtime=stat.st_mtime if stat else 0.0,
+            digest=file_digest(document) if stat else "",
+            status=status,
+            duration_seconds=round(duration, 3),
+            error=result.errors[0] if status == "failed" else None,
+            extractor=extractors[document],
+            options=run_options,
+        )
+        manifest.record(entry)
+        if status == "ok":
+            summary.extracted += 1
+        elif status == "partial":
+            summary.partial += 1
+        else:
+            summary.failed += 1
+        if on_result is not None:
+            on_result(entry)
+    return summary
+
+
+def _status(result: ExtractionResult) -> Literal["ok", "partial", "failed"]:
+    """Classify a result for the manifest.
+
+    Args:
+        result: Result of one document.
+
+    Returns:
+        "ok" without errors, "failed" if errors left no content at all,
+        otherwise "partial".
+    """
+    if not result.errors:
+        return "ok"
+    if not (result.markdown or result.tables or result.images):
+        return "failed"
+    return "partial"
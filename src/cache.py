@@ -0,0 +1,294 @@
+"""
+On-disk caches of extraction results.
+
+Entries are stored as JSON files named by a content-addressed key, so
+the same content is only extracted once even if it arrives again under
+a different name. Writes are atomic (temp file + rename), which lets
+several processes share one cache directory. Each directory is kept
+under a size limit by evicting the least recently used entries.
+
+Each cache keeps an in-memory LRU index of its entries and their total
+size, so a write costs the same however full the cache is. The index is
+built by one directory scan on the first write and rebuilt only when the
+cache goes over its limit after a quarter of the limit has been written
+since the last scan, which picks up entries written and used by other
+processes sharing the directory.
+
+ResultCache holds whole-document ExtractionResults; PageCache holds the
+content of single PDF pages, so revisions of a document that share
+most pages only extract the pages that changed.
+"""
+
+import hashlib
+import os
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+
+from pydantic import BaseModel, ValidationError
+
+from .models import ExtractionOptions, ExtractionResult, ExtractionStats
+
+# Read size used when hashing files
+HASH_CHUNK_BYTES = 1 << 20
+
+# Default size limit of a cache directory (1 GiB)
+DEFAULT_MAX_BYTES = 1 << 30
+
+# Share of max_bytes written between rescans of the directory
+RESCAN_FRACTION = 0.25
+
+
+def file_digest(file_path: Path | str) -> str:
+    """Hash the bytes of a file.
+
+    Args:
+        file_path: File to hash.
+
+    Returns:
+        Hex BLAKE2b digest of the file content.
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    with open(file_path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_BYTES):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def bytes_digest(data: bytes | memoryview) -> str:
+    """Hash an in-memory document the same way file_digest() hashes files.
+
+    Args:
+        data: Document bytes.
+
+    Returns:
+        Hex BLAKE2b digest of the content.
+    """
+    return hashlib.blake2b(data, digest_size=20).hexdigest()
+
+
+def cache_key(
+    content_digest: str,
+    extractor_class: type,
+    options: ExtractionOptions | None = None,
+) -> str:
+    """Build the cache key for a document and the extractor that reads it.
+
+    Args:
+        content_digest: Digest of the document bytes (see file_digest).
+        extractor_class: Extractor class; its name and version are part
+            of the key so a new extractor version never sees old results.
+        options: Extraction options. Default options share the key of
+            no options; any other selection gets a key of its own.
+            record_stats does not change the content, so it is left out.
+
+    Returns:
+        Hex key usable as a file name.
+    """
+    tag = f"{extractor_class.__name__}:{extractor_class.version}:{content_digest}"
+    if options is not None and options.record_stats:
+        options = options.model_copy(update={"record_stats": False})
+    if options is not None and options != ExtractionOptions():
+        tag += f":{options.model_dump_json()}"
+    return hashlib.blake2b(tag.encode(), digest_size=20).hexdigest()
+
+
+class DirectoryCache:
+    """Size-bounded, LRU-evicted directory of JSON entries.
+
+    Attributes:
+        directory: Cache directory (created if missing).
+        max_bytes: Total size the entries are trimmed to after each write.
+        hits: Number of lookups that found an entry.
+        misses: Number of lookups that did not.
+    """
+
+    def __init__(self, directory: Path | str, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        """Initialize the cache.
+
+        Args:
+            directory: Directory to store entries in.
+            max_bytes: Size limit for all entries together.
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        # Entry sizes by key, least recently used first; None until the first scan
+        self._entries: OrderedDict[str, int] | None = None
+        self._total = 0
+        self._written_since_scan = 0
+
+    def _load(self, key: str, model: type[BaseModel]) -> BaseModel | None:
+        """Read an entry and mark it as recently used.
+
+        Unreadable entries (e.g. left by an older model version) count
+        as misses.
+
+        Args:
+            key: Entry key.
+            model: Pydantic model the entry was stored as.
+
+        Returns:
+            The parsed entry, or None on a miss.
+        """
+        path = self._entry_path(key)
+        try:
+            entry = model.model_validate_json(path.read_bytes())
+            os.utime(path)  # Recency for other processes and rescans
+        except (OSError, ValidationError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        if self._entries is not None and key in self._entries:
+            self._entries.move_to_end(key)
+        return entry
+
+    def _store(self, key: str, entry: BaseModel) -> None:
+        """Write an entry atomically, then evict down to max_bytes.
+
+        Args:
+            key: Entry key.
+            entry: Pydantic model to store as JSON.
+        """
+        data = entry.model_dump_json().encode()
+        fd, tmp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_name, self._entry_path(key))
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+        if self._entries is None:
+            self._scan()
+        else:
+            self._total += len(data) - self._entries.pop(key, 0)
+            self._entries[key] = len(data)
+            self._written_since_scan += len(data)
+        if self._total > self.max_bytes:
+            if self._written_since_scan >= self.max_bytes * RESCAN_FRACTION:
+                self._scan()
+            self._evict()
+
+    def _entry_path(self, key: str) -> Path:
+        """Return the file path of an entry."""
+        return self.directory / f"{key}.json"
+
+    def _scan(self) -> None:
+        """Rebuild the LRU index and total size from the cache directory.
+
+        Entries removed concurrently by another process are ignored.
+        """
+        entries = []
+        for path in self.directory.glob("*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, path.stem, stat.st_size))
+        entries.sort()
+        self._entries = OrderedDict((key, size) for _, key, size in entries)
+        self._total = sum(self._entries.values())
+        self._written_since_scan = 0
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until the cache fits max_bytes."""
+        while self._total > self.max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self._entry_path(key).unlink(missing_ok=True)
+            self._total -= size
+
+
+class ResultCache(DirectoryCache):
+    """Cache of whole-document ExtractionResults."""
+
+    def get(self, key: str, record_stats: bool = True) -> ExtractionResult | None:
+        """Look up a result.
+
+        Stats of the cached result keep their counts but drop the
+        timings and resource figures of the run that produced it, and
+        are marked from_result_cache.
+
+        Args:
+            key: Key from cache_key().
+            record_stats: Whether the caller records stats; if not, the
+                result has no stats, whatever the stored run recorded.
+
+        Returns:
+            Cached ExtractionResult, or None on a miss.
+        """
+        result = self._load(key, ExtractionResult)
+        if result is not None:
+            result.stats = _cached_stats(result.stats) if record_stats else None
+        return result
+
+    def put(self, key: str, result: ExtractionResult) -> None:
+        """Store a result.
+
+        Args:
+            key: Key from cache_key().
+            result: Result to store.
+        """
+        self._store(key, result)
+
+
+def _cached_stats(stats: ExtractionStats | None) -> ExtractionStats:
+    """Stats of a result served from the cache.
+
+    Args:
+        stats: Stats stored with the result, None if its run recorded none.
+
+    Returns:
+        Copy without the original run's timings, bytes read and memory
+        growth, marked from_result_cache.
+    """
+    return (stats or ExtractionStats()).model_copy(update={
+        "wall_seconds": None,
+        "cpu_seconds": None,
+        "stages": {},
+        "page_timings": [],
+        "bytes_read": None,
+        "peak_memory_delta_bytes": None,
+        "from_result_cache": True,
+    })
+
+
+class CachedPage(BaseModel):
+    """Extracted content of one PDF page, independent of its page number.
+
+    Page numbers (in tables, images and image filenames) are filled in
+    again when the page is reused.
+    """
+    blocks: list[tuple[str, float | None]]
+    font_sizes: list[float]
+    tables: list[list[list[str]]]
+    table_skipped: bool
+    # (filename after the page prefix, e.g. "i0.png", ext, width, height)
+    images: list[tuple[str, str, int | None, int | None]]
+
+
+class PageCache(DirectoryCache):
+    """Cache of single-page PDF content keyed by page fingerprint."""
+
+    def get(self, key: str) -> CachedPage | None:
+        """Look up a page.
+
+        Args:
+            key: Page key built by the PDF extractor.
+
+        Returns:
+            Cached page content, or None on a miss.
+        """
+        return self._load(key, CachedPage)
+
+    def put(self, key: str, page: CachedPage) -> None:
+        """Store a page.
+
+        Args:
+            key: Page key built by the PDF extractor.
+            page: Page content to store.
+        """
+        self._store(key, page)
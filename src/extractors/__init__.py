@@ -1,15 +1,38 @@
 """
 Document extractors package.
 
-Exports all extractor classes for easy importing.
+Exports all extractor classes for easy importing. Each class is imported
+on first access, so importing one extractor module does not load the
+libraries behind the others.
 
 Usage:
     from src.extractors import PDFExtractor, DOCXExtractor, PPTXExtractor, XLSXExtractor
 """
 
-from .pdf_extractor import PDFExtractor
-from .docx_extractor import DOCXExtractor
-from .pptx_extractor import PPTXExtractor
-from .xlsx_extractor import XLSXExtractor
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .pdf_extractor import PDFExtractor
+    from .docx_extractor import DOCXExtractor
+    from .pptx_extractor import PPTXExtractor
+    from .xlsx_extractor import XLSXExtractor
+
+# Module defining each exported extractor class
+_EXTRACTOR_MODULES = {
+    "PDFExtractor": ".pdf_extractor",
+    "DOCXExtractor": ".docx_extractor",
+    "PPTXExtractor": ".pptx_extractor",
+    "XLSXExtractor": ".xlsx_extractor",
+}
 
 __all__ = ["PDFExtractor", "DOCXExtractor", "PPTXExtractor", "XLSXExtractor"]
+
+
+def __getattr__(name: str):
+    """Import an extractor class on first access (PEP 562)."""
+    if name not in _EXTRACTOR_MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    extractor_class = getattr(importlib.import_module(_EXTRACTOR_MODULES[name], __name__), name)
+    globals()[name] = extractor_class
+    return extractor_class
@@ -4,14 +4,40 @@ DOCX document extractor using python-docx.
 Handles Microsoft Word documents (.docx format).
 """
 
-from pathlib import Path
+from collections.abc import Iterator
+from itertools import islice
 
 from docx import Document
+from docx.table import Table
 
+from .. import tracing
 from ..base_extractor import BaseExtractor
-from ..models import TableData, ImageData, DocumentMetadata, FileFormat
+from ..source import DocumentSource, SourceInput
+from ..models import (
+    TableData,
+    ImageData,
+    DocumentMetadata,
+    FileFormat,
+    ExtractionEvent,
+    ExtractionOptions,
+    ExtractionStage,
+    MetadataEvent,
+    HeadingEvent,
+    ParagraphEvent,
+    TableEvent,
+    ImageEvent,
+)
 from ..utils.markdown_helpers import clean_text, heading_to_markdown, normalize_whitespace
 
+# Paragraph styles mapped to markdown heading levels
+HEADING_STYLES = {
+    "Title": 1,
+    "Heading 1": 1,
+    "Heading 2": 2,
+    "Heading 3": 3,
+    "Heading 4": 4,
+}
+
 
 class DOCXExtractor(BaseExtractor):
     """Extracts content from DOCX documents.
@@ -19,14 +45,29 @@ class DOCXExtractor(BaseExtractor):
     Uses python-docx for all extraction operations.
     """
 
-    def __init__(self, file_path: Path | str) -> None:
+    file_format = FileFormat.DOCX
+
+    def __init__(
+        self, source: SourceInput | DocumentSource, options: ExtractionOptions | None = None
+    ) -> None:
         """Initialize DOCX extractor.
 
         Args:
-            file_path: Path to DOCX file.
+            source: Path to the DOCX file, or its bytes, buffer or file object.
+            options: Stages and limits to extract.
         """
-        super().__init__(file_path)
-        self._doc = Document(self.file_path)
+        super().__init__(source, options)
+        # python-docx reads the whole package up front, but keeps a
+        # buffer's stream referenced; close() releases both
+        self._stream = None if self.file_path else self.source.open_binary()
+        self._doc = Document(self.file_path or self._stream)
+
+    def close(self) -> None:
+        """Drop the parsed document and close the stream it was read from."""
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+        self._doc = None
 
     def extract_text(self) -> str:
         """Extract document text as markdown.
@@ -47,17 +88,9 @@ class DOCXExtractor(BaseExtractor):
             if not text:
                 continue
 
-            style_name = para.style.name if para.style else ""
-
-            # Map styles to heading levels
-            if style_name == "Title" or style_name == "Heading 1":
-                lines.append(heading_to_markdown(text, 1))
-            elif style_name == "Heading 2":
-                lines.append(heading_to_markdown(text, 2))
-            elif style_name == "Heading 3":
-                lines.append(heading_to_markdown(text, 3))
-            elif style_name == "Heading 4":
-                lines.append(heading_to_markdown(text, 4))
+            level = self._heading_level(para)
+            if level:
+                lines.append(heading_to_markdown(text, level))
             else:
                 lines.append(text)
 
@@ -67,31 +100,163 @@ class DOCXExtractor(BaseExtractor):
     def extract_tables(self) -> list[TableData]:
         """Extract all tables from the document.
 
+        Stops once options.max_tables tables were read.
+
         Returns:
             List of TableData objects with 2D array content.
         """
+        limit = self.options.max_tables
         tables = []
         for table in self._doc.tables:
-            content = []
-            for row in table.rows:
-                row_data = [cell.text.strip() for cell in row.cells]
-                content.append(row_data)
-            if content:
-                tables.append(TableData(
-                    content=content,
-                    page_or_slide=None  # DOCX doesn't expose page numbers
-                ))
+            if limit is not None and len(tables) >= limit:
+                break
+            table_data = self._read_table(table)
+            if table_data:
+                tables.append(table_data)
         return tables
 
     def extract_images(self) -> list[ImageData]:
         """Extract metadata for all images.
 
-        Accesses images through document relationships.
+        Accesses images through document relationships. Stops once
+        options.max_images images were read.
 
         Returns:
             List of ImageData objects.
         """
-        images = []
+        return list(islice(self._iter_images(), self.options.max_images))
+
+    def extract_metadata(self) -> DocumentMetadata:
+        """Extract document metadata.
+
+        Returns:
+            DocumentMetadata object.
+        """
+        props = self._doc.core_properties
+        return DocumentMetadata(
+            title=props.title or None,
+            author=props.author or None,
+            created_date=props.created,   # Already datetime from python-docx
+            modified_date=props.modified,  # Already datetime from python-docx
+            page_count=None,  # Known limitation: not available in python-docx
+            file_format=FileFormat.DOCX,
+            file_size_bytes=self.source.size,
+            source_filename=self.source.name
+        )
+
+    def iter_extract(self) -> Iterator[ExtractionEvent]:
+        """Stream the document as events in body order.
+
+        Paragraphs and tables are yielded as they appear in the document
+        body, followed by the images. A failing stage yields an
+        ErrorEvent and stops that stage; the others carry on. Unselected
+        stages are never read, and the body walk ends as soon as neither
+        text nor (within max_tables) tables remain to be read. DOCX has
+        no pages, so options.page_range is ignored.
+
+        Yields:
+            MetadataEvent, then heading/paragraph and table events in
+            document order, then image events.
+        """
+        options = self.options
+        if options.wants(ExtractionStage.METADATA):
+            try:
+                with self._measure(ExtractionStage.METADATA):
+                    metadata = self.extract_metadata()
+            except Exception as e:
+                yield self._stage_error(ExtractionStage.METADATA, e)
+            else:
+                yield MetadataEvent(metadata=metadata)
+
+        text_ok = options.wants(ExtractionStage.TEXT)
+        tables_ok = options.wants(ExtractionStage.TABLES) and options.max_tables != 0
+        tables_read = 0
+        # Text and tables are read together in body order; the body is
+        # traced as a whole, with a "tables" span per table
+        with tracing.span("body"):
+            for item in self._doc.iter_inner_content() if text_ok or tables_ok else ():
+                if isinstance(item, Table):
+                    if not tables_ok:
+                        continue
+                    try:
+                        with self._measure(ExtractionStage.TABLES):
+                            table_data = self._read_table(item)
+                    except Exception as e:
+                        tables_ok = False
+                        yield self._stage_error(ExtractionStage.TABLES, e)
+                        continue
+                    if table_data:
+                        yield TableEvent(table=table_data)
+                        tables_read += 1
+                        if tables_read == options.max_tables:
+                            tables_ok = False
+                            if not text_ok:
+                                break
+                elif text_ok:
+                    try:
+                        with self._measure(ExtractionStage.TEXT, trace=False):
+                            text = item.text.strip()
+                            level = self._heading_level(item) if text else None
+                    except Exception as e:
+                        text_ok = False
+                        yield self._stage_error(ExtractionStage.TEXT, e)
+                        continue
+                    if not text:
+                        continue
+                    if level:
+                        yield HeadingEvent(text=text, level=level)
+                    else:
+                        yield ParagraphEvent(text=text)
+
+        if options.wants(ExtractionStage.IMAGES):
+            try:
+                with self._measure(ExtractionStage.IMAGES):
+                    images = self.extract_images()
+            except Exception as e:
+                yield self._stage_error(ExtractionStage.IMAGES, e)
+            else:
+                for image in images:
+                    yield ImageEvent(image=image)
+
+    def _heading_level(self, para) -> int | None:
+        """Map a paragraph style to a heading level via HEADING_STYLES.
+
+        Args:
+            para: python-docx Paragraph.
+
+        Returns:
+            Heading level, or None for body text.
+        """
+        style_name = para.style.name if para.style else ""
+        return HEADING_STYLES.get(style_name)
+
+    def _read_table(self, table) -> TableData | None:
+        """Convert a python-docx table to TableData.
+
+        Args:
+            table: python-docx Table.
+
+        Returns:
+            TableData with a 2D array of cell text, or None if the table
+            has no rows.
+        """
+        content = []
+        for row in table.rows:
+            row_data = [cell.text.strip() for cell in row.cells]
+            content.append(row_data)
+        if not content:
+            return None
+        return TableData(
+            content=content,
+            page_or_slide=None  # DOCX doesn't expose page numbers
+        )
+
+    def _iter_images(self) -> Iterator[ImageData]:
+        """Yield metadata for the images in the document relationships.
+
+        Yields:
+            ImageData objects.
+        """
         for idx, rel in enumerate(self._doc.part.rels.values()):
             if "image" in rel.reltype:
                 try:
@@ -102,31 +267,12 @@ class DOCXExtractor(BaseExtractor):
                     if ext == "jpeg":
                         ext = "jpg"
 
-                    images.append(ImageData(
+                    yield ImageData(
                         filename=f"image_{idx}.{ext}",
                         format=ext,
                         width=None,   # Not easily available in python-docx
                         height=None,  # Not easily available in python-docx
                         page_or_slide=None
-                    ))
+                    )
                 except Exception:
                     continue  # Skip images that can't be processed
-        return images
-
-    def extract_metadata(self) -> DocumentMetadata:
-        """Extract document metadata.
-
-        Returns:
-            DocumentMetadata object.
-        """
-        props = self._doc.core_properties
-        return DocumentMetadata(
-            title=props.title or None,
-            author=props.author or None,
-            created_date=props.created,   # Already datetime from python-docx
-            modified_date=props.modified,  # Already datetime from python-docx
-            page_count=None,  # Known limitation: not available in python-docx
-            file_format=FileFormat.DOCX,
-            file_size_bytes=self.file_path.stat().st_size,
-            source_filename=self.file_path.name
-        )
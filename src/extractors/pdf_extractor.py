@@ -7,15 +7,84 @@ extraction requirements.
 """
 
 import fitz  # pymupdf
-from datetime import datetime
+import hashlib
+import re
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import NamedTuple
 
 # Suppress PyMuPDF's recommendation to install pymupdf_layout package
 fitz.no_recommend_layout()
 
+from .. import tracing
 from ..base_extractor import BaseExtractor
-from ..models import TableData, ImageData, DocumentMetadata, FileFormat
+from ..cache import CachedPage, PageCache
+from ..logging_config import get_logger
+from ..source import DocumentSource, SourceInput
+from ..models import (
+    ExtractionResult,
+    ExtractionStats,
+    TableData,
+    ImageData,
+    DocumentMetadata,
+    FileFormat,
+    ExtractionEvent,
+    ExtractionOptions,
+    ExtractionStage,
+    MetadataEvent,
+    BoundaryEvent,
+    HeadingEvent,
+    ParagraphEvent,
+    TableEvent,
+    ImageEvent,
+    PageTiming,
+    StageTiming,
+)
+from ..stats import Stopwatch
+from ..utils.dates import parse_pdf_date
+from ..utils.headings import (
+    estimate_heading_thresholds,
+    font_size_levels,
+    normalize_heading,
+    outline_levels,
+    sample_pages,
+    threshold_level,
+)
 from ..utils.markdown_helpers import clean_text, heading_to_markdown, normalize_whitespace
 
+logger = get_logger(__name__)
+
+# A text block as read from a page:
+# (page number, joined text, rounded size of its first span)
+TextBlock = tuple[int, str, float | None]
+
+# How heading levels are assigned to text blocks
+HEADING_MODES = ("fonts", "outline", "sampled")
+
+# TextPage flags for heading detection: PyMuPDF's "dict" defaults minus
+# TEXT_PRESERVE_IMAGES, so image blocks (and their decoded bytes) are never
+# materialised. The remaining flags all change the text itself, so they stay.
+LEAN_TEXT_FLAGS = fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES
+
+# Image stream filters whose data extract_image() returns as-is
+FILTER_EXTENSIONS = {"DCTDecode": "jpeg", "JPXDecode": "jpx"}
+
+# Header-level image metadata: (extension, width, height)
+ImageInfo = tuple[str, int | None, int | None]
+
+# Indirect object reference in PDF object source, e.g. "12 0 R"
+OBJECT_REFERENCE = re.compile(r"(\d+) \d+ R")
+
+# References back up the object tree, left out of page fingerprints
+BACK_REFERENCE = re.compile(r"/(?:Parent|P)\s+\d+ \d+ R")
+
+# Errors PyMuPDF raises for broken or missing objects
+MUPDF_ERRORS = (RuntimeError, ValueError, fitz.mupdf.FzErrorBase)
+
+# Shards handed to each worker process; more than one evens out uneven pages
+SHARDS_PER_WORKER = 4
+
 
 class PDFExtractor(BaseExtractor):
     """Extracts content from PDF documents.
@@ -23,14 +92,71 @@ class PDFExtractor(BaseExtractor):
     Uses PyMuPDF (fitz) for all extraction operations.
     """
 
-    def __init__(self, file_path) -> None:
+    file_format = FileFormat.PDF
+
+    def __init__(
+        self,
+        source: SourceInput | DocumentSource,
+        options: ExtractionOptions | None = None,
+        lean_text: bool = True,
+        workers: int = 1,
+        table_prefilter: bool = True,
+        heading_mode: str = "fonts",
+        heading_sample_pages: int = 50,
+        page_cache: PageCache | None = None,
+    ) -> None:
         """Initialize PDF extractor.
 
         Args:
-            file_path: Path to PDF file.
+            source: Path to the PDF file, or its bytes, buffer or file object.
+            options: Stages, page range and limits to extract. Pages
+                outside the range are never loaded.
+            lean_text: Parse only text blocks when reading page text.
+                Set to False to use PyMuPDF's default "dict" flags, which
+                also decode every image on the page into the text dict.
+            workers: Number of processes extract_all() spreads the pages
+                over. 1 (the default) walks the pages in this process, as
+                do in-memory documents, which workers cannot reopen.
+            table_prefilter: Skip table detection on pages whose drawings
+                and text layout rule out a ruled table.
+            heading_mode: "fonts" maps the three largest font sizes ≥14pt
+                to H1-H3. "outline" takes headings and levels from the
+                PDF bookmarks, matching titles to blocks on their target
+                pages, and falls back to "fonts" if there is no outline.
+                "sampled" estimates size thresholds from a character-
+                weighted histogram over a page sample, bounding the cost
+                of the estimate on very long documents.
+            heading_sample_pages: Pages sampled in "sampled" mode.
+            page_cache: Optional cache of per-page content. Pages whose
+                content streams and resources match a cached page (from
+                this or any other PDF) are reused instead of re-parsed.
+
+        Raises:
+            ValueError: If workers is less than 1 or heading_mode is unknown.
         """
-        super().__init__(file_path)
-        self._doc = fitz.open(self.file_path)
+        if workers < 1:
+            raise ValueError(f"workers must be at least 1, got {workers}")
+        if heading_mode not in HEADING_MODES:
+            supported = ", ".join(HEADING_MODES)
+            raise ValueError(f"Unknown heading mode: {heading_mode}. Supported: {supported}")
+        super().__init__(source, options)
+        if self.file_path is not None:
+            self._doc = fitz.open(self.file_path)
+        else:
+            self._doc = fitz.open(stream=self.source.data, filetype="pdf")
+        self._text_flags = LEAN_TEXT_FLAGS if lean_text else fitz.TEXTFLAGS_DICT
+        self.workers = workers
+        self.table_prefilter = table_prefilter
+        self._image_cache: dict[int, ImageInfo] = {}
+        self.heading_mode = heading_mode
+        self.heading_sample_pages = heading_sample_pages
+        self._outline: dict[int, dict[str, int]] | None = None
+        if heading_mode == "outline":
+            self._outline = outline_levels(self._doc.get_toc(), len(self._doc))
+        self._thresholds: list[float] | None = None
+        self.page_cache = page_cache
+        self._resource_digests: dict[int, bytes] = {}
+        self._stream_digests: dict[int, bytes] = {}
 
     def extract_text(self) -> str:
         """Extract document text as markdown.
@@ -41,112 +167,46 @@ class PDFExtractor(BaseExtractor):
         if len(self._doc) == 0:
             return ""
 
-        # First pass: collect all font sizes to determine heading thresholds
+        blocks: list[TextBlock] = []
         all_font_sizes: set[float] = set()
-        for page in self._doc:
-            text_dict = page.get_text("dict")
-            for block in text_dict.get("blocks", []):
-                if block.get("type") == 0:  # Text block
-                    for line in block.get("lines", []):
-                        for span in line.get("spans", []):
-                            size = span.get("size", 0)
-                            if size > 0:
-                                all_font_sizes.add(round(size, 1))
+        for page_index in self.options.page_indices(len(self._doc)):
+            page_text = self._read_text_blocks(self._doc.load_page(page_index))
+            blocks.extend(page_text.blocks)
+            all_font_sizes |= page_text.font_sizes
 
-        if not all_font_sizes:
-            return ""
-
-        # Headings are typically ≥14pt; smaller text is body/table content
-        min_heading_size = 14.0
-        heading_sizes = sorted(
-            [s for s in all_font_sizes if s >= min_heading_size],
-            reverse=True
-        )
-
-        # Map heading font sizes to levels (top 3)
-        size_to_level = {}
-        for i, size in enumerate(heading_sizes[:3]):
-            size_to_level[size] = i + 1  # H1, H2, H3
-
-        # Second pass: extract text with heading detection
-        lines = []
-        for page in self._doc:
-            text_dict = page.get_text("dict")
-            for block in text_dict.get("blocks", []):
-                if block.get("type") == 0:  # Text block
-                    block_text = []
-                    block_size = None
-
-                    for line in block.get("lines", []):
-                        line_text = []
-                        for span in line.get("spans", []):
-                            text = span.get("text", "").strip()
-                            if text:
-                                line_text.append(text)
-                                # Use the first span's size for the block
-                                if block_size is None:
-                                    block_size = round(span.get("size", 0), 1)
-                        if line_text:
-                            block_text.append(" ".join(line_text))
-
-                    if block_text:
-                        text = " ".join(block_text)
-                        level = size_to_level.get(block_size)
-                        if level:
-                            lines.append(heading_to_markdown(text, level))
-                        else:
-                            lines.append(text)
-
-        result = "\n\n".join(lines)
-        return normalize_whitespace(clean_text(result))
+        return self._render_markdown(blocks, all_font_sizes)
 
     def extract_tables(self) -> list[TableData]:
         """Extract all tables from the PDF.
 
         Returns:
-            List of TableData objects.
+            List of TableData objects, at most options.max_tables.
         """
-        tables = []
-        for page_num, page in enumerate(self._doc, start=1):
-            try:
-                page_tables = page.find_tables()
-                for table in page_tables:
-                    content = []
-                    for row in table.extract():
-                        # Replace None cells with empty string
-                        content.append([cell if cell else "" for cell in row])
-                    if content:  # Only add non-empty tables
-                        tables.append(TableData(
-                            content=content,
-                            page_or_slide=page_num
-                        ))
-            except Exception:
-                # Skip pages where table detection fails
-                continue
+        limit = self.options.max_tables
+        tables: list[TableData] = []
+        for page_index in self.options.page_indices(len(self._doc)):
+            if limit is not None and len(tables) >= limit:
+                break
+            page = self._doc.load_page(page_index)
+            if self._may_contain_table(page):
+                remaining = None if limit is None else limit - len(tables)
+                tables.extend(self._read_tables(page, page_index + 1, remaining))
         return tables
 
     def extract_images(self) -> list[ImageData]:
         """Extract metadata for all images.
 
         Returns:
-            List of ImageData objects.
+            List of ImageData objects, at most options.max_images.
         """
-        images = []
-        for page_num, page in enumerate(self._doc, start=1):
-            for img_index, img in enumerate(page.get_images(full=True)):
-                try:
-                    xref = img[0]
-                    base_image = self._doc.extract_image(xref)
-                    images.append(ImageData(
-                        filename=f"image_p{page_num}_i{img_index}.{base_image['ext']}",
-                        format=base_image['ext'],
-                        width=base_image.get('width'),
-                        height=base_image.get('height'),
-                        page_or_slide=page_num
-                    ))
-                except Exception:
-                    # Skip corrupt images
-                    continue
+        limit = self.options.max_images
+        images: list[ImageData] = []
+        for page_index in self.options.page_indices(len(self._doc)):
+            if limit is not None and len(images) >= limit:
+                break
+            page = self._doc.load_page(page_index)
+            remaining = None if limit is None else limit - len(images)
+            images.extend(self._read_images(page, page_index + 1, remaining))
         return images
 
     def extract_metadata(self) -> DocumentMetadata:
@@ -159,28 +219,975 @@ class PDFExtractor(BaseExtractor):
         return DocumentMetadata(
             title=meta.get('title') or None,
             author=meta.get('author') or None,
-            created_date=self._parse_pdf_date(meta.get('creationDate')),
-            modified_date=self._parse_pdf_date(meta.get('modDate')),
+            created_date=parse_pdf_date(meta.get('creationDate')),
+            modified_date=parse_pdf_date(meta.get('modDate')),
             page_count=len(self._doc),
             file_format=FileFormat.PDF,
-            file_size_bytes=self.file_path.stat().st_size,
-            source_filename=self.file_path.name
+            file_size_bytes=self.source.size,
+            source_filename=self.source.name
         )
 
-    def _parse_pdf_date(self, date_str: str | None) -> datetime | None:
-        """Parse PDF date string to datetime.
+    def extract_all(self) -> ExtractionResult:
+        """Run all extraction stages in a single walk over the pages.
+
+        Overrides BaseExtractor so each page is loaded once and its text,
+        tables and images are read during that one visit, sharing a single
+        TextPage for the text work. With workers > 1 the page range is
+        split into shards that are walked in separate processes. Heading
+        levels are resolved once all pages are read, then the content is
+        collected as events, so the result matches iter_extract() and
+        running the four extraction methods one after another. Only the
+        pages and stages selected by the options are read. With
+        options.record_stats, per-stage and per-page timings are
+        recorded too; loading a page is charged to its first stage.
+
+        Returns:
+            ExtractionResult containing all extractable content
+            and a list of any non-fatal errors encountered.
+        """
+        with self._trace_extraction():
+            self._start_stats()
+            pages = self.options.page_indices(len(self._doc))
+            if self.workers > 1 and len(pages) > 1 and self.file_path is not None:
+                walk = self._walk_pages_parallel(pages.start, pages.stop)
+            else:
+                walk = self._walk_pages(pages.start, pages.stop)
+            return self._finish_stats(self.finish_walk(walk))
+
+    def walk_shard(self, start: int, stop: int) -> "_PageWalk":
+        """Read one page range of a document extracted in shards.
+
+        Lets a caller spread the pages of one document over its own
+        workers: each shard is walked separately, possibly in another
+        process (the walk pickles), and finish_walk() builds the result.
+
+        Args:
+            start: 0-based index of the first page.
+            stop: 0-based index one past the last page.
+
+        Returns:
+            Walk of the shard, to be merged in page order.
+        """
+        return self._walk_pages(start, stop)
+
+    def finish_walk(self, walk: "_PageWalk") -> ExtractionResult:
+        """Build the result of a document from its page walk.
+
+        Heading levels are resolved over the whole walk, so a document
+        walked in shards gets exactly the result of extract_all(). Only
+        with options.record_stats are stats attached, holding the walk's
+        counts and timings; process totals are only added by extract_all().
+
+        Args:
+            walk: Walk of all selected pages; shards merged in page
+                order with _PageWalk.merge().
+
+        Returns:
+            ExtractionResult of the document.
+        """
+        result = self._collect_events(self._walk_events(walk))
+        if self.options.record_stats:
+            result.stats = ExtractionStats(
+                table_pages_skipped=walk.table_pages_skipped,
+                pages_from_cache=walk.pages_from_cache,
+                pages_processed=walk.pages_read,
+                text_blocks=len(walk.blocks),
+                text_spans=walk.text_spans,
+                page_timings=[
+                    PageTiming(page=page, wall_seconds=wall, cpu_seconds=cpu)
+                    for page, wall, cpu in walk.page_timings
+                ],
+                stages={
+                    stage: StageTiming(wall_seconds=wall, cpu_seconds=cpu)
+                    for stage, (wall, cpu) in walk.stage_seconds.items()
+                },
+            )
+        return result
+
+    def close(self) -> None:
+        """Close the underlying PyMuPDF document.
+
+        MuPDF's process-wide store is left alone, as other documents
+        open in the process may still use it; see shrink_store().
+        """
+        if not self._doc.is_closed:
+            self._doc.close()
+
+    def iter_extract(self) -> Iterator[ExtractionEvent]:
+        """Stream the document page by page as extraction events.
+
+        Heading levels must be known before the first page is emitted.
+        The "outline" and "sampled" heading modes get them cheaply; the
+        "fonts" mode first reads the font sizes of every page (text only).
+        After that each page is visited once and its events are yielded
+        before the next page is loaded, so memory stays bounded by the
+        largest page. Always runs in this process, whatever workers is.
+
+        Yields:
+            MetadataEvent, then per selected page a BoundaryEvent followed
+            by heading/paragraph, table and image events. ErrorEvents
+            report failing stages.
+        """
+        if self.options.wants(ExtractionStage.METADATA):
+            try:
+                yield MetadataEvent(metadata=self.extract_metadata())
+            except Exception as e:
+                yield self._stage_error(ExtractionStage.METADATA, e)
+
+        pages = self.options.page_indices(len(self._doc))
+        level_for = None
+        if self.options.wants(ExtractionStage.TEXT):
+            font_sizes: set[float] = set()
+            try:
+                if self._needs_font_histogram:
+                    font_sizes = self._font_histogram(pages)
+                level_for = self._heading_resolver(font_sizes)
+            except Exception as e:
+                yield self._stage_error(ExtractionStage.TEXT, e)
+
+        for content in self._iter_pages(pages.start, pages.stop):
+            yield BoundaryEvent(kind="page", number=content.page_num)
+            if content.text is not None and level_for is not None:
+                yield from self._text_events(content.text.blocks, level_for)
+            if content.text_error is not None:
+                yield self._stage_error(ExtractionStage.TEXT, content.text_error)
+            for table in content.tables:
+                yield TableEvent(table=table)
+            for image in content.images:
+                yield ImageEvent(image=image)
+            if content.images_error is not None:
+                yield self._stage_error(ExtractionStage.IMAGES, content.images_error)
+
+    def _iter_pages(self, start: int, stop: int) -> Iterator["_PageContent"]:
+        """Visit pages [start, stop) once each and read all their content.
+
+        A failing text or image stage stops that stage for the remaining
+        pages, mirroring a failure of extract_text() or extract_images().
+        Unselected stages are not read, and the table and image stages
+        stop once their limits are reached. With options.record_stats
+        each page carries its timings. An installed tracer gets a "page"
+        span per page, with a span per stage inside it. Each span ends
+        before its page is yielded, also when reading the page raises,
+        so a consumer that stops early never leaves one open.
+
+        Args:
+            start: 0-based index of the first page.
+            stop: 0-based index one past the last page.
+
+        Yields:
+            _PageContent for each page, in page order.
+        """
+        options = self.options
+        text_ok = options.wants(ExtractionStage.TEXT)
+        images_ok = options.wants(ExtractionStage.IMAGES)
+        tables_left = options.max_tables if options.wants(ExtractionStage.TABLES) else 0
+        images_left = options.max_images
+        use_cache = self.page_cache is not None and options.reads_full_pages
+        watch = Stopwatch() if options.record_stats else None
+        tracer = tracing.get_tracer()
+        for page_index in range(start, stop):
+            if watch is not None:
+                watch.reset()
+            page_num = page_index + 1
+            if tracer is not None:
+                page_span = tracer.start_span("page", {"page": page_num})
+            span_end: dict = {}
+            try:
+                page = self._doc.load_page(page_index)
+
+                # Cached pages are only valid while every stage is still running
+                content = None
+                cache_key = None
+                if use_cache and text_ok and images_ok:
+                    cache_key = self._page_cache_key(page)
+                    cached = self.page_cache.get(cache_key) if cache_key else None
+                    if cached is not None:
+                        content = _PageContent.from_cached_page(cached, page_num)
+                        span_end = {"from_cache": True}
+
+                if content is None:
+                    content = _PageContent(page_num=page_num)
+
+                    if text_ok:
+                        with tracing.span("text"):
+                            try:
+                                content.text = self._read_text_blocks(page)
+                            except Exception as e:
+                                content.text_error = str(e)
+                                text_ok = False
+                        if watch is not None:
+                            watch.lap(ExtractionStage.TEXT)
+
+                    if tables_left != 0:
+                        text_rects = content.text.rects if content.text else None
+                        with tracing.span("tables"):
+                            if self._may_contain_table(page, text_rects):
+                                content.tables = self._read_tables(page, content.page_num, tables_left)
+                                if tables_left is not None:
+                                    tables_left -= len(content.tables)
+                            else:
+                                content.table_skipped = True
+                        if watch is not None:
+                            watch.lap(ExtractionStage.TABLES)
+
+                    if images_ok and images_left != 0:
+                        with tracing.span("images"):
+                            try:
+                                content.images = self._read_images(page, content.page_num, images_left)
+                            except Exception as e:
+                                content.images_error = str(e)
+                                images_ok = False
+                        if images_left is not None:
+                            images_left -= len(content.images)
+                        if watch is not None:
+                            watch.lap(ExtractionStage.IMAGES)
+
+                    if cache_key and content.text is not None and content.images_error is None:
+                        self.page_cache.put(cache_key, content.to_cache())
+                    if watch is not None:
+                        content.stage_seconds = watch.stages
+                    span_end = {"tables": len(content.tables), "images": len(content.images)}
+                if watch is not None:
+                    content.timing = watch.page(page_num)
+            except BaseException as e:
+                span_end = {"error": str(e) or type(e).__name__}
+                raise
+            finally:
+                # Ends the span however the page's work stops
+                if tracer is not None:
+                    tracer.end_span(page_span, span_end)
+            yield content
+
+    def _walk_pages(self, start: int, stop: int) -> "_PageWalk":
+        """Read pages [start, stop) into one _PageWalk.
+
+        Args:
+            start: 0-based index of the first page.
+            stop: 0-based index one past the last page.
+
+        Returns:
+            _PageWalk with the content of the visited pages.
+        """
+        walk = _PageWalk()
+        for content in self._iter_pages(start, stop):
+            walk.add(content)
+        return walk
+
+    def _walk_events(self, walk: "_PageWalk") -> Iterator[ExtractionEvent]:
+        """Turn a completed page walk into extraction events.
+
+        Args:
+            walk: Walk covering the whole document.
+
+        Yields:
+            The events iter_extract() would yield, minus page boundaries.
+        """
+        if self.options.wants(ExtractionStage.METADATA):
+            try:
+                with self._measure(ExtractionStage.METADATA):
+                    metadata = self.extract_metadata()
+            except Exception as e:
+                yield self._stage_error(ExtractionStage.METADATA, e)
+            else:
+                yield MetadataEvent(metadata=metadata)
+
+        if walk.text_error is not None:
+            yield self._stage_error(ExtractionStage.TEXT, walk.text_error)
+        elif self.options.wants(ExtractionStage.TEXT):
+            # Heading levels are resolved over the whole document,
+            # so they are the same however the pages were sharded
+            level_for = self._heading_resolver(walk.font_sizes)
+            if level_for is not None:
+                yield from self._text_events(walk.blocks, level_for)
+
+        # Parallel shards each stop at the limits, so trim the merged walk
+        for table in walk.tables[:self.options.max_tables]:
+            yield TableEvent(table=table)
+
+        if walk.images_error is not None:
+            yield self._stage_error(ExtractionStage.IMAGES, walk.images_error)
+        else:
+            for image in walk.images[:self.options.max_images]:
+                yield ImageEvent(image=image)
+
+    def _text_events(self, blocks: list[TextBlock], level_for) -> Iterator[ExtractionEvent]:
+        """Yield heading and paragraph events for text blocks.
+
+        Args:
+            blocks: Text blocks in reading order.
+            level_for: Heading resolver from _heading_resolver().
+
+        Yields:
+            HeadingEvent or ParagraphEvent per block.
+        """
+        for page_num, text, block_size in blocks:
+            level = level_for(page_num, text, block_size)
+            if level:
+                yield HeadingEvent(text=text, level=level, page_or_slide=page_num)
+            else:
+                yield ParagraphEvent(text=text, page_or_slide=page_num)
+
+    def _font_histogram(self, pages: range) -> set[float]:
+        """Read the distinct rounded font sizes of the selected pages.
+
+        Text-only pre-pass used when streaming in "fonts" heading mode.
+
+        Args:
+            pages: 0-based indices of the pages to read.
+
+        Returns:
+            Distinct rounded font sizes used on those pages.
+        """
+        font_sizes: set[float] = set()
+        for page_index in pages:
+            font_sizes |= self._read_text_blocks(self._doc.load_page(page_index)).font_sizes
+        return font_sizes
+
+    def _walk_pages_parallel(self, start: int, stop: int) -> "_PageWalk":
+        """Walk pages [start, stop) in shards across a process pool.
+
+        Each worker opens its own copy of the PDF and walks one contiguous
+        shard. Shards are merged back in page order.
+
+        Args:
+            start: 0-based index of the first page.
+            stop: 0-based index one past the last page.
+
+        Returns:
+            _PageWalk covering the page range.
+        """
+        shards = _shard_ranges(stop - start, self.workers * SHARDS_PER_WORKER)
+        lean_text = self._text_flags == LEAN_TEXT_FLAGS
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            futures = [
+                pool.submit(
+                    _walk_shard, str(self.file_path), start + shard_start, start + shard_stop,
+                    self.options, lean_text, self.heading_mode, self.table_prefilter,
+                    self.page_cache,
+                )
+                for shard_start, shard_stop in shards
+            ]
+            walk = _PageWalk()
+            for future in futures:
+                walk.merge(future.result())
+        return walk
+
+    @property
+    def _needs_font_histogram(self) -> bool:
+        """Whether headings come from the whole-document font sizes."""
+        return self.heading_mode != "sampled" and self._outline is None
+
+    def _page_cache_key(self, page) -> str | None:
+        """Fingerprint a page for the page cache.
+
+        Hashes only what the extracted output depends on: the content
+        streams, the (possibly inherited) resources with the fonts, images
+        and form XObjects they reference, and the resolved page boxes and
+        rotation. Annotations and other references to pages are left out,
+        so a page's key does not change when the pages it links to do.
+        Object numbers are replaced by their order of discovery, so the
+        key survives object renumbering between revisions.
+
+        Args:
+            page: PyMuPDF page object.
+
+        Returns:
+            Hex key, or None if the page could not be fingerprinted.
+        """
+        try:
+            digest = hashlib.blake2b(digest_size=20)
+            header = (
+                f"{self.version}:{self._needs_font_histogram}:"
+                f"{tuple(page.mediabox)}:{tuple(page.cropbox)}:{page.rotation}"
+            )
+            digest.update(header.encode())
+            for xref in page.get_contents():
+                digest.update(self._stream_digest(xref))
+            digest.update(self._resources_digest(page))
+            return digest.hexdigest()
+        except MUPDF_ERRORS as e:
+            logger.warning("Page %d not cached: cannot fingerprint it (%s)", page.number + 1, e)
+            return None
+
+    def _resources_digest(self, page) -> bytes:
+        """Digest of a page's resources, inherited from the page tree if needed.
+
+        Shared resource dictionaries are digested once per document.
+
+        Args:
+            page: PyMuPDF page object.
+
+        Returns:
+            Digest bytes; empty if the page has no resources.
+        """
+        node = page.xref
+        seen = {node}
+        kind, value = self._doc.xref_get_key(node, "Resources")
+        while kind == "null":
+            kind, parent = self._doc.xref_get_key(node, "Parent")
+            if kind != "xref":
+                return b""
+            node = int(parent.split()[0])
+            if node in seen:  # Broken page tree
+                return b""
+            seen.add(node)
+            kind, value = self._doc.xref_get_key(node, "Resources")
+
+        if kind != "xref":
+            return self._graph_digest(value)
+        xref = int(value.split()[0])
+        if xref not in self._resource_digests:
+            self._resource_digests[xref] = self._graph_digest(value)
+        return self._resource_digests[xref]
+
+    def _graph_digest(self, root: str) -> bytes:
+        """Digest of a PDF object and every object reachable from it.
+
+        Walks the references breadth-first with an explicit queue, so deep
+        or cyclic object graphs neither recurse nor depend on the walk
+        order of other pages. Each object is hashed with its references
+        replaced by their order of discovery. Back-references (/Parent,
+        /P) are not followed.
+
+        Args:
+            root: PDF source of the starting object, e.g. "12 0 R" or an
+                inline dictionary.
+
+        Returns:
+            Digest bytes.
+        """
+        digest = hashlib.blake2b(digest_size=20)
+        numbers: dict[int, int] = {}
+        queue: list[int] = []
+
+        def renumber(match: re.Match) -> str:
+            xref = int(match.group(1))
+            if xref not in numbers:
+                numbers[xref] = len(numbers)
+                queue.append(xref)
+            return f"{numbers[xref]} R"
+
+        digest.update(OBJECT_REFERENCE.sub(renumber, BACK_REFERENCE.sub("", root)).encode())
+        # The queue grows while it is walked
+        for xref in queue:
+            source = self._doc.xref_object(xref, compressed=True)
+            digest.update(b"\0")
+            digest.update(OBJECT_REFERENCE.sub(renumber, BACK_REFERENCE.sub("", source)).encode())
+            if self._doc.xref_is_stream(xref):
+                digest.update(self._stream_digest(xref))
+        return digest.digest()
+
+    def _stream_digest(self, xref: int) -> bytes:
+        """Digest of a stream's raw data, memoized per document.
 
         Args:
-            date_str: PDF date format like "D:20240115120000"
+            xref: Object number of the stream.
 
         Returns:
-            datetime object or None if parsing fails.
+            Digest bytes.
         """
-        if not date_str:
+        if xref not in self._stream_digests:
+            data = self._doc.xref_stream_raw(xref) or b""
+            self._stream_digests[xref] = hashlib.blake2b(data, digest_size=20).digest()
+        return self._stream_digests[xref]
+
+    def _read_text_blocks(self, page) -> "_PageText":
+        """Read the text blocks and font sizes of one page.
+
+        Builds one TextPage for the page and parses it once, so the
+        font-size histogram and the block text come from the same visit.
+
+        Args:
+            page: PyMuPDF page object.
+
+        Returns:
+            _PageText with the text blocks in reading order, the distinct
+            rounded font sizes of all spans, the text block bboxes and
+            the number of spans.
+        """
+        collect_sizes = self._needs_font_histogram
+        page_num = page.number + 1
+        textpage = page.get_textpage(flags=self._text_flags)
+        text_dict = page.get_text("dict", textpage=textpage)
+
+        blocks: list[TextBlock] = []
+        font_sizes: set[float] = set()
+        rects: list[fitz.Rect] = []
+        span_count = 0
+        for block in text_dict.get("blocks", []):
+            if block.get("type") != 0:  # Not a text block
+                continue
+            rects.append(fitz.Rect(block["bbox"]))
+
+            block_text = []
+            block_size = None
+            for line in block.get("lines", []):
+                line_text = []
+                spans = line.get("spans", [])
+                span_count += len(spans)
+                for span in spans:
+                    size = span.get("size", 0)
+                    if collect_sizes and size > 0:
+                        font_sizes.add(round(size, 1))
+                    text = span.get("text", "").strip()
+                    if text:
+                        line_text.append(text)
+                        # Use the first span's size for the block
+                        if block_size is None:
+                            block_size = round(size, 1)
+                if line_text:
+                    block_text.append(" ".join(line_text))
+
+            if block_text:
+                blocks.append((page_num, " ".join(block_text), block_size))
+
+        return _PageText(blocks, font_sizes, rects, span_count)
+
+    def _render_markdown(
+        self, blocks: list[TextBlock], all_font_sizes: set[float]
+    ) -> str:
+        """Render text blocks as markdown with heading levels applied.
+
+        Args:
+            blocks: Text blocks of the whole document in reading order.
+            all_font_sizes: Distinct rounded font sizes used in the document.
+
+        Returns:
+            Clean markdown string with heading hierarchy preserved.
+        """
+        level_for = self._heading_resolver(all_font_sizes)
+        if level_for is None:
+            return ""
+
+        lines = []
+        for page_num, text, block_size in blocks:
+            level = level_for(page_num, text, block_size)
+            if level:
+                lines.append(heading_to_markdown(text, level))
+            else:
+                lines.append(text)
+
+        result = "\n\n".join(lines)
+        return normalize_whitespace(clean_text(result))
+
+    def _heading_resolver(self, all_font_sizes: set[float]):
+        """Build the function assigning heading levels to text blocks.
+
+        Uses the outline when heading_mode is "outline" and the document
+        has one, sampled size thresholds in "sampled" mode, and otherwise
+        maps the largest font sizes to headings.
+
+        Args:
+            all_font_sizes: Distinct rounded font sizes used in the document
+                (only read by the "fonts" mapping).
+
+        Returns:
+            Callable (page_num, text, size) -> level or None, or None if
+            the document has no sized text at all.
+        """
+        if self._outline is not None:
+            outline = self._outline
+            # Each outline entry marks at most one block as a heading
+            matched: set[tuple[int, str]] = set()
+
+            def outline_level(page_num: int, text: str, size: float | None) -> int | None:
+                key = normalize_heading(text)
+                level = outline.get(page_num, {}).get(key)
+                if level is None or (page_num, key) in matched:
+                    return None
+                matched.add((page_num, key))
+                return level
+            return outline_level
+
+        if self.heading_mode == "sampled":
+            thresholds = self._sampled_thresholds()
+            return lambda page_num, text, size: threshold_level(size, thresholds)
+
+        if not all_font_sizes:
             return None
+        size_to_level = font_size_levels(all_font_sizes)
+        return lambda page_num, text, size: size_to_level.get(size)
+
+    def _sampled_thresholds(self) -> list[float]:
+        """Estimate heading thresholds from a sample of pages.
+
+        Reads span sizes and character counts from at most
+        heading_sample_pages evenly spaced pages. Computed once per
+        extractor.
+
+        Returns:
+            Heading thresholds in descending order.
+        """
+        if self._thresholds is None:
+            import numpy as np  # imported here so the other heading modes never load it
+
+            sizes: list[float] = []
+            char_counts: list[int] = []
+            for page_index in sample_pages(len(self._doc), self.heading_sample_pages):
+                page = self._doc.load_page(page_index)
+                text_dict = page.get_text("dict", flags=LEAN_TEXT_FLAGS)
+                for block in text_dict.get("blocks", []):
+                    for line in block.get("lines", []):
+                        for span in line.get("spans", []):
+                            size = span.get("size", 0)
+                            chars = len(span.get("text", "").strip())
+                            if size > 0 and chars:
+                                sizes.append(size)
+                                char_counts.append(chars)
+            self._thresholds = estimate_heading_thresholds(
+                np.asarray(sizes, dtype=float), np.asarray(char_counts, dtype=float)
+            )
+        return self._thresholds
+
+    def _may_contain_table(self, page, text_rects: list | None = None) -> bool:
+        """Cheap check whether find_tables() could find anything on a page.
+
+        Table detection builds cells from vector lines and rectangles and
+        only keeps cells holding text. A page without drawings, or whose
+        text lies entirely outside the area covered by its drawings,
+        cannot produce a table, so the expensive call can be skipped.
+
+        Args:
+            page: PyMuPDF page object.
+            text_rects: Text block bboxes if already read for this page.
+
+        Returns:
+            True if find_tables() should run on the page.
+        """
+        if not self.table_prefilter:
+            return True
         try:
-            # Format: D:YYYYMMDDHHmmSS with optional timezone
-            cleaned = date_str.replace("D:", "")[:14]
-            return datetime.strptime(cleaned, "%Y%m%d%H%M%S")
+            drawings = page.get_cdrawings()
+            if not drawings:
+                return False
+
+            # Collinear drawings give an empty area; they cannot form cells
+            drawn_area = fitz.Rect(
+                min(d["rect"][0] for d in drawings),
+                min(d["rect"][1] for d in drawings),
+                max(d["rect"][2] for d in drawings),
+                max(d["rect"][3] for d in drawings),
+            )
+
+            if text_rects is None:
+                text_blocks = page.get_text("blocks", flags=LEAN_TEXT_FLAGS)
+                text_rects = [fitz.Rect(b[:4]) for b in text_blocks]
+            return any(drawn_area.intersects(rect) for rect in text_rects)
         except Exception:
-            return None
+            # Let table detection decide on pages we cannot inspect
+            return True
+
+    def _read_tables(self, page, page_num: int, limit: int | None = None) -> list[TableData]:
+        """Detect and extract the tables on one page.
+
+        Args:
+            page: PyMuPDF page object.
+            page_num: 1-based page number.
+            limit: Stop after this many tables; None for no limit.
+
+        Returns:
+            List of TableData objects; empty if table detection fails.
+        """
+        tables = []
+        try:
+            page_tables = page.find_tables()
+            for table in page_tables:
+                if limit is not None and len(tables) >= limit:
+                    break
+                content = []
+                for row in table.extract():
+                    # Replace None cells with empty string
+                    content.append([cell if cell else "" for cell in row])
+                if content:  # Only add non-empty tables
+                    tables.append(TableData(
+                        content=content,
+                        page_or_slide=page_num
+                    ))
+        except Exception:
+            # Skip the rest of a page where table detection fails
+            pass
+        return tables
+
+    def _read_images(self, page, page_num: int, limit: int | None = None) -> list[ImageData]:
+        """Read metadata for the images placed on one page.
+
+        Args:
+            page: PyMuPDF page object.
+            page_num: 1-based page number.
+            limit: Stop after this many images; None for no limit.
+
+        Returns:
+            List of ImageData objects.
+        """
+        images = []
+        for img_index, img in enumerate(page.get_images(full=True)):
+            if limit is not None and len(images) >= limit:
+                break
+            try:
+                ext, width, height = self._image_info(img)
+                images.append(ImageData(
+                    filename=f"image_p{page_num}_i{img_index}.{ext}",
+                    format=ext,
+                    width=width,
+                    height=height,
+                    page_or_slide=page_num
+                ))
+            except Exception:
+                # Skip corrupt images
+                continue
+        return images
+
+    def _image_info(self, img: tuple) -> ImageInfo:
+        """Get (ext, width, height) of an image without decoding its pixels.
+
+        Reads the image dictionary: /Width and /Height come with the
+        get_images() entry and the extension follows from /Filter, using
+        the same rules as Document.extract_image(). Only images whose
+        filter is a chain fall back to extract_image(). Results are
+        cached per xref, so an image placed on many pages is inspected once.
+
+        Args:
+            img: Entry from page.get_images(full=True).
+
+        Returns:
+            Tuple of (extension, width, height).
+        """
+        xref, _, width, height = img[:4]
+        info = self._image_cache.get(xref)
+        if info is not None:
+            return info
+
+        filter_type, filter_value = self._doc.xref_get_key(xref, "Filter")
+        if filter_type in ("name", "null") and width > 0 and height > 0:
+            filter_name = filter_value.lstrip("/") if filter_type == "name" else ""
+            # extract_image() re-encodes everything but JPEG/JPX as PNG
+            info = (FILTER_EXTENSIONS.get(filter_name, "png"), width, height)
+        else:
+            base_image = self._doc.extract_image(xref)
+            info = (base_image['ext'], base_image.get('width'), base_image.get('height'))
+
+        self._image_cache[xref] = info
+        return info
+
+
+class _PageText(NamedTuple):
+    """Text content of one page."""
+    blocks: list[TextBlock]
+    font_sizes: set[float]
+    rects: list[fitz.Rect]
+    spans: int = 0
+
+
+@dataclass
+class _PageContent:
+    """Everything read from a single page visit.
+
+    text and images are None/empty once their stage has failed.
+    timing and stage_seconds are only set when recording stats.
+    """
+    page_num: int
+    text: _PageText | None = None
+    text_error: str | None = None
+    tables: list[TableData] = field(default_factory=list)
+    table_skipped: bool = False
+    images: list[ImageData] = field(default_factory=list)
+    images_error: str | None = None
+    from_cache: bool = False
+    timing: tuple[int, float, float] | None = None
+    stage_seconds: dict[ExtractionStage, tuple[float, float]] = field(default_factory=dict)
+
+    @classmethod
+    def from_cached_page(cls, cached: CachedPage, page_num: int) -> "_PageContent":
+        """Rebuild page content from a page cache entry.
+
+        Args:
+            cached: Cached page content.
+            page_num: 1-based number of the page in the current document.
+
+        Returns:
+            _PageContent with page numbers filled in.
+        """
+        text = _PageText(
+            blocks=[(page_num, text, size) for text, size in cached.blocks],
+            font_sizes=set(cached.font_sizes),
+            rects=[],
+        )
+        return cls(
+            page_num=page_num,
+            text=text,
+            tables=[TableData(content=t, page_or_slide=page_num) for t in cached.tables],
+            table_skipped=cached.table_skipped,
+            images=[
+                ImageData(
+                    filename=f"image_p{page_num}_{suffix}",
+                    format=ext,
+                    width=width,
+                    height=height,
+                    page_or_slide=page_num,
+                )
+                for suffix, ext, width, height in cached.images
+            ],
+            from_cache=True,
+        )
+
+    def to_cache(self) -> CachedPage:
+        """Convert successfully read page content to a cache entry.
+
+        Returns:
+            CachedPage without page numbers.
+        """
+        return CachedPage(
+            blocks=[(text, size) for _, text, size in self.text.blocks],
+            font_sizes=sorted(self.text.font_sizes),
+            tables=[t.content for t in self.tables],
+            table_skipped=self.table_skipped,
+            # "image_p3_i0.png" is stored as "i0.png"
+            images=[
+                (i.filename.split("_", 2)[2], i.format, i.width, i.height)
+                for i in self.images
+            ],
+        )
+
+
+@dataclass
+class _PageWalk:
+    """Content read from a contiguous range of pages.
+
+    Errors are kept as strings so a walk can be returned from a worker
+    process.
+    """
+    blocks: list[TextBlock] = field(default_factory=list)
+    font_sizes: set[float] = field(default_factory=set)
+    tables: list[TableData] = field(default_factory=list)
+    images: list[ImageData] = field(default_factory=list)
+    text_error: str | None = None
+    images_error: str | None = None
+    table_pages_skipped: int = 0
+    pages_from_cache: int = 0
+    pages_read: int = 0
+    text_spans: int = 0
+    page_timings: list[tuple[int, float, float]] = field(default_factory=list)
+    stage_seconds: dict[ExtractionStage, tuple[float, float]] = field(default_factory=dict)
+
+    def add(self, content: _PageContent) -> None:
+        """Append the content of the next page.
+
+        Args:
+            content: Content of the page after the last one added.
+        """
+        if self.text_error is None:
+            if content.text is not None:
+                self.blocks.extend(content.text.blocks)
+                self.font_sizes |= content.text.font_sizes
+                self.text_spans += content.text.spans
+            self.text_error = content.text_error
+        self.tables.extend(content.tables)
+        self.table_pages_skipped += content.table_skipped
+        self.pages_from_cache += content.from_cache
+        self.pages_read += 1
+        if content.timing is not None:
+            self.page_timings.append(content.timing)
+            self._add_seconds(content.stage_seconds)
+        if self.images_error is None:
+            self.images.extend(content.images)
+            self.images_error = content.images_error
+
+    def merge(self, other: "_PageWalk") -> None:
+        """Append the walk of the following page range.
+
+        A stage that already failed ignores later pages, as it would
+        in a serial walk.
+
+        Args:
+            other: Walk of the pages directly after this one.
+        """
+        if self.text_error is None:
+            self.blocks.extend(other.blocks)
+            self.font_sizes |= other.font_sizes
+            self.text_spans += other.text_spans
+            self.text_error = other.text_error
+        self.tables.extend(other.tables)
+        self.table_pages_skipped += other.table_pages_skipped
+        self.pages_from_cache += other.pages_from_cache
+        self.pages_read += other.pages_read
+        self.page_timings.extend(other.page_timings)
+        self._add_seconds(other.stage_seconds)
+        if self.images_error is None:
+            self.images.extend(other.images)
+            self.images_error = other.images_error
+
+    def _add_seconds(self, stage_seconds: dict[ExtractionStage, tuple[float, float]]) -> None:
+        """Add (wall, cpu) seconds per stage to the walk's totals.
+
+        Args:
+            stage_seconds: Seconds per stage of a page or another walk.
+        """
+        for stage, (wall, cpu) in stage_seconds.items():
+            total_wall, total_cpu = self.stage_seconds.get(stage, (0.0, 0.0))
+            self.stage_seconds[stage] = (total_wall + wall, total_cpu + cpu)
+
+
+def _shard_ranges(page_count: int, shard_count: int) -> list[tuple[int, int]]:
+    """Split [0, page_count) into at most shard_count contiguous ranges.
+
+    Args:
+        page_count: Number of pages to split.
+        shard_count: Desired number of shards.
+
+    Returns:
+        List of (start, stop) page index ranges in page order.
+    """
+    shard_count = max(1, min(shard_count, page_count))
+    size, extra = divmod(page_count, shard_count)
+    ranges = []
+    start = 0
+    for i in range(shard_count):
+        stop = start + size + (1 if i < extra else 0)
+        ranges.append((start, stop))
+        start = stop
+    return ranges
+
+
+def shrink_store() -> None:
+    """Empty MuPDF's process-wide store of decoded fonts, images and objects.
+
+    The store only shrinks under memory pressure, so a long-running
+    worker would otherwise keep up to its 256 MB limit of entries for
+    documents it has long finished. Every open document of the process
+    shares the store and would have to rebuild its entries, so call
+    this only where no other document is open: batch and scheduler
+    workers do after each task.
+    """
+    fitz.TOOLS.store_shrink(100)
+
+
+def _walk_shard(
+    file_path: str,
+    start: int,
+    stop: int,
+    options: ExtractionOptions,
+    lean_text: bool,
+    heading_mode: str,
+    table_prefilter: bool,
+    page_cache: PageCache | None,
+) -> _PageWalk:
+    """Worker entry point: open the PDF and walk one page shard.
+
+    Args:
+        file_path: Path to the PDF file.
+        start: 0-based index of the first page.
+        stop: 0-based index one past the last page.
+        options: Extraction options of the parent extractor.
+        lean_text: Text flag mode of the parent extractor.
+        heading_mode: Heading mode of the parent extractor.
+        table_prefilter: Table prefilter setting of the parent extractor.
+        page_cache: Page cache of the parent extractor.
+
+    Returns:
+        _PageWalk for the shard.
+    """
+    with PDFExtractor(
+        file_path, options, lean_text=lean_text, heading_mode=heading_mode,
+        table_prefilter=table_prefilter, page_cache=page_cache,
+    ) as extractor:
+        return extractor._walk_pages(start, stop)
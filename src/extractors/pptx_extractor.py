@@ -6,26 +6,36 @@ This is a deliberate scoping decision. The architecture fully supports
 PPTX extraction - implementation follows the same BaseExtractor pattern.
 """
 
-from pathlib import Path
+from collections.abc import Iterator
 
 from ..base_extractor import BaseExtractor
-from ..models import TableData, ImageData, DocumentMetadata, FileFormat, ExtractionResult
+from ..source import DocumentSource, SourceInput
+from ..models import (
+    TableData, ImageData, DocumentMetadata, FileFormat, ExtractionOptions,
+    ExtractionEvent, ExtractionStage, MetadataEvent, ErrorEvent,
+)
 
 
 class PPTXExtractor(BaseExtractor):
     """Extracts content from PPTX presentations.
 
-    NOTE: This is a stub implementation. The extract_all() method returns
-    a result with an error message indicating the extractor is not yet implemented.
+    NOTE: This is a stub implementation. iter_extract(), and so
+    extract_all(), report an error indicating the extractor is not yet
+    implemented.
     """
 
-    def __init__(self, file_path: Path | str) -> None:
+    file_format = FileFormat.PPTX
+
+    def __init__(
+        self, source: SourceInput | DocumentSource, options: ExtractionOptions | None = None
+    ) -> None:
         """Initialize PPTX extractor.
 
         Args:
-            file_path: Path to PPTX file.
+            source: Path to the PPTX file, or its bytes, buffer or file object.
+            options: Stages and limits to extract.
         """
-        super().__init__(file_path)
+        super().__init__(source, options)
 
     def extract_text(self) -> str:
         """Extract text from all slides as markdown.
@@ -59,23 +69,23 @@ class PPTXExtractor(BaseExtractor):
         """
         raise NotImplementedError("PPTX metadata extraction not yet implemented")
 
-    def extract_all(self) -> ExtractionResult:
-        """Return result with error indicating not yet implemented.
+    def iter_extract(self) -> Iterator[ExtractionEvent]:
+        """Report the file as recognized but not yet extracted.
 
-        Overrides BaseExtractor to return a stub result instead of
-        calling individual extraction methods.
+        Overrides BaseExtractor so that extract_all(), streaming and the
+        sandbox all give the same stub result instead of calling the
+        individual extraction methods.
 
-        Returns:
-            ExtractionResult with empty content and error message.
+        Yields:
+            MetadataEvent with the file's format, name and size, then
+            an ErrorEvent saying extraction is not yet implemented.
         """
-        return ExtractionResult(
-            markdown="",
-            tables=[],
-            images=[],
-            metadata=DocumentMetadata(
-                file_format=FileFormat.PPTX,
-                file_size_bytes=self.file_path.stat().st_size,
-                source_filename=self.file_path.name,
-            ),
-            errors=["PPTX extraction not yet implemented. File was recognized but content extraction is pending."],
+        yield MetadataEvent(metadata=DocumentMetadata(
+            file_format=FileFormat.PPTX,
+            file_size_bytes=self.source.size,
+            source_filename=self.source.name,
+        ))
+        yield ErrorEvent(
+            stage=ExtractionStage.TEXT,
+            message="PPTX extraction not yet implemented. File was recognized but content extraction is pending.",
         )
@@ -0,0 +1,181 @@
+"""
+Lazily extracted results.
+
+A LazyExtractionResult keeps its extractor open and runs each extraction
+stage the first time the matching field is read, so a caller that only
+needs the metadata never pays for text, table or image extraction.
+to_result() converts it to the eager, serializable ExtractionResult.
+"""
+
+from .base_extractor import BaseExtractor
+from .models import (
+    DocumentMetadata,
+    ExtractionResult,
+    ExtractionStage,
+    ImageData,
+    TableData,
+)
+
+# Extractor method that computes each stage
+STAGE_METHODS = {
+    ExtractionStage.TEXT: "extract_text",
+    ExtractionStage.TABLES: "extract_tables",
+    ExtractionStage.IMAGES: "extract_images",
+    ExtractionStage.METADATA: "extract_metadata",
+}
+
+
+class LazyExtractionResult:
+    """ExtractionResult whose fields are extracted on first access.
+
+    Each field is computed once and memoized. A failing stage is handled
+    as in extract_all(): the field takes its empty value and the failure
+    is listed in errors. Stages not selected by the extractor's options
+    are never run.
+
+    Close the result (or use it as a context manager) to release the
+    extractor; fields already computed stay readable after close().
+    """
+
+    def __init__(self, extractor: BaseExtractor) -> None:
+        """Wrap an open extractor.
+
+        Args:
+            extractor: Extractor to run stages on. The result takes
+                ownership and closes it in close().
+        """
+        self._extractor = extractor
+        self._values: dict[ExtractionStage, object] = {}
+        self._failures: dict[ExtractionStage, str] = {}
+        self._result: ExtractionResult | None = None
+        self._closed = False
+
+    def __enter__(self) -> "LazyExtractionResult":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def markdown(self) -> str:
+        """Full document content as clean markdown."""
+        return self._get(ExtractionStage.TEXT)
+
+    @property
+    def tables(self) -> list[TableData]:
+        """All tables extracted from the document."""
+        return self._get(ExtractionStage.TABLES)
+
+    @property
+    def images(self) -> list[ImageData]:
+        """Metadata for all images found in the document."""
+        return self._get(ExtractionStage.IMAGES)
+
+    @property
+    def metadata(self) -> DocumentMetadata:
+        """Document-level metadata."""
+        return self._get(ExtractionStage.METADATA)
+
+    @property
+    def errors(self) -> list[str]:
+        """Non-fatal errors of the stages computed so far, in stage order."""
+        if self._result is not None:
+            return self._result.errors
+        return [self._failures[stage] for stage in ExtractionStage if stage in self._failures]
+
+    @property
+    def closed(self) -> bool:
+        """Whether the extractor has been released."""
+        return self._closed
+
+    def to_result(self) -> ExtractionResult:
+        """Compute any remaining fields and return the eager result.
+
+        If no field has been read yet, the extractor's own extract_all()
+        is used, so extractors with a fused single-pass walk keep it.
+
+        Returns:
+            ExtractionResult equal to what extract_all() returns.
+
+        Raises:
+            ValueError: If fields are missing and the result is closed.
+        """
+        if self._result is not None:
+            return self._result
+        if not self._values:
+            self._result = self._open_extractor().extract_all()
+            return self._result
+        return ExtractionResult(
+            markdown=self.markdown,
+            tables=self.tables,
+            images=self.images,
+            metadata=self.metadata,
+            errors=self.errors,
+        )
+
+    def close(self) -> None:
+        """Release the extractor. Safe to call more than once."""
+        if not self._closed:
+            self._closed = True
+            self._extractor.close()
+
+    def _get(self, stage: ExtractionStage):
+        """Return a field, computing it on first access.
+
+        Args:
+            stage: Stage that produces the field.
+
+        Returns:
+            The memoized field value.
+        """
+        if self._result is not None:
+            return {
+                ExtractionStage.TEXT: self._result.markdown,
+                ExtractionStage.TABLES: self._result.tables,
+                ExtractionStage.IMAGES: self._result.images,
+                ExtractionStage.METADATA: self._result.metadata,
+            }[stage]
+        if stage not in self._values:
+            self._values[stage] = self._compute(stage)
+        return self._values[stage]
+
+    def _compute(self, stage: ExtractionStage):
+        """Run one stage, applying the options and partial-success rules.
+
+        Args:
+            stage: Stage to run.
+
+        Returns:
+            The stage's output, or its empty value if the stage was not
+            selected or failed.
+
+        Raises:
+            ValueError: If the result is closed.
+        """
+        extractor = self._open_extractor()
+        options = extractor.options
+        if options.wants(stage):
+            try:
+                value = getattr(extractor, STAGE_METHODS[stage])()
+            except Exception as e:
+                self._failures[stage] = extractor._stage_error(stage, e).message
+            else:
+                if stage == ExtractionStage.TABLES:
+                    return value[:options.max_tables]
+                if stage == ExtractionStage.IMAGES:
+                    return value[:options.max_images]
+                return value
+
+        if stage == ExtractionStage.METADATA:
+            return extractor._fallback_metadata(failed=stage in self._failures)
+        return "" if stage == ExtractionStage.TEXT else []
+
+    def _open_extractor(self) -> BaseExtractor:
+        """Return the extractor, refusing to run stages after close().
+
+        Raises:
+            ValueError: If the result is closed.
+        """
+        if self._closed:
+            raise ValueError("Cannot extract from a closed LazyExtractionResult")
+        return self._extractor
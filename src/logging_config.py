@@ -15,31 +15,34 @@ Log levels to use:
 - ERROR: Failures captured in the errors list
 """
 
-# TODO: Uncomment when implementing
-# import logging
-# import sys
+import logging
+import sys
 
 # Default format: timestamp, level, module, message
-# DEFAULT_FORMAT = "%(asctime)s | %(levelname)-8s | %(name)s | %(message)s"
-# DEFAULT_LEVEL = logging.INFO
+DEFAULT_FORMAT = "%(asctime)s | %(levelname)-8s | %(name)s | %(message)s"
+DEFAULT_LEVEL = logging.INFO
 
 
-def get_logger(name: str, level: int = 20) -> object:
+def get_logger(name: str, level: int = DEFAULT_LEVEL) -> logging.Logger:
     """Get a configured logger for the given module name.
 
+    The first call for a name attaches a stderr handler with
+    DEFAULT_FORMAT; later calls only update the level, so no message is
+    printed twice.
+
     Args:
         name: Module name, typically __name__
         level: Logging level (default: INFO = 20)
 
     Returns:
         Configured logger instance
-
-    Implementation notes:
-    - Use logging.getLogger(name)
-    - Check if handlers already exist to avoid duplicates
-    - Add StreamHandler to sys.stderr
-    - Set formatter with DEFAULT_FORMAT
-    - Set level on logger
     """
-    # TODO: Implement logging configuration
-    pass
+    logger = logging.getLogger(name)
+    if not logger.handlers:
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setFormatter(logging.Formatter(DEFAULT_FORMAT))
+        logger.addHandler(handler)
+        # The handler above already prints; don't repeat via the root logger
+        logger.propagate = False
+    logger.setLevel(level)
+    return logger
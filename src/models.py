@@ -7,7 +7,8 @@ a uniform interface regardless of input document format.
 
 from datetime import datetime
 from enum import Enum
-from pydantic import BaseModel, Field
+from typing import Annotated, Literal, Union
+from pydantic import BaseModel, Field, field_serializer, field_validator
 
 
 class FileFormat(str, Enum):
@@ -86,6 +87,89 @@ class DocumentMetadata(BaseModel):
     source_filename: str
 
 
+class ExtractionStats(BaseModel):
+    """Counters describing how an extraction was carried out.
+
+    Attached only when ExtractionOptions.record_stats is set. Populated
+    by extractors that track them; fields an extractor does not track
+    keep their defaults.
+    """
+    table_pages_skipped: int = Field(
+        default=0,
+        description="Pages where table detection was skipped because they cannot hold a ruled table."
+    )
+    pages_from_cache: int = Field(
+        default=0,
+        description="Pages reused from the page cache instead of being parsed."
+    )
+    from_result_cache: bool = Field(
+        default=False,
+        description="The result was served from the result cache; the timings, "
+                    "bytes read and memory growth of the run that produced it "
+                    "are left out."
+    )
+
+    wall_seconds: float | None = Field(
+        default=None,
+        description="Wall-clock seconds of the whole extraction."
+    )
+    cpu_seconds: float | None = Field(
+        default=None,
+        description="CPU seconds of the extracting process over the extraction."
+    )
+    stages: dict["ExtractionStage", "StageTiming"] = Field(
+        default_factory=dict,
+        description="Time per stage. Work spread over worker processes is summed."
+    )
+    page_timings: list["PageTiming"] = Field(
+        default_factory=list,
+        description="Time per page visited (PDF only), in page order."
+    )
+    pages_processed: int | None = Field(
+        default=None,
+        description="Pages visited, including pages from the page cache (PDF only)."
+    )
+    text_blocks: int | None = Field(
+        default=None,
+        description="Heading and paragraph blocks extracted."
+    )
+    text_spans: int | None = Field(
+        default=None,
+        description="Text spans parsed; cached pages are not parsed (PDF only)."
+    )
+    tables_found: int | None = Field(
+        default=None,
+        description="Tables in the result."
+    )
+    images_found: int | None = Field(
+        default=None,
+        description="Images in the result."
+    )
+    bytes_read: int | None = Field(
+        default=None,
+        description="Bytes the process read during the extraction; None where "
+                    "the platform does not report it."
+    )
+    peak_memory_delta_bytes: int | None = Field(
+        default=None,
+        description="How far the extraction raised the process's peak resident "
+                    "memory; 0 if it stayed below an earlier peak."
+    )
+
+
+class StageTiming(BaseModel):
+    """Time spent in one extraction stage."""
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+
+
+class PageTiming(BaseModel):
+    """Time spent visiting one page, all stages included."""
+    page: int = Field(description="1-based page number.")
+    wall_seconds: float
+    cpu_seconds: float
+
+
 class ExtractionResult(BaseModel):
     """Unified output from any document extractor.
 
@@ -110,3 +194,210 @@ class ExtractionResult(BaseModel):
         default_factory=list,
         description="Non-fatal errors encountered during extraction."
     )
+    stats: ExtractionStats | None = Field(
+        default=None,
+        description="Extraction counters and, with record_stats, timings."
+    )
+
+
+# ---------------------------------------------------------------------------
+# Streaming events
+#
+# BaseExtractor.iter_extract() yields these as content is produced.
+# Collecting them in order rebuilds the ExtractionResult of extract_all().
+# ---------------------------------------------------------------------------
+
+
+class ExtractionStage(str, Enum):
+    """Extraction stages, in the order their errors are reported."""
+    TEXT = "text"
+    TABLES = "tables"
+    IMAGES = "images"
+    METADATA = "metadata"
+
+
+class MetadataEvent(BaseModel):
+    """Document-level metadata, emitted before any content."""
+    type: Literal["metadata"] = "metadata"
+    metadata: DocumentMetadata
+
+
+class BoundaryEvent(BaseModel):
+    """Start of a page, slide or sheet."""
+    type: Literal["boundary"] = "boundary"
+    kind: Literal["page", "slide", "sheet"]
+    number: int = Field(description="1-based page, slide or sheet number.")
+
+
+class HeadingEvent(BaseModel):
+    """A heading in the document text."""
+    type: Literal["heading"] = "heading"
+    text: str
+    level: int = Field(description="Heading level (1 = top level).")
+    page_or_slide: int | None = None
+
+
+class ParagraphEvent(BaseModel):
+    """A block of body text."""
+    type: Literal["paragraph"] = "paragraph"
+    text: str
+    page_or_slide: int | None = None
+
+
+class TableEvent(BaseModel):
+    """An extracted table."""
+    type: Literal["table"] = "table"
+    table: TableData
+
+
+class ImageEvent(BaseModel):
+    """Metadata for an image."""
+    type: Literal["image"] = "image"
+    image: ImageData
+
+
+class ErrorEvent(BaseModel):
+    """A non-fatal failure of one extraction stage.
+
+    Content of the failed stage emitted before the error is discarded
+    when events are collected into an ExtractionResult.
+    """
+    type: Literal["error"] = "error"
+    stage: ExtractionStage
+    message: str
+
+
+ExtractionEvent = Annotated[
+    Union[
+        MetadataEvent,
+        BoundaryEvent,
+        HeadingEvent,
+        ParagraphEvent,
+        TableEvent,
+        ImageEvent,
+        ErrorEvent,
+    ],
+    Field(discriminator="type"),
+]
+
+
+# ---------------------------------------------------------------------------
+# Extraction options
+# ---------------------------------------------------------------------------
+
+
+class ExtractionOptions(BaseModel):
+    """Selects which content an extraction produces.
+
+    Extractors skip the work for anything not selected instead of
+    computing and discarding it. The defaults extract everything.
+    """
+    stages: frozenset[ExtractionStage] = Field(
+        default=frozenset(ExtractionStage),
+        description="Stages to run. Unselected stages yield no content."
+    )
+    page_range: tuple[int, int] | None = Field(
+        default=None,
+        description="Inclusive 1-based (first, last) page, slide or sheet range. "
+                    "None selects all; formats without pages ignore it."
+    )
+    max_tables: int | None = Field(
+        default=None,
+        ge=0,
+        description="Stop table extraction once this many tables were found."
+    )
+    max_images: int | None = Field(
+        default=None,
+        ge=0,
+        description="Stop image extraction once this many images were found."
+    )
+    record_stats: bool = Field(
+        default=False,
+        description="Record timings, counts, bytes read and peak memory growth in "
+                    "ExtractionResult.stats."
+    )
+
+    @field_validator("page_range")
+    @classmethod
+    def _check_page_range(cls, value: tuple[int, int] | None) -> tuple[int, int] | None:
+        """Reject ranges that cannot select any page."""
+        if value is not None and not 1 <= value[0] <= value[1]:
+            raise ValueError(f"page_range must satisfy 1 <= first <= last, got {value}")
+        return value
+
+    @field_serializer("stages")
+    def _serialize_stages(self, stages: frozenset[ExtractionStage]) -> list[str]:
+        """Serialize stages in stage order, so equal options dump equally."""
+        return [stage.value for stage in ExtractionStage if stage in stages]
+
+    def wants(self, stage: ExtractionStage) -> bool:
+        """Whether a stage was selected.
+
+        Args:
+            stage: Extraction stage.
+
+        Returns:
+            True if the stage should run.
+        """
+        return stage in self.stages
+
+    @property
+    def reads_full_pages(self) -> bool:
+        """Whether every stage runs without limits, so each page is read in full."""
+        return (
+            self.stages == frozenset(ExtractionStage)
+            and self.max_tables is None
+            and self.max_images is None
+        )
+
+    def page_indices(self, page_count: int) -> range:
+        """0-based indices of the selected pages, clipped to the document.
+
+        Args:
+            page_count: Number of pages, slides or sheets in the document.
+
+        Returns:
+            Range of selected indices, in document order.
+        """
+        if self.page_range is None:
+            return range(page_count)
+        first, last = self.page_range
+        return range(min(first - 1, page_count), min(last, page_count))
+
+
+class SandboxLimits(BaseModel):
+    """Resource limits for extractions run in an isolated child process.
+
+    A child that breaches a limit is killed, and its result keeps the
+    content streamed before the breach. None disables a limit.
+    """
+    timeout_seconds: float | None = Field(
+        default=None,
+        gt=0,
+        description="Wall-clock seconds the child may run."
+    )
+    max_memory_bytes: int | None = Field(
+        default=None,
+        gt=0,
+        description="Resident memory the child may use, including the interpreter "
+                    "and document libraries (roughly 100 MB)."
+    )
+
+
+class WorkerRecycling(BaseModel):
+    """When batch worker processes are replaced by fresh ones.
+
+    Native libraries keep caches and fragmented heaps that a worker
+    never returns to the system; replacing workers bounds that growth
+    over long batches. None disables a limit.
+    """
+    max_documents: int | None = Field(
+        default=None,
+        ge=1,
+        description="Documents a worker processes before it is replaced."
+    )
+    max_rss_bytes: int | None = Field(
+        default=None,
+        gt=0,
+        description="Resident memory after a document above which its worker is replaced."
+    )
@@ -0,0 +1,195 @@
+"""
+Fast metadata probes.
+
+A probe reads only the parts of a file that hold document-level
+metadata: the PDF trailer and info dictionary, or the package
+relationships and property parts of an OOXML zip. No page, paragraph
+or slide content is parsed, so probing takes milliseconds even for
+large documents and suits triage and queue routing.
+"""
+
+import zipfile
+from xml.etree import ElementTree
+
+from .models import DocumentMetadata, FileFormat
+from .source import DocumentSource
+from .utils.dates import parse_pdf_date, parse_w3cdtf
+
+# Relationship types in the package-level _rels/.rels part
+CORE_PROPERTIES_REL = (
+    "http://schemas.openxmlformats.org/package/2006/relationships/metadata/core-properties"
+)
+EXTENDED_PROPERTIES_REL = (
+    "http://schemas.openxmlformats.org/officeDocument/2006/relationships/extended-properties"
+)
+OFFICE_DOCUMENT_REL = (
+    "http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"
+)
+
+# XML namespaces of the parts read by the probes
+NAMESPACES = {
+    "rel": "http://schemas.openxmlformats.org/package/2006/relationships",
+    "cp": "http://schemas.openxmlformats.org/package/2006/metadata/core-properties",
+    "dc": "http://purl.org/dc/elements/1.1/",
+    "dcterms": "http://purl.org/dc/terms/",
+    "ep": "http://schemas.openxmlformats.org/officeDocument/2006/extended-properties",
+    "p": "http://schemas.openxmlformats.org/presentationml/2006/main",
+    "x": "http://schemas.openxmlformats.org/spreadsheetml/2006/main",
+}
+
+# Where the page, slide or sheet count lives for each OOXML format:
+# (part, XPath of the counted or read elements, whether to count them)
+PAGE_COUNT_SOURCES = {
+    # Word stores the page count it last laid out in the extended properties
+    FileFormat.DOCX: ("extended", "ep:Pages", False),
+    # Counted from the main part: the extended properties are not kept
+    # up to date by every writer (python-pptx never updates Slides)
+    FileFormat.PPTX: ("main", "p:sldIdLst/p:sldId", True),
+    FileFormat.XLSX: ("main", "x:sheets/x:sheet", True),
+}
+
+
+def probe_document(source: DocumentSource, file_format: FileFormat) -> DocumentMetadata:
+    """Read the metadata of a document without extracting its content.
+
+    Args:
+        source: Document file or in-memory document.
+        file_format: Format of the document.
+
+    Returns:
+        DocumentMetadata with the fields the format records.
+
+    Raises:
+        ValueError: If the format cannot be probed.
+    """
+    if file_format == FileFormat.PDF:
+        return probe_pdf(source)
+    if file_format in PAGE_COUNT_SOURCES:
+        return probe_ooxml(source, file_format)
+    raise ValueError(f"Cannot probe format: {file_format.value}")
+
+
+def probe_pdf(source: DocumentSource) -> DocumentMetadata:
+    """Read a PDF's info dictionary and page count.
+
+    Opening a document makes MuPDF read the cross-reference table and
+    trailer; the page count comes from the page tree root. No page is
+    loaded.
+
+    Args:
+        source: PDF file or in-memory PDF.
+
+    Returns:
+        DocumentMetadata equal to PDFExtractor.extract_metadata().
+    """
+    import fitz  # pymupdf; imported here so probing OOXML never loads it
+
+    if source.path is not None:
+        doc = fitz.open(source.path)
+    else:
+        doc = fitz.open(stream=source.data, filetype="pdf")
+    with doc:
+        meta = doc.metadata or {}
+        page_count = doc.page_count
+    return DocumentMetadata(
+        title=meta.get("title") or None,
+        author=meta.get("author") or None,
+        created_date=parse_pdf_date(meta.get("creationDate")),
+        modified_date=parse_pdf_date(meta.get("modDate")),
+        page_count=page_count,
+        file_format=FileFormat.PDF,
+        file_size_bytes=source.size,
+        source_filename=source.name,
+    )
+
+
+def probe_ooxml(source: DocumentSource, file_format: FileFormat) -> DocumentMetadata:
+    """Read an OOXML package's core properties and page count.
+
+    Parts are located through the package relationships, falling back
+    to the conventional docProps/ names. Only the relationships, the
+    property parts and (for PPTX and XLSX) the small main part are
+    decompressed.
+
+    Args:
+        source: DOCX, PPTX or XLSX file or in-memory document.
+        file_format: One of FileFormat.DOCX, PPTX or XLSX.
+
+    Returns:
+        DocumentMetadata with title, author, dates and page, slide or
+        sheet count where the package records them.
+    """
+    with zipfile.ZipFile(source.path or source.open_binary()) as package:
+        targets = _package_targets(package)
+        core = _read_part(package, targets.get(CORE_PROPERTIES_REL, "docProps/core.xml"))
+        parts = {
+            "extended": targets.get(EXTENDED_PROPERTIES_REL, "docProps/app.xml"),
+            "main": targets.get(OFFICE_DOCUMENT_REL),
+        }
+        part_name, xpath, count = PAGE_COUNT_SOURCES[file_format]
+        count_part = _read_part(package, parts[part_name])
+
+    page_count = None
+    if count_part is not None:
+        if count:
+            page_count = len(count_part.findall(xpath, NAMESPACES))
+        else:
+            page_count = _int_or_none(count_part.findtext(xpath, namespaces=NAMESPACES))
+
+    def core_text(tag: str) -> str | None:
+        return (core.findtext(tag, namespaces=NAMESPACES) or None) if core is not None else None
+
+    return DocumentMetadata(
+        title=core_text("dc:title"),
+        author=core_text("dc:creator"),
+        created_date=parse_w3cdtf(core_text("dcterms:created")),
+        modified_date=parse_w3cdtf(core_text("dcterms:modified")),
+        page_count=page_count,
+        file_format=file_format,
+        file_size_bytes=source.size,
+        source_filename=source.name,
+    )
+
+
+def _package_targets(package: zipfile.ZipFile) -> dict[str, str]:
+    """Map package-level relationship types to their part names.
+
+    Args:
+        package: Open OOXML zip.
+
+    Returns:
+        Dict of relationship type to part name inside the zip.
+    """
+    rels = _read_part(package, "_rels/.rels")
+    if rels is None:
+        return {}
+    return {
+        rel.get("Type"): rel.get("Target", "").lstrip("/")
+        for rel in rels.findall("rel:Relationship", NAMESPACES)
+    }
+
+
+def _read_part(package: zipfile.ZipFile, name: str | None) -> ElementTree.Element | None:
+    """Parse one XML part of the package.
+
+    Args:
+        package: Open OOXML zip.
+        name: Part name, or None.
+
+    Returns:
+        Root element, or None if the part is missing or malformed.
+    """
+    if not name:
+        return None
+    try:
+        return ElementTree.fromstring(package.read(name))
+    except (KeyError, ElementTree.ParseError):
+        return None
+
+
+def _int_or_none(text: str | None) -> int | None:
+    """Convert element text to int, or None if it is not a number."""
+    try:
+        return int(text) if text else None
+    except ValueError:
+        return None
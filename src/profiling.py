@@ -0,0 +1,256 @@
+"""
+Profiling of extractions split by stage.
+
+StageProfiler is a Tracer that profiles the time spent in each
+extraction stage separately. It switches between one cProfile profile
+per stage as the stage spans of src.tracing start and end. Work outside
+any stage, such as routing, page loading and result assembly, is
+profiled as "other". Alongside it, a sampling thread records the Python
+stack of the extracting thread every few milliseconds. This gives
+flamegraph-ready collapsed stacks per stage.
+
+    with StageProfiler() as profiler:
+        DocumentRouter().process_document("report.pdf")
+    profiler.write("profile/")
+    print(profiler.report())
+
+write() saves <stage>.pstats and <stage>.collapsed per profiled stage,
+plus all.pstats. Open the .pstats files with pstats or snakeviz. Feed
+the .collapsed files to flamegraph.pl or speedscope. report() lists the
+hottest functions of each stage and the time each library took.
+
+Only the thread that entered the profiler is profiled, so run the
+extraction in-process, with one worker and without a sandbox.
+"""
+
+import cProfile
+import pstats
+import sys
+import sysconfig
+import threading
+from collections import Counter
+from pathlib import Path
+from types import FrameType
+from typing import Any
+
+from . import tracing
+
+# Spans that switch the active profile; other spans ("extract_all",
+# "page") only contain stages
+STAGE_SPANS = ("metadata", "text", "tables", "images", "body")
+
+# Profile of the work outside any stage span
+OTHER = "other"
+
+# Seconds between stack samples
+SAMPLE_INTERVAL = 0.001
+
+# Library of a profiled function, by a marker in its file or built-in name
+LIBRARIES = (
+    ("PyMuPDF", ("pymupdf", "fitz")),
+    ("python-docx", ("/docx/", "docx.")),
+    ("lxml", ("lxml",)),
+    ("pydantic", ("pydantic",)),
+    ("document-extractor", (str(Path(__file__).parent),)),
+)
+
+_STDLIB = sysconfig.get_paths()["stdlib"]
+
+
+def library_of(filename: str, function: str) -> str:
+    """Attribute a profiled function to the library it belongs to.
+
+    Args:
+        filename: Source file from the pstats key; "~" for built-ins.
+        function: Function name from the pstats key, e.g.
+            "<built-in method pymupdf._extra.page_get_textpage>".
+
+    Returns:
+        A name from LIBRARIES, "stdlib" or "other".
+    """
+    where = function if filename == "~" else filename
+    for library, markers in LIBRARIES:
+        if any(marker in where for marker in markers):
+            return library
+    if filename == "~" or filename.startswith(_STDLIB):
+        return "stdlib"
+    return "other"
+
+
+class StageProfiler(tracing.Tracer):
+    """Profiles each extraction stage separately.
+
+    Use as a context manager: entering installs the profiler as the
+    tracer and starts profiling the current thread; leaving stops both.
+
+    Attributes:
+        profiles: cProfile profile per stage, plus OTHER.
+        samples: Collapsed-stack sample counts per stage.
+    """
+
+    def __init__(self, sample_interval: float = SAMPLE_INTERVAL) -> None:
+        """Prepare the profiles.
+
+        Args:
+            sample_interval: Seconds between stack samples.
+        """
+        self.profiles: dict[str, cProfile.Profile] = {}
+        self.samples: dict[str, Counter[str]] = {}
+        self.sample_interval = sample_interval
+        self._stages = [OTHER]
+        self._thread_id: int | None = None
+        self._previous: tracing.Tracer | None = None
+        self._stop = threading.Event()
+        self._sampler: threading.Thread | None = None
+
+    def __enter__(self) -> "StageProfiler":
+        self._thread_id = threading.get_ident()
+        self._previous = tracing.set_tracer(self)
+        self._stop.clear()
+        self._sampler = threading.Thread(target=self._sample, name="stage-sampler", daemon=True)
+        self._sampler.start()
+        self._profile(OTHER).enable()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._profile(self._stages[-1]).disable()
+        tracing.set_tracer(self._previous)
+        self._stop.set()
+        self._sampler.join()
+
+    def start_span(self, name: str, attributes: dict[str, Any]) -> Any:
+        """Switch to the stage's profile when a stage span starts."""
+        if name not in STAGE_SPANS or threading.get_ident() != self._thread_id:
+            return None
+        self._profile(self._stages[-1]).disable()
+        self._stages.append(name)
+        self._profile(name).enable()
+        return name
+
+    def end_span(self, handle: Any, attributes: dict[str, Any]) -> None:
+        """Switch back to the enclosing profile when a stage span ends."""
+        if handle is None:
+            return
+        self._profile(self._stages.pop()).disable()
+        self._profile(self._stages[-1]).enable()
+
+    def stats(self, stage: str) -> pstats.Stats:
+        """Profile statistics of one stage.
+
+        Args:
+            stage: Stage span name or OTHER.
+
+        Returns:
+            pstats.Stats of the stage.
+        """
+        return pstats.Stats(self.profiles[stage])
+
+    def write(self, directory: Path | str) -> list[Path]:
+        """Save the pstats and collapsed stacks of every profiled stage.
+
+        Args:
+            directory: Output directory, created if missing.
+
+        Returns:
+            Paths of the written files.
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        written = []
+        combined = None
+        for stage in self.profiles:
+            stats = self.stats(stage)
+            path = directory / f"{stage}.pstats"
+            stats.dump_stats(path)
+            written.append(path)
+            if combined is None:
+                combined = pstats.Stats(str(path))
+            else:
+                combined.add(str(path))
+            path = directory / f"{stage}.collapsed"
+            path.write_text("".join(
+                f"{stack} {count}\n" for stack, count in self.samples.get(stage, Counter()).most_common()
+            ))
+            written.append(path)
+        if combined is not None:
+            combined.dump_stats(directory / "all.pstats")
+            written.append(directory / "all.pstats")
+        return written
+
+    def report(self, top: int = 10) -> str:
+        """Hottest functions of each stage, and time per library.
+
+        Args:
+            top: Functions listed per stage.
+
+        Returns:
+            Multi-line text report, stages in order of their total time.
+        """
+        sections = []
+        for stage, rows in sorted(
+            ((stage, self._rows(stage)) for stage in self.profiles),
+            key=lambda item: -sum(row[0] for row in item[1]),
+        ):
+            total = sum(row[0] for row in rows)
+            lines = [f"== {stage}: {total:.3f} s self time =="]
+            lines.append(f"{'self s':>9}{'cum s':>9}{'calls':>9}  function")
+            for self_time, cumulative, calls, label, library in rows[:top]:
+                lines.append(f"{self_time:>9.3f}{cumulative:>9.3f}{calls:>9}  {label} [{library}]")
+            by_library: Counter[str] = Counter()
+            for self_time, _, _, _, library in rows:
+                by_library[library] += self_time
+            shares = ", ".join(
+                f"{library} {seconds:.3f} s ({seconds / total:.0%})"
+                for library, seconds in by_library.most_common() if total
+            )
+            lines.append(f"by library: {shares or '-'}")
+            sections.append("\n".join(lines))
+        return "\n\n".join(sections)
+
+    def _rows(self, stage: str) -> list[tuple[float, float, int, str, str]]:
+        """Functions of a stage's profile, hottest first.
+
+        Args:
+            stage: Stage span name or OTHER.
+
+        Returns:
+            (self seconds, cumulative seconds, calls, label, library)
+            per function, by decreasing self time.
+        """
+        rows = []
+        for (filename, line, function), (_, calls, self_time, cumulative, _) in self.stats(stage).stats.items():
+            label = function if filename == "~" else f"{function} ({Path(filename).name}:{line})"
+            rows.append((self_time, cumulative, calls, label, library_of(filename, function)))
+        rows.sort(key=lambda row: -row[0])
+        return rows
+
+    def _profile(self, stage: str) -> cProfile.Profile:
+        """The profile of a stage, created on first use."""
+        if stage not in self.profiles:
+            self.profiles[stage] = cProfile.Profile()
+        return self.profiles[stage]
+
+    def _sample(self) -> None:
+        """Sampler thread: count the profiled thread's stack per stage."""
+        while not self._stop.wait(self.sample_interval):
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is not None:
+                stage = self._stages[-1]
+                self.samples.setdefault(stage, Counter())[_collapse(frame)] += 1
+
+
+def _collapse(frame: FrameType) -> str:
+    """Render a stack as one collapsed-stack line, outermost frame first.
+
+    Args:
+        frame: Innermost frame of the stack.
+
+    Returns:
+        Frames as "function (file.py)" joined by ";".
+    """
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_qualname} ({Path(code.co_filename).name})".replace(";", ":"))
+        frame = frame.f_back
+    return ";".join(reversed(names))
@@ -1,40 +1,110 @@
 """
 Document router for dispatching files to appropriate extractors.
 
-The router's job is simple: take a file path, determine the format,
-and return the correct extractor instance. Uses the Strategy pattern
+The router's job is simple: take a file path (or an in-memory
+document and its name), determine the format, and return the correct
+extractor instance. Uses the Strategy pattern
 to decouple format detection from extraction logic.
 """
 
+import importlib
+import os
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from functools import cache
+from itertools import islice
 from pathlib import Path
 
-from .models import ExtractionResult, FileFormat
-from .extractors.pdf_extractor import PDFExtractor
-from .extractors.docx_extractor import DOCXExtractor
-from .extractors.pptx_extractor import PPTXExtractor
-from .extractors.xlsx_extractor import XLSXExtractor
+from .cache import ResultCache, cache_key
+from .lazy import LazyExtractionResult
+from .models import (
+    DocumentMetadata,
+    ExtractionOptions,
+    ExtractionResult,
+    FileFormat,
+    SandboxLimits,
+    WorkerRecycling,
+)
+from .probe import probe_document
+from .sandbox import resident_bytes, run_sandboxed, was_stopped
+from .sniff import sniff_format
+from .source import DocumentSource, SourceInput
 
-# Map file extensions to (FileFormat, ExtractorClass)
+# Map file extensions to (FileFormat, "module:ExtractorClass"). Extractor
+# modules are imported on first use of their format, so importing the
+# router does not load PyMuPDF, python-docx, python-pptx or openpyxl.
 EXTRACTOR_MAP = {
-    ".pdf": (FileFormat.PDF, PDFExtractor),
-    ".docx": (FileFormat.DOCX, DOCXExtractor),
-    ".pptx": (FileFormat.PPTX, PPTXExtractor),
-    ".xlsx": (FileFormat.XLSX, XLSXExtractor),
+    ".pdf": (FileFormat.PDF, ".extractors.pdf_extractor:PDFExtractor"),
+    ".docx": (FileFormat.DOCX, ".extractors.docx_extractor:DOCXExtractor"),
+    ".pptx": (FileFormat.PPTX, ".extractors.pptx_extractor:PPTXExtractor"),
+    ".xlsx": (FileFormat.XLSX, ".extractors.xlsx_extractor:XLSXExtractor"),
 }
 
+# Files queued per batch worker; bounds the work submitted ahead of the consumer
+IN_FLIGHT_PER_WORKER = 2
+
+# Router of the current batch worker process, set by _init_batch_worker
+_batch_router: "DocumentRouter | None" = None
+
+
+@cache
+def load_extractor(spec: str) -> type:
+    """Import the extractor class named by an EXTRACTOR_MAP entry.
+
+    Args:
+        spec: "module:ClassName"; a leading dot makes the module
+            relative to this package.
+
+    Returns:
+        Extractor class. Later calls for the same spec return it
+        without touching the import machinery.
+    """
+    module_name, _, class_name = spec.partition(":")
+    module = importlib.import_module(module_name, __package__)
+    return getattr(module, class_name)
+
 
 class DocumentRouter:
     """Routes document files to their appropriate extractors.
 
-    Uses a registry dict mapping file extensions to extractor classes.
+    Uses a registry dict mapping file extensions to extractor classes,
+    which are imported the first time their format is used.
     This makes adding new formats trivial - just add to EXTRACTOR_MAP.
+    The format is sniffed from the file content where possible, so the
+    extension is only a hint for content that matches no known format.
 
-    Note: This class currently holds no state — instance methods could be
-    static or module-level functions. The class structure is retained for
-    future extensibility (e.g., adding configuration options like OCR settings
-    or custom extractor registries) and to make the Strategy pattern explicit.
+    Configuration options (such as the result cache) are held on the
+    instance; the Strategy pattern itself stays stateless.
     """
 
+    def __init__(
+        self,
+        cache: ResultCache | None = None,
+        sniff: bool = True,
+        sandbox: SandboxLimits | None = None,
+    ) -> None:
+        """Initialize the router.
+
+        Args:
+            cache: Optional on-disk result cache. When set,
+                process_document() returns cached results for documents
+                whose bytes were already extracted by the same extractor
+                version, whatever their file name.
+            sniff: Detect the format from the content (PDF header, OOXML
+                zip directory) before falling back to the extension.
+                Set to False to dispatch on the extension alone.
+            sandbox: Run each process_document() call in a child process
+                under these time and memory limits (see src/sandbox.py).
+                A child that breaches them is killed; its result keeps
+                the content extracted so far and says why it stopped.
+                Extraction errors are then reported in the result's
+                errors rather than raised.
+        """
+        self.cache = cache
+        self.sniff = sniff
+        self.sandbox = sandbox
+
     @staticmethod
     def supported_formats() -> list[str]:
         """Return list of supported file extensions.
@@ -44,11 +114,21 @@ class DocumentRouter:
         """
         return list(EXTRACTOR_MAP.keys())
 
-    def get_extractor(self, file_path: Path | str):
-        """Get the appropriate extractor for a file.
+    def get_extractor(
+        self,
+        source: SourceInput,
+        options: ExtractionOptions | None = None,
+        filename: str | None = None,
+    ):
+        """Get the appropriate extractor for a document.
 
         Args:
-            file_path: Path or str to the document file.
+            source: Path or str to the document file, or the document
+                itself as bytes, memoryview, mmap or binary file object.
+            options: Stages, page range and limits to extract.
+                Defaults to extracting everything.
+            filename: Name of an in-memory document. Its extension picks
+                the extractor and it is reported as source_filename.
 
         Returns:
             Instantiated extractor ready to use (e.g., PDFExtractor).
@@ -57,37 +137,425 @@ class DocumentRouter:
             FileNotFoundError: If the file does not exist.
             ValueError: If the file format is not supported.
         """
-        path = Path(file_path)
+        document = DocumentSource.from_input(source, filename)
+        return self._extractor_class(document)(document, options=options)
 
-        if not path.exists():
-            raise FileNotFoundError(f"File not found: {path}")
+    def process_document(
+        self,
+        source: SourceInput,
+        options: ExtractionOptions | None = None,
+        filename: str | None = None,
+    ) -> ExtractionResult:
+        """Process a document and return the extraction result.
 
-        ext = path.suffix.lower()
-        if ext not in EXTRACTOR_MAP:
-            supported = ", ".join(EXTRACTOR_MAP.keys())
-            raise ValueError(f"Unsupported format: {ext}. Supported: {supported}")
+        In-memory documents are extracted straight from the buffer,
+        without a round trip through a temporary file.
 
-        _, extractor_class = EXTRACTOR_MAP[ext]
-        return extractor_class(path)
+        Args:
+            source: Path or str to the document file, or the document
+                itself as bytes, memoryview, mmap or binary file object.
+            options: Stages, page range and limits to extract. Work for
+                anything not selected is skipped, not discarded.
+            filename: Name of an in-memory document. Its extension picks
+                the extractor and it is reported as source_filename.
 
-    def process_document(self, file_path: Path | str) -> ExtractionResult:
-        """Process a document and return the extraction result.
+        Returns:
+            ExtractionResult from the appropriate extractor.
+        """
+        document = DocumentSource.from_input(source, filename)
+        extractor_class = self._extractor_class(document)
+        if self.cache is None:
+            return self._extract(extractor_class, document, options)
+
+        key = cache_key(document.digest(), extractor_class, options)
+        result = self.cache.get(key, options is not None and options.record_stats)
+        if result is not None:
+            # Same bytes may have arrived under another name
+            result.metadata.source_filename = document.name
+            return result
+
+        result = self._extract(extractor_class, document, options)
+        # A sandbox breach is not the document's final result
+        if not was_stopped(result):
+            self.cache.put(key, result)
+        return result
+
+    def _extract(
+        self,
+        extractor_class: type,
+        document: DocumentSource,
+        options: ExtractionOptions | None,
+    ) -> ExtractionResult:
+        """Run an extraction, in the sandbox if one is configured.
 
         Args:
-            file_path: Path or str to the document file.
+            extractor_class: Extractor class for the document.
+            document: Resolved document source.
+            options: Stages, page range and limits to extract.
 
         Returns:
-            ExtractionResult from the appropriate extractor.
+            ExtractionResult of the document.
+        """
+        if self.sandbox is not None:
+            return run_sandboxed(extractor_class, document, options, self.sandbox)
+        with extractor_class(document, options=options) as extractor:
+            return extractor.extract_all()
+
+    def process_many(
+        self,
+        paths: Iterable[Path | str],
+        options: ExtractionOptions | None = None,
+        workers: int | None = None,
+        ordered: bool = False,
+        max_in_flight: int | None = None,
+        recycle: WorkerRecycling | None = None,
+    ) -> Iterator[tuple[Path | str, ExtractionResult]]:
+        """Process many documents across a pool of worker processes.
+
+        Workers import every extractor backend when they start, so no
+        file pays for it. Only max_in_flight files are submitted ahead
+        of the consumer: paths are pulled from the iterable as results
+        are yielded, so a slow consumer or an endless path generator
+        never queues unbounded work.
+
+        A file that fails, or whose worker dies, yields an
+        ExtractionResult with the error in its errors list and minimal
+        metadata, and the rest of the batch carries on. A dead worker
+        breaks the whole pool, so every file in flight at that moment
+        is reported as failed and a new pool takes over.
+
+        With a cache, workers read and write the shared cache directory;
+        the hit and miss counters of this router's cache do not move.
+
+        With a recycling policy, the pool is replaced by a fresh one as
+        soon as one of its workers reaches a limit. Workers go through
+        files at similar rates, so replacing them together costs little,
+        and files already submitted finish on the old workers while new
+        ones start on the new pool.
+
+        Args:
+            paths: Document paths; may be a lazy iterable.
+            options: Stages, page range and limits to extract.
+            workers: Number of worker processes. Defaults to the number
+                of CPUs; 1 processes the files in this process.
+            ordered: Yield results in input order instead of completion
+                order. A slow file then holds back the results behind it.
+            max_in_flight: Files submitted but not yet yielded. Defaults
+                to IN_FLIGHT_PER_WORKER per worker.
+            recycle: When to replace the worker processes, bounding the
+                memory a long batch accumulates. Ignored with workers=1.
+
+        Yields:
+            (path, ExtractionResult) for every path, as given.
+
+        Raises:
+            ValueError: If workers or max_in_flight is less than 1.
+
+        Example:
+            for path, result in router.process_many(paths, workers=8):
+                save(path, result)
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if max_in_flight is None:
+            max_in_flight = workers * IN_FLIGHT_PER_WORKER
+        if workers < 1 or max_in_flight < 1:
+            raise ValueError("workers and max_in_flight must be at least 1")
+        return self._process_many(
+            iter(paths), options, workers, ordered, max_in_flight, recycle or WorkerRecycling()
+        )
+
+    def _process_many(
+        self,
+        paths: Iterator[Path | str],
+        options: ExtractionOptions | None,
+        workers: int,
+        ordered: bool,
+        max_in_flight: int,
+        recycle: WorkerRecycling,
+    ) -> Iterator[tuple[Path | str, ExtractionResult]]:
+        """Generator behind process_many(), run after argument checks."""
+        if workers == 1:
+            for path in paths:
+                yield path, self._process_isolated(path, options)
+            return
+
+        pool = self._batch_pool(workers)
+        retired: list[ProcessPoolExecutor] = []
+        # Documents processed by each worker (by pid) of the current pool
+        processed: dict[int, int] = {}
+        pending: dict[Future, tuple[Path | str, ProcessPoolExecutor]] = {}
+
+        def replace_pool() -> None:
+            nonlocal pool
+            # Work already submitted finishes on the old workers
+            pool.shutdown(wait=False)
+            retired.append(pool)
+            pool = self._batch_pool(workers)
+            processed.clear()
+
+        def submit(path: Path | str) -> None:
+            try:
+                future = pool.submit(_process_in_worker, path, options)
+            except BrokenProcessPool:
+                # A worker died; its pool rejects new work
+                replace_pool()
+                future = pool.submit(_process_in_worker, path, options)
+            pending[future] = (path, pool)
+
+        def worn_out(pid: int, rss: int | None) -> bool:
+            processed[pid] = processed.get(pid, 0) + 1
+            if recycle.max_documents is not None and processed[pid] >= recycle.max_documents:
+                return True
+            return recycle.max_rss_bytes is not None and rss is not None and rss > recycle.max_rss_bytes
+
+        try:
+            for path in islice(paths, max_in_flight):
+                submit(path)
+            while pending:
+                if ordered:
+                    # Dicts keep insertion order: the oldest submission
+                    done = [next(iter(pending))]
+                    wait(done)
+                else:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path, owner = pending.pop(future)
+                    try:
+                        result, pid, rss = future.result()
+                    except Exception as e:
+                        result = failed_result(path, e)
+                    else:
+                        if owner is pool and worn_out(pid, rss):
+                            replace_pool()
+                    for next_path in islice(paths, 1):
+                        submit(next_path)
+                    yield path, result
+        finally:
+            for old in retired:
+                old.shutdown(cancel_futures=True)
+            pool.shutdown(cancel_futures=True)
+
+    def _batch_pool(self, workers: int) -> ProcessPoolExecutor:
+        """Start a process pool whose workers mirror this router.
+
+        Args:
+            workers: Number of worker processes.
+
+        Returns:
+            ProcessPoolExecutor with backends pre-imported in each worker.
+        """
+        return ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_batch_worker,
+            initargs=(self.cache, self.sniff, self.sandbox),
+        )
+
+    def _process_isolated(
+        self, path: Path | str, options: ExtractionOptions | None
+    ) -> ExtractionResult:
+        """Process one batch file, turning any exception into a result.
+
+        Args:
+            path: Document path.
+            options: Stages, page range and limits to extract.
+
+        Returns:
+            ExtractionResult, with the error recorded if extraction failed.
+        """
+        try:
+            return self.process_document(path, options)
+        except Exception as e:
+            return failed_result(path, e)
+
+    def open_document(
+        self,
+        source: SourceInput,
+        options: ExtractionOptions | None = None,
+        filename: str | None = None,
+    ) -> LazyExtractionResult:
+        """Open a document for lazy extraction.
+
+        Unlike process_document(), nothing is extracted up front: each
+        field of the returned result is computed on first access from
+        the still-open extractor. The result cache is not consulted,
+        since hashing the file would already read all of it.
+
+        Args:
+            source: Path or str to the document file, or the document
+                itself as bytes, memoryview, mmap or binary file object.
+            options: Stages, page range and limits to extract.
+            filename: Name of an in-memory document.
+
+        Returns:
+            LazyExtractionResult; close it, or use it as a context
+            manager, to release the document.
+
+        Example:
+            with router.open_document("report.pdf") as result:
+                print(result.metadata.page_count)
+        """
+        return LazyExtractionResult(self.get_extractor(source, options, filename))
+
+    def probe(self, source: SourceInput, filename: str | None = None) -> DocumentMetadata:
+        """Read a document's metadata without extracting its content.
+
+        Much cheaper than get_extractor(...).extract_metadata(): only the
+        PDF trailer and info dictionary, or the OOXML package
+        relationships and property parts, are read. DOCX page counts
+        are the ones Word recorded when it last saved the file.
+
+        Args:
+            source: Path or str to the document file, or the document
+                itself as bytes, memoryview, mmap or binary file object.
+            filename: Name of an in-memory document.
+
+        Returns:
+            DocumentMetadata with title, author, dates, page (slide,
+            sheet) count, format and size where available.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+            ValueError: If the file format is not supported.
         """
-        extractor = self.get_extractor(file_path)
-        return extractor.extract_all()
+        document = DocumentSource.from_input(source, filename)
+        file_format, _ = self._registry_entry(document)
+        return probe_document(document, file_format)
+
+    def _extractor_class(self, document: DocumentSource) -> type:
+        """Pick the extractor class for a document without instantiating it.
+
+        Args:
+            document: Resolved document source.
+
+        Returns:
+            Extractor class registered for the document's format,
+            imported on first use.
+
+        Raises:
+            ValueError: If the file format is not supported.
+        """
+        _, spec = self._registry_entry(document)
+        return load_extractor(spec)
+
+    def _registry_entry(self, document: DocumentSource) -> tuple[FileFormat, str]:
+        """Look up the EXTRACTOR_MAP entry for a document.
+
+        A format sniffed from the content wins over the extension, so a
+        misnamed file still reaches the right extractor.
+
+        Args:
+            document: Resolved document source.
+
+        Returns:
+            (FileFormat, extractor spec) registered for the format; the
+            class itself is not imported.
+
+        Raises:
+            ValueError: If the file format is not supported.
+        """
+        sniffed = sniff_format(document) if self.sniff else None
+        if sniffed is not None:
+            for file_format, spec in EXTRACTOR_MAP.values():
+                if file_format == sniffed:
+                    return file_format, spec
+
+        ext = document.suffix
+        if not ext and document.path is None:
+            raise ValueError(
+                "Cannot determine the format of an in-memory document; pass a filename"
+            )
+        if ext not in EXTRACTOR_MAP:
+            supported = ", ".join(EXTRACTOR_MAP.keys())
+            raise ValueError(f"Unsupported format: {ext}. Supported: {supported}")
+
+        return EXTRACTOR_MAP[ext]
+
+
+def _init_batch_worker(
+    cache: ResultCache | None, sniff: bool, sandbox: SandboxLimits | None
+) -> None:
+    """Batch worker initializer: build the router and import backends.
+
+    Args:
+        cache: Result cache of the parent router.
+        sniff: Sniff setting of the parent router.
+        sandbox: Sandbox limits of the parent router.
+    """
+    global _batch_router
+    _batch_router = DocumentRouter(cache=cache, sniff=sniff, sandbox=sandbox)
+    for _, spec in EXTRACTOR_MAP.values():
+        load_extractor(spec)
+
+
+def _process_in_worker(
+    path: Path | str, options: ExtractionOptions | None
+) -> tuple[ExtractionResult, int, int | None]:
+    """Batch worker entry point: process one file.
+
+    Args:
+        path: Document path.
+        options: Stages, page range and limits to extract.
+
+    Returns:
+        (ExtractionResult, worker pid, worker resident bytes afterwards),
+        the error recorded in the result if extraction failed.
+    """
+    result = _batch_router._process_isolated(path, options)
+    release_worker_memory()
+    pid = os.getpid()
+    return result, pid, resident_bytes(pid)
+
+
+def release_worker_memory() -> None:
+    """Empty the backend caches a worker process keeps between documents.
+
+    Batch and scheduler pool workers call this after each task; tasks
+    run in the caller's process never do. Workers extract one document
+    at a time, so no open document still uses MuPDF's process-wide store
+    by then.
+    """
+    pdf_module = EXTRACTOR_MAP[".pdf"][1].partition(":")[0]
+    importlib.import_module(pdf_module, __package__).shrink_store()
+
+
+def failed_result(path: Path | str, error: Exception | str) -> ExtractionResult:
+    """Build the result reported for a batch file that could not be processed.
+
+    Args:
+        path: Document path.
+        error: Exception raised while processing it, or its message.
+
+    Returns:
+        ExtractionResult with no content, file-level metadata and the
+        error as its only entry in errors.
+    """
+    path = Path(path)
+    try:
+        size = path.stat().st_size
+    except OSError:
+        size = 0
+    return ExtractionResult(
+        markdown="",
+        metadata=DocumentMetadata(
+            file_format=FileFormat.UNKNOWN, file_size_bytes=size, source_filename=path.name
+        ),
+        errors=[f"Document extraction failed: {error}"],
+    )
 
 
-def process_document(file_path: Path | str) -> ExtractionResult:
+def process_document(
+    source: SourceInput,
+    options: ExtractionOptions | None = None,
+    filename: str | None = None,
+) -> ExtractionResult:
     """Convenience function for one-line document extraction.
 
     Args:
-        file_path: Path or str to the document file.
+        source: Path or str to the document file, or the document
+            itself as bytes, memoryview, mmap or binary file object.
+        options: Stages, page range and limits to extract.
+        filename: Name of an in-memory document.
 
     Returns:
         ExtractionResult from the appropriate extractor.
@@ -96,4 +564,4 @@ def process_document(file_path: Path | str) -> ExtractionResult:
         result = process_document("path/to/document.pdf")
         print(result.markdown)
     """
-    return DocumentRouter().process_document(file_path)
+    return DocumentRouter().process_document(source, options, filename)
@@ -0,0 +1,255 @@
+"""
+Sandboxed extraction in a child process.
+
+A pathological document (a huge vector page, a decompression bomb image)
+can keep find_tables() or extract_image() busy for minutes or exhaust
+memory. run_sandboxed() extracts in a child process, so a breach kills
+only that child:
+
+- The child streams its iter_extract() events to the parent as they
+  are produced, so whatever was extracted before a breach survives.
+- The parent enforces the wall-clock limit and polls the child's
+  resident set size, killing the child once either limit is breached.
+- Polling cannot catch a single huge allocation in time, so the child
+  also caps its own address space growth (RLIMIT_AS) at the memory
+  limit; such an allocation then fails inside the child instead.
+
+Memory limits rely on /proc and are skipped on platforms without it.
+"""
+
+import dataclasses
+import multiprocessing
+import os
+import resource
+import time
+from multiprocessing.connection import Connection
+
+from .models import ExtractionEvent, ExtractionOptions, ExtractionResult, SandboxLimits
+from .source import DocumentSource
+
+# Seconds between checks of the child's resident memory
+MEMORY_POLL_SECONDS = 0.05
+
+# Prefix of the errors reported when the sandbox stopped an extraction
+STOPPED_PREFIX = "Extraction stopped"
+
+# Message kinds sent from the child
+_EVENT = "event"
+_FAILED = "failed"
+_OUT_OF_MEMORY = "out_of_memory"
+_DONE = "done"
+
+
+def run_sandboxed(
+    extractor_class: type,
+    document: DocumentSource,
+    options: ExtractionOptions | None,
+    limits: SandboxLimits,
+    mp_context: multiprocessing.context.BaseContext | None = None,
+) -> ExtractionResult:
+    """Extract a document in a child process under resource limits.
+
+    Errors that the extractor raises in the child (e.g. a PDF that
+    cannot be opened) are reported in the result's errors instead of
+    being raised. Stats are not recorded, since the child streams
+    events rather than running extract_all().
+
+    Args:
+        extractor_class: Extractor class for the document.
+        document: Resolved document source.
+        options: Stages, page range and limits to extract.
+        limits: Wall-clock and memory limits of the child.
+        mp_context: multiprocessing context used to start the child.
+            Defaults to the platform default.
+
+    Returns:
+        ExtractionResult with the content streamed before the child
+        finished or was stopped. If it was stopped, errors ends with a
+        message starting with STOPPED_PREFIX (see was_stopped()).
+    """
+    context = mp_context or multiprocessing.get_context()
+    if context.get_start_method() != "fork" and isinstance(document.data, memoryview):
+        # Only bytes can be pickled to a spawned child
+        document = dataclasses.replace(document, data=bytes(document.data))
+
+    reader, writer = context.Pipe(duplex=False)
+    child = context.Process(
+        target=_child_main,
+        args=(writer, extractor_class, document, options, limits.max_memory_bytes),
+        name=f"sandbox:{document.name}",
+    )
+    child.start()
+    writer.close()  # The parent keeps only the reading end
+
+    events: list[ExtractionEvent] = []
+    error = _receive(child, reader, events, limits)
+    reader.close()
+    if error is not None and child.is_alive():
+        child.kill()
+    child.join()
+
+    result = extractor_class.collect_events(events, document)
+    if error is not None:
+        result.errors.append(error)
+    return result
+
+
+def was_stopped(result: ExtractionResult) -> bool:
+    """Whether the sandbox stopped the extraction of a result.
+
+    Args:
+        result: Result returned by run_sandboxed().
+
+    Returns:
+        True if the child timed out, ran out of memory or died. Such
+        results are incomplete and should not be cached.
+    """
+    return any(error.startswith(STOPPED_PREFIX) for error in result.errors)
+
+
+def _receive(
+    child: multiprocessing.process.BaseProcess,
+    reader: Connection,
+    events: list[ExtractionEvent],
+    limits: SandboxLimits,
+) -> str | None:
+    """Collect the child's events until it finishes or breaches a limit.
+
+    Args:
+        child: Running child process.
+        reader: Reading end of the child's pipe.
+        events: List the received events are appended to.
+        limits: Limits to enforce.
+
+    Returns:
+        None if the child finished normally, otherwise the error to
+        report.
+    """
+    started = time.monotonic()
+    deadline = None if limits.timeout_seconds is None else started + limits.timeout_seconds
+    next_memory_check = started
+    memory_error = (
+        f"{STOPPED_PREFIX}: exceeded the memory limit of "
+        f"{(limits.max_memory_bytes or 0) / 2**20:.0f} MB"
+    )
+
+    while True:
+        now = time.monotonic()
+        if deadline is not None and now >= deadline:
+            return f"{STOPPED_PREFIX}: timed out after {limits.timeout_seconds:g}s"
+        if limits.max_memory_bytes is not None and now >= next_memory_check:
+            rss = resident_bytes(child.pid)
+            if rss is not None and rss > limits.max_memory_bytes:
+                return memory_error
+            next_memory_check = now + MEMORY_POLL_SECONDS
+
+        wait = MEMORY_POLL_SECONDS
+        if deadline is not None:
+            wait = min(wait, deadline - now)
+        if not reader.poll(wait):
+            continue
+        try:
+            kind, payload = reader.recv()
+        except EOFError:
+            # The child exited without saying it was done
+            child.join()
+            return f"{STOPPED_PREFIX}: extraction process died ({_describe_exit(child.exitcode)})"
+
+        if kind == _EVENT:
+            events.append(payload)
+        elif kind == _FAILED:
+            return f"Document extraction failed: {payload}"
+        elif kind == _OUT_OF_MEMORY:
+            return memory_error
+        else:
+            return None
+
+
+def _child_main(
+    writer: Connection,
+    extractor_class: type,
+    document: DocumentSource,
+    options: ExtractionOptions | None,
+    max_memory_bytes: int | None,
+) -> None:
+    """Child entry point: stream a document's events to the parent.
+
+    Args:
+        writer: Writing end of the pipe to the parent.
+        extractor_class: Extractor class for the document.
+        document: Document to extract.
+        options: Stages, page range and limits to extract.
+        max_memory_bytes: Growth allowed for the child's address space.
+    """
+    if max_memory_bytes is not None:
+        _limit_address_space(max_memory_bytes)
+    try:
+        with extractor_class(document, options=options) as extractor:
+            for event in extractor.iter_extract():
+                writer.send((_EVENT, event))
+    except MemoryError:
+        # An allocation beyond the address space limit
+        writer.send((_OUT_OF_MEMORY, None))
+    except Exception as e:
+        writer.send((_FAILED, str(e)))
+    else:
+        writer.send((_DONE, None))
+    writer.close()
+
+
+def _limit_address_space(extra_bytes: int) -> None:
+    """Let this process's address space grow by at most extra_bytes.
+
+    Args:
+        extra_bytes: Allowed growth over the current size.
+    """
+    size = _address_space_bytes()
+    if size is None:
+        return
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    soft = size + extra_bytes
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (soft, hard))
+
+
+def _address_space_bytes() -> int | None:
+    """Virtual size of this process, or None without /proc."""
+    return _statm_field("self", 0)
+
+
+def resident_bytes(pid: int) -> int | None:
+    """Resident set size of a process, or None without /proc.
+
+    Args:
+        pid: Process id.
+
+    Returns:
+        Resident memory in bytes, or None if it cannot be read.
+    """
+    return _statm_field(str(pid), 1)
+
+
+def _statm_field(pid: str, index: int) -> int | None:
+    """Read one field of /proc/<pid>/statm, converted to bytes.
+
+    Args:
+        pid: Process id, or "self".
+        index: 0 for the virtual size, 1 for the resident set size.
+
+    Returns:
+        Size in bytes, or None if it cannot be read.
+    """
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            pages = int(f.read().split()[index])
+    except (OSError, ValueError, IndexError):
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def _describe_exit(exitcode: int | None) -> str:
+    """Describe a child's exit code for an error message."""
+    if exitcode is not None and exitcode < 0:
+        return f"killed by signal {-exitcode}"
+    return f"exit code {exitcode}"
@@ -0,0 +1,671 @@
+"""
+Size-aware batch scheduling.
+
+process_many() submits one file per task in input order. A 2,000-page
+PDF near the end of a batch then keeps one worker busy long after the
+others went idle, and a directory of one-page files pays a task round
+trip per file. DocumentScheduler plans the batch from a cheap probe of
+every file before anything is extracted:
+
+- A CostModel predicts each document's seconds from its format, page
+  count and content size.
+- PDFs predicted to take longer than the target task cost are split
+  into page ranges. The ranges are walked in separate tasks and merged
+  back in page order, with headings resolved over the whole document,
+  so the result is the one extract_all() returns.
+- Small documents are packed together into tasks of about the target
+  cost.
+- Tasks are submitted longest first (LPT scheduling): the big ones
+  start early and the small ones fill the gaps at the end.
+
+Every run returns a ScheduleReport of predicted and measured seconds
+per task part; CostModel.calibrated() refits the model to it.
+"""
+
+import math
+import os
+import time
+import zipfile
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from itertools import islice
+from pathlib import Path
+from typing import NamedTuple
+
+from pydantic import BaseModel, Field
+
+from .cache import cache_key
+from .models import ExtractionOptions, ExtractionResult, FileFormat
+from .router import (
+    EXTRACTOR_MAP, IN_FLIGHT_PER_WORKER, DocumentRouter, failed_result, load_extractor,
+    release_worker_memory,
+)
+from .source import DocumentSource
+
+# Tasks planned per worker; more tasks balance better but cost more round trips
+TASKS_PER_WORKER = 4
+
+# Floor of the target task cost, so tiny batches are not split needlessly
+MIN_TASK_SECONDS = 0.5
+
+# Package parts (name prefixes) whose uncompressed size drives OOXML cost;
+# styles and themes are parsed too, but take about the same time everywhere
+CONTENT_PARTS = {
+    FileFormat.DOCX: ("word/document.xml",),
+    FileFormat.PPTX: ("ppt/slides/",),
+    FileFormat.XLSX: ("xl/worksheets/", "xl/sharedStrings.xml"),
+}
+
+# Extractor spec of the only format split into page ranges
+_PDF_SPEC = EXTRACTOR_MAP[".pdf"][1]
+
+# Router of the current scheduler worker process, set by _init_worker
+_worker_router: DocumentRouter | None = None
+
+
+class CostModel(BaseModel):
+    """Predicts the seconds a document takes to extract.
+
+    A document, or a page range of a split PDF, costs a fixed time for
+    its format (opening it, parsing styles) plus a per-format rate times
+    its size in units: selected pages for PDF, megabytes of uncompressed
+    content parts (see CONTENT_PARTS) for OOXML formats. Uncompressed
+    size tracks the XML the backends parse; the zip size does not, since
+    text compresses tenfold. The defaults were measured on text-heavy
+    documents; table- and image-heavy corpora should be calibrated.
+    """
+    seconds_per_document: dict[FileFormat, float] = Field(
+        default_factory=lambda: {
+            FileFormat.PDF: 0.01,
+            FileFormat.DOCX: 0.05,
+            FileFormat.PPTX: 0.05,
+            FileFormat.XLSX: 0.05,
+            FileFormat.UNKNOWN: 0.01,
+        },
+        description="Fixed seconds per document or page range."
+    )
+    seconds_per_unit: dict[FileFormat, float] = Field(
+        default_factory=lambda: {
+            FileFormat.PDF: 0.002,
+            FileFormat.DOCX: 10.0,
+            FileFormat.PPTX: 1.0,
+            FileFormat.XLSX: 1.0,
+        },
+        description="Seconds per page (PDF) or per uncompressed MB (OOXML)."
+    )
+
+    def estimate(self, file_format: FileFormat, units: float) -> float:
+        """Predict the seconds to extract a document or page range.
+
+        Args:
+            file_format: Format of the document.
+            units: Pages, or uncompressed megabytes, to extract.
+
+        Returns:
+            Predicted seconds; zero for a coefficient the model lacks.
+        """
+        return (
+            self.seconds_per_document.get(file_format, 0.0)
+            + units * self.seconds_per_unit.get(file_format, 0.0)
+        )
+
+    def calibrated(self, report: "ScheduleReport") -> "CostModel":
+        """Fit the coefficients of each format to measured costs.
+
+        Both coefficients are fitted by least squares when a format's
+        parts differ in size. If they are all the same size, only the
+        rate is refitted around the current fixed cost, since the two
+        cannot be told apart. Failed parts are ignored, and formats
+        without parts keep their coefficients.
+
+        Args:
+            report: Report of a previous run.
+
+        Returns:
+            New CostModel with the fitted coefficients.
+        """
+        fixed = dict(self.seconds_per_document)
+        rates = dict(self.seconds_per_unit)
+        for file_format in {part.file_format for part in report.parts}:
+            samples = [
+                (part.units, part.actual_seconds) for part in report.parts
+                if part.file_format == file_format and not part.failed
+            ]
+            if not samples:
+                continue
+            fixed[file_format], rates[file_format] = _fit_line(
+                samples, fixed.get(file_format, 0.0)
+            )
+        return self.model_copy(update={"seconds_per_document": fixed, "seconds_per_unit": rates})
+
+
+class TaskPart(BaseModel):
+    """A document, or one page range of a PDF, planned into a task."""
+    index: int = Field(description="Position of the document in the input paths.")
+    path: Path
+    file_format: FileFormat
+    pages: tuple[int, int] | None = Field(
+        default=None,
+        description="0-based [start, stop) page range, or None for the whole document."
+    )
+    units: float = 0.0
+    predicted_seconds: float
+
+
+class PartReport(BaseModel):
+    """Predicted and measured cost of one task part."""
+    path: Path
+    file_format: FileFormat
+    pages: tuple[int, int] | None = None
+    units: float
+    predicted_seconds: float
+    actual_seconds: float
+    failed: bool = False
+
+
+class ScheduleReport(BaseModel):
+    """Cost report of one DocumentScheduler.run()."""
+    parts: list[PartReport] = Field(default_factory=list)
+    tasks: int = 0
+    target_task_seconds: float = 0.0
+    wall_seconds: float = 0.0
+
+    @property
+    def predicted_seconds(self) -> float:
+        """Predicted seconds of all parts together."""
+        return sum(part.predicted_seconds for part in self.parts)
+
+    @property
+    def actual_seconds(self) -> float:
+        """Measured seconds of all parts together."""
+        return sum(part.actual_seconds for part in self.parts)
+
+
+class ScheduledBatch(NamedTuple):
+    """Results of a scheduled batch and the report of its costs."""
+    results: list[tuple[Path | str, ExtractionResult]]
+    report: ScheduleReport
+
+
+class DocumentScheduler:
+    """Extracts a batch of files in tasks planned by predicted cost.
+
+    Split PDFs are cached as whole documents: the parent looks them up
+    in the router's cache before planning and stores the merged result.
+    With sandbox limits on the router, documents are never split, so
+    every extraction still runs in its own limited child.
+
+    Example:
+        scheduler = DocumentScheduler(workers=8)
+        batch = scheduler.run(paths)
+        model = scheduler.cost_model.calibrated(batch.report)
+    """
+
+    def __init__(
+        self,
+        router: DocumentRouter | None = None,
+        cost_model: CostModel | None = None,
+        workers: int | None = None,
+        tasks_per_worker: int = TASKS_PER_WORKER,
+        min_task_seconds: float = MIN_TASK_SECONDS,
+    ) -> None:
+        """Initialize the scheduler.
+
+        Args:
+            router: Router that probes and extracts, with its cache,
+                sniff and sandbox settings. Defaults to a plain router.
+            cost_model: Model of extraction cost. Defaults to CostModel().
+            workers: Worker processes. Defaults to the number of CPUs;
+                1 runs the tasks in this process.
+            tasks_per_worker: Tasks to aim for per worker. The target
+                task cost is the predicted total over workers times this.
+            min_task_seconds: Lower bound of the target task cost.
+
+        Raises:
+            ValueError: If workers or tasks_per_worker is less than 1.
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers < 1 or tasks_per_worker < 1:
+            raise ValueError("workers and tasks_per_worker must be at least 1")
+        self.router = router or DocumentRouter()
+        self.cost_model = cost_model or CostModel()
+        self.workers = workers
+        self.tasks_per_worker = tasks_per_worker
+        self.min_task_seconds = min_task_seconds
+
+    def plan(
+        self, paths: Iterable[Path | str], options: ExtractionOptions | None = None
+    ) -> list[list[TaskPart]]:
+        """Probe the documents and group their parts into tasks.
+
+        Documents that cannot be probed (missing, unsupported, corrupt)
+        are planned at the fixed cost of an unknown format; their task
+        reports the error.
+
+        Args:
+            paths: Document paths.
+            options: Stages, page range and limits to extract.
+
+        Returns:
+            Tasks, longest predicted first.
+        """
+        return self._plan(self._estimate(list(paths), options))
+
+    def run(
+        self, paths: Iterable[Path | str], options: ExtractionOptions | None = None
+    ) -> ScheduledBatch:
+        """Extract a batch of documents as planned by plan().
+
+        A file that fails yields an ExtractionResult with the error in
+        its errors list, as in process_many(). If any page range of a
+        split PDF fails, the document's result is that failure.
+
+        Args:
+            paths: Document paths.
+            options: Stages, page range and limits to extract.
+
+        Returns:
+            ScheduledBatch with (path, ExtractionResult) for every path
+            in input order, and the report of predicted vs measured cost.
+        """
+        started = time.perf_counter()
+        paths = list(paths)
+        options = options or ExtractionOptions()
+        results: dict[int, ExtractionResult] = {}
+        keys: dict[int, str] = {}
+        documents = []
+        for part in self._estimate(paths, options):
+            # A whole-document part goes through process_document(),
+            # which uses the cache itself; split PDFs are cached here
+            if part.pages is not None and self.router.cache is not None:
+                if part.index not in keys:
+                    cached, keys[part.index] = self._cached(part.path, options)
+                    if cached is not None:
+                        results[part.index] = cached
+                if part.index in results:
+                    continue
+            documents.append(part)
+
+        tasks = self._plan(documents)
+        target = self._target_seconds(documents)
+        reports: list[tuple[int, tuple[int, int], PartReport]] = []
+        shards: dict[int, list[tuple[TaskPart, object]]] = {}
+        for task, outcomes in self._execute(tasks, options):
+            for part, (outcome, seconds) in zip(task, outcomes):
+                failed = isinstance(outcome, ExtractionResult) and bool(outcome.errors)
+                reports.append((part.index, part.pages or (0, 0), PartReport(
+                    path=part.path, file_format=part.file_format, pages=part.pages,
+                    units=part.units, predicted_seconds=part.predicted_seconds,
+                    actual_seconds=seconds, failed=failed,
+                )))
+                if part.pages is None:
+                    results[part.index] = outcome
+                else:
+                    shards.setdefault(part.index, []).append((part, outcome))
+
+        for index, walks in shards.items():
+            results[index] = self._assemble(walks, options, keys.get(index))
+
+        reports.sort(key=lambda item: item[:2])
+        report = ScheduleReport(
+            parts=[part for _, _, part in reports],
+            tasks=len(tasks),
+            target_task_seconds=target,
+            wall_seconds=time.perf_counter() - started,
+        )
+        return ScheduledBatch([(path, results[i]) for i, path in enumerate(paths)], report)
+
+    def _estimate(
+        self, paths: list[Path | str], options: ExtractionOptions | None
+    ) -> list[TaskPart]:
+        """Probe each document and split PDFs that exceed the target cost.
+
+        Args:
+            paths: Document paths.
+            options: Stages, page range and limits to extract.
+
+        Returns:
+            Parts of all documents, in input order.
+        """
+        options = options or ExtractionOptions()
+        documents = [self._probe(index, path, options) for index, path in enumerate(paths)]
+        target = self._target_seconds(documents)
+        parts = []
+        for document in documents:
+            if (
+                document.pages is None
+                or document.predicted_seconds <= target
+                or self.router.sandbox is not None
+            ):
+                parts.append(document.model_copy(update={"pages": None}))
+                continue
+            start, stop = document.pages
+            count = min(stop - start, math.ceil(document.predicted_seconds / target))
+            for shard_start, shard_stop in _split_range(start, stop, count):
+                units = shard_stop - shard_start
+                parts.append(document.model_copy(update={
+                    "pages": (shard_start, shard_stop),
+                    "units": units,
+                    "predicted_seconds": self.cost_model.estimate(FileFormat.PDF, units),
+                }))
+        return parts
+
+    def _probe(self, index: int, path: Path | str, options: ExtractionOptions) -> TaskPart:
+        """Predict the cost of one whole document.
+
+        Args:
+            index: Position of the document in the input paths.
+            path: Document path.
+            options: Stages, page range and limits to extract.
+
+        Returns:
+            TaskPart of the whole document. For a PDF, pages holds its
+            selected page range, so the planner can split it.
+        """
+        pages = None
+        units = 0.0
+        try:
+            metadata = self.router.probe(path)
+            file_format = metadata.file_format
+            if file_format == FileFormat.PDF:
+                selected = options.page_indices(metadata.page_count or 0)
+                pages = (selected.start, selected.stop)
+                units = len(selected)
+            else:
+                units = _content_megabytes(Path(path), file_format)
+        except Exception:
+            file_format = FileFormat.UNKNOWN
+        return TaskPart(
+            index=index,
+            path=Path(path),
+            file_format=file_format,
+            pages=pages,
+            units=units,
+            predicted_seconds=self.cost_model.estimate(file_format, units),
+        )
+
+    def _target_seconds(self, parts: list[TaskPart]) -> float:
+        """Target cost of one task for a set of parts.
+
+        Args:
+            parts: Parts to be scheduled.
+
+        Returns:
+            Predicted total spread over tasks_per_worker tasks per worker,
+            but at least min_task_seconds.
+        """
+        total = sum(part.predicted_seconds for part in parts)
+        return max(self.min_task_seconds, total / (self.workers * self.tasks_per_worker))
+
+    def _plan(self, parts: list[TaskPart]) -> list[list[TaskPart]]:
+        """Pack parts into tasks and order them longest first.
+
+        Parts are taken in decreasing predicted cost and added to the
+        current task until it would exceed the target cost, so parts at
+        or above the target run alone.
+
+        Args:
+            parts: Parts to schedule.
+
+        Returns:
+            Tasks, longest predicted first.
+        """
+        target = self._target_seconds(parts)
+        tasks: list[list[TaskPart]] = []
+        cost = 0.0
+        for part in sorted(parts, key=lambda part: part.predicted_seconds, reverse=True):
+            if not tasks or cost + part.predicted_seconds > target:
+                tasks.append([])
+                cost = 0.0
+            tasks[-1].append(part)
+            cost += part.predicted_seconds
+        tasks.sort(key=lambda task: sum(part.predicted_seconds for part in task), reverse=True)
+        return tasks
+
+    def _execute(
+        self, tasks: list[list[TaskPart]], options: ExtractionOptions
+    ) -> Iterator[tuple[list[TaskPart], list[tuple[object, float]]]]:
+        """Run tasks in order across the worker pool.
+
+        As in process_many(), only a few tasks are queued per worker, and
+        a dead worker fails the tasks in flight and is replaced by a new
+        pool.
+
+        Args:
+            tasks: Planned tasks, in submission order.
+            options: Stages, page range and limits to extract.
+
+        Yields:
+            (task, [(outcome, seconds) per part]) as tasks complete.
+        """
+        if self.workers == 1:
+            _init_worker(self.router)
+            for task in tasks:
+                yield task, _run_task(task, options)
+            return
+
+        def new_pool() -> ProcessPoolExecutor:
+            return ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_init_worker, initargs=(self.router,)
+            )
+
+        pool = new_pool()
+        pending: dict[Future, list[TaskPart]] = {}
+        queue = iter(tasks)
+
+        def submit(task: list[TaskPart]) -> None:
+            nonlocal pool
+            try:
+                future = pool.submit(_run_task_in_worker, task, options)
+            except BrokenProcessPool:
+                pool.shutdown(wait=False)
+                pool = new_pool()
+                future = pool.submit(_run_task_in_worker, task, options)
+            pending[future] = task
+
+        try:
+            for task in islice(queue, self.workers * IN_FLIGHT_PER_WORKER):
+                submit(task)
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task = pending.pop(future)
+                    try:
+                        outcomes = future.result()
+                    except Exception as e:
+                        outcomes = [(failed_result(part.path, e), 0.0) for part in task]
+                    for next_task in islice(queue, 1):
+                        submit(next_task)
+                    yield task, outcomes
+        finally:
+            pool.shutdown(cancel_futures=True)
+
+    def _cached(self, path: Path, options: ExtractionOptions) -> tuple[ExtractionResult | None, str]:
+        """Look up a PDF that would be split in the router's cache.
+
+        Args:
+            path: PDF path.
+            options: Stages, page range and limits to extract.
+
+        Returns:
+            (cached result or None, cache key to store the result under).
+        """
+        document = DocumentSource.from_input(path)
+        key = cache_key(document.digest(), load_extractor(_PDF_SPEC), options)
+        result = self.router.cache.get(key, options.record_stats)
+        if result is not None:
+            result.metadata.source_filename = document.name
+        return result, key
+
+    def _assemble(
+        self,
+        walks: list[tuple[TaskPart, object]],
+        options: ExtractionOptions,
+        key: str | None,
+    ) -> ExtractionResult:
+        """Merge the page range walks of a split PDF into its result.
+
+        Args:
+            walks: (part, walk or failed result) for every range.
+            options: Stages, page range and limits to extract.
+            key: Cache key of the document, if the router has a cache.
+
+        Returns:
+            ExtractionResult of the whole document, or the failure of
+            its first failed range.
+        """
+        walks.sort(key=lambda item: item[0].pages)
+        path = walks[0][0].path
+        for _, outcome in walks:
+            if isinstance(outcome, ExtractionResult):
+                return outcome
+        try:
+            with load_extractor(_PDF_SPEC)(path, options) as extractor:
+                merged = walks[0][1]
+                for _, walk in walks[1:]:
+                    merged.merge(walk)
+                result = extractor.finish_walk(merged)
+        except Exception as e:
+            return failed_result(path, e)
+        if key is not None:
+            self.router.cache.put(key, result)
+        return result
+
+
+def _fit_line(samples: list[tuple[float, float]], fixed: float) -> tuple[float, float]:
+    """Fit seconds = fixed + rate * units to measured samples.
+
+    Args:
+        samples: (units, seconds) pairs.
+        fixed: Fixed cost to keep when all samples have the same units.
+
+    Returns:
+        Non-negative (fixed, rate).
+    """
+    count = len(samples)
+    mean_units = sum(units for units, _ in samples) / count
+    mean_seconds = sum(seconds for _, seconds in samples) / count
+    spread = sum((units - mean_units) ** 2 for units, _ in samples)
+    if spread == 0:
+        if mean_units == 0:
+            return mean_seconds, 0.0
+        return fixed, max(mean_seconds - fixed, 0.0) / mean_units
+
+    rate = sum(
+        (units - mean_units) * (seconds - mean_seconds) for units, seconds in samples
+    ) / spread
+    if rate < 0:
+        return mean_seconds, 0.0
+    fixed = mean_seconds - rate * mean_units
+    if fixed < 0:
+        # Through the origin instead
+        return 0.0, sum(units * seconds for units, seconds in samples) / sum(
+            units * units for units, _ in samples
+        )
+    return fixed, rate
+
+
+def _split_range(start: int, stop: int, count: int) -> list[tuple[int, int]]:
+    """Split [start, stop) into count contiguous ranges of near-equal size.
+
+    Args:
+        start: First index.
+        stop: One past the last index.
+        count: Number of ranges, at most stop - start.
+
+    Returns:
+        List of (start, stop) ranges in order.
+    """
+    size, extra = divmod(stop - start, count)
+    ranges = []
+    for i in range(count):
+        end = start + size + (1 if i < extra else 0)
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+
+def _content_megabytes(path: Path, file_format: FileFormat) -> float:
+    """Uncompressed size of an OOXML package's content, from its zip directory.
+
+    Args:
+        path: OOXML file.
+        file_format: Format of the file, selecting its CONTENT_PARTS.
+
+    Returns:
+        Total uncompressed size of the content parts in megabytes; the
+        file size if it is not a readable zip.
+    """
+    prefixes = CONTENT_PARTS.get(file_format, ("",))
+    try:
+        with zipfile.ZipFile(path) as package:
+            size = sum(
+                info.file_size for info in package.infolist()
+                if info.filename.startswith(prefixes)
+            )
+    except (OSError, zipfile.BadZipFile):
+        size = path.stat().st_size
+    return size / 2**20
+
+
+def _init_worker(router: DocumentRouter) -> None:
+    """Scheduler worker initializer: keep the router and import backends.
+
+    Args:
+        router: Router of the scheduler.
+    """
+    global _worker_router
+    _worker_router = router
+    for _, spec in EXTRACTOR_MAP.values():
+        load_extractor(spec)
+
+
+def _run_task(
+    task: list[TaskPart], options: ExtractionOptions
+) -> list[tuple[object, float]]:
+    """Scheduler worker entry point: extract every part of a task.
+
+    Args:
+        task: Parts to extract.
+        options: Stages, page range and limits to extract.
+
+    Returns:
+        (outcome, seconds) per part. The outcome of a whole document is
+        its ExtractionResult; a page range yields its page walk, or a
+        failed ExtractionResult if it could not be read.
+    """
+    outcomes = []
+    for part in task:
+        started = time.perf_counter()
+        try:
+            if part.pages is None:
+                outcome = _worker_router.process_document(part.path, options)
+            else:
+                with load_extractor(_PDF_SPEC)(part.path, options) as extractor:
+                    outcome = extractor.walk_shard(*part.pages)
+        except Exception as e:
+            outcome = failed_result(part.path, e)
+        outcomes.append((outcome, time.perf_counter() - started))
+    return outcomes
+
+
+def _run_task_in_worker(
+    task: list[TaskPart], options: ExtractionOptions
+) -> list[tuple[object, float]]:
+    """Pool worker entry point: run a task, then release backend caches.
+
+    Only pool workers release them; with one worker, tasks run in the
+    caller's process, whose open documents may still use MuPDF's store.
+
+    Args:
+        task: Parts to extract.
+        options: Stages, page range and limits to extract.
+
+    Returns:
+        Outcomes of _run_task().
+    """
+    outcomes = _run_task(task, options)
+    release_worker_memory()
+    return outcomes
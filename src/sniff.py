@@ -0,0 +1,69 @@
+"""
+Content-based format detection.
+
+Looks at a document's bytes rather than its name: a zip whose central
+directory holds the parts of a Word, PowerPoint or Excel package, or a
+PDF header in the first KB. Only the head of the file and the zip
+central directory are read, in place for in-memory documents, so
+sniffing costs well under a millisecond whatever the document's size.
+"""
+
+import zipfile
+
+from .models import FileFormat
+from .source import DocumentSource
+
+# PDF readers accept the header anywhere in the first 1024 bytes
+PDF_HEADER = b"%PDF-"
+PDF_HEADER_WINDOW = 1024
+
+# Signature of a zip local file header, the first record of a zip file
+ZIP_SIGNATURE = b"PK\x03\x04"
+
+# Directory of the main parts of each OOXML package type
+OOXML_PART_PREFIXES = {
+    "word/": FileFormat.DOCX,
+    "ppt/": FileFormat.PPTX,
+    "xl/": FileFormat.XLSX,
+}
+
+
+def sniff_format(source: DocumentSource) -> FileFormat | None:
+    """Detect a document's format from its content.
+
+    Args:
+        source: Document file or in-memory document.
+
+    Returns:
+        FileFormat.PDF, DOCX, PPTX or XLSX, or None if the content
+        matches none of them.
+    """
+    with source.open_binary() as f:
+        return _sniff_stream(f)
+
+
+def _sniff_stream(stream) -> FileFormat | None:
+    """Detect the format of a seekable binary stream.
+
+    Args:
+        stream: Binary file object positioned at the start.
+
+    Returns:
+        Detected FileFormat, or None.
+    """
+    head = stream.read(PDF_HEADER_WINDOW)
+    # A zip starts with its signature; checking it first keeps a part name
+    # containing "%PDF-" in the first KB of a package from passing as a PDF
+    if not head.startswith(ZIP_SIGNATURE):
+        return FileFormat.PDF if PDF_HEADER in head else None
+
+    try:
+        # Reads only the end-of-central-directory record and the directory
+        names = zipfile.ZipFile(stream).namelist()
+    except (zipfile.BadZipFile, OSError):
+        return None
+    for name in names:
+        for prefix, file_format in OOXML_PART_PREFIXES.items():
+            if name.startswith(prefix):
+                return file_format
+    return None
@@ -0,0 +1,173 @@
+"""
+Document sources: files on disk or documents already in memory.
+
+Extractors and the router accept a path, raw bytes, a memoryview, an
+mmap or a binary file object. In-memory documents are read straight
+from the buffer, so an upload never has to be written to a temporary
+file first.
+"""
+
+import io
+import mmap
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Union
+
+from .cache import bytes_digest, file_digest
+
+# Anything an extractor or the router accepts as a document
+SourceInput = Union[Path, str, bytes, bytearray, memoryview, mmap.mmap, BinaryIO]
+
+# Name reported for in-memory documents given without a file name
+UNNAMED_SOURCE = "<memory>"
+
+
+class BufferReader(io.RawIOBase):
+    """Seekable, read-only file object over a buffer, without copying it.
+
+    io.BytesIO copies any buffer other than bytes, which for a large
+    memoryview or mmap doubles the memory of the document. Reads here
+    copy only the bytes asked for.
+    """
+
+    def __init__(self, data: bytes | memoryview) -> None:
+        """Wrap a buffer.
+
+        Args:
+            data: Document contents.
+        """
+        self._data = memoryview(data).cast("B")
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        """Copy the next bytes of the document into a buffer."""
+        chunk = self._data[self._pos:self._pos + len(buffer)]
+        buffer[:len(chunk)] = chunk
+        self._pos += len(chunk)
+        return len(chunk)
+
+    def readall(self) -> bytes:
+        """Read the rest of the document."""
+        chunk = self._data[self._pos:]
+        self._pos += len(chunk)
+        return bytes(chunk)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        """Move the read position, as for any binary file."""
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += len(self._data)
+        elif whence != io.SEEK_SET:
+            raise ValueError(f"invalid whence ({whence})")
+        if offset < 0:
+            raise ValueError(f"negative seek position {offset}")
+        self._pos = offset
+        return offset
+
+    def tell(self) -> int:
+        return self._pos
+
+    def close(self) -> None:
+        if not self.closed:
+            self._data.release()
+        super().close()
+
+
+@dataclass(frozen=True)
+class DocumentSource:
+    """A document to extract, either a file on disk or a buffer.
+
+    Exactly one of path and data is set.
+
+    Attributes:
+        path: Path of an on-disk document.
+        data: Contents of an in-memory document.
+        name: File name reported as DocumentMetadata.source_filename.
+        size: Size in bytes, reported as DocumentMetadata.file_size_bytes.
+    """
+    path: Path | None
+    data: bytes | memoryview | None
+    name: str
+    size: int
+
+    @classmethod
+    def from_input(cls, source: "SourceInput | DocumentSource", filename: str | None = None) -> "DocumentSource":
+        """Resolve a path, buffer or file object into a DocumentSource.
+
+        Buffers are used without copying (mmaps through a memoryview).
+        File objects are read from their current position to the end.
+
+        Args:
+            source: Path, bytes-like object, mmap or binary file object.
+            filename: Name for an in-memory document. Defaults to the
+                file object's name, if it has one.
+
+        Returns:
+            DocumentSource for the input; a DocumentSource is returned
+            unchanged.
+
+        Raises:
+            FileNotFoundError: If a path does not exist.
+            ValueError: If a path is not a file.
+            TypeError: If the input is not a supported source.
+        """
+        if isinstance(source, DocumentSource):
+            return source
+
+        if isinstance(source, (str, Path)):
+            path = Path(source)
+            if not path.exists():
+                raise FileNotFoundError(f"File not found: {path}")
+            if not path.is_file():
+                raise ValueError(f"Path is not a file: {path}")
+            return cls(path=path, data=None, name=path.name, size=path.stat().st_size)
+
+        if isinstance(source, (bytes, bytearray, memoryview, mmap.mmap)):
+            data = source if isinstance(source, bytes) else memoryview(source)
+        elif hasattr(source, "read"):
+            data = source.read()
+            if not isinstance(data, bytes):
+                raise TypeError("File objects must be opened in binary mode")
+            filename = filename or Path(getattr(source, "name", "") or "").name or None
+        else:
+            raise TypeError(f"Unsupported document source: {type(source).__name__}")
+
+        size = data.nbytes if isinstance(data, memoryview) else len(data)
+        return cls(path=None, data=data, name=filename or UNNAMED_SOURCE, size=size)
+
+    @property
+    def suffix(self) -> str:
+        """Lower-case file extension of the source name, e.g. ".pdf"."""
+        return Path(self.name).suffix.lower()
+
+    def open_binary(self) -> BinaryIO:
+        """Open the document as a binary file object.
+
+        In-memory documents are read in place: io.BytesIO shares the
+        buffer of bytes, and BufferReader reads memoryviews and mmaps.
+
+        Returns:
+            File object positioned at the start; the caller closes it.
+        """
+        if self.path is not None:
+            return open(self.path, "rb")
+        if isinstance(self.data, bytes):
+            return io.BytesIO(self.data)
+        return BufferReader(self.data)
+
+    def digest(self) -> str:
+        """Hash the document contents (see cache.file_digest).
+
+        Returns:
+            Hex digest, equal for a file and a buffer with the same bytes.
+        """
+        if self.path is not None:
+            return file_digest(self.path)
+        return bytes_digest(self.data)
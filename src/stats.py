@@ -0,0 +1,175 @@
+"""
+Timing and resource statistics of extractions.
+
+When ExtractionOptions.record_stats is set, extractors measure their
+work with the helpers here and attach the figures to
+ExtractionResult.stats:
+
+- StatsRecorder spans one extract_all() call. It takes the wall and CPU
+  time, bytes read and peak memory of the process at the start and end,
+  sums the time charged to each stage and counts the result's content.
+- Stopwatch splits a single page visit into stages. Its timings travel
+  with the page walk, so PDF shards walked in worker processes still
+  report them.
+
+A measurement is two clock reads, and the process counters are read
+twice per extraction, so recording stays well under 1% of extraction
+time and can be left on in production.
+"""
+
+import resource
+import sys
+from collections.abc import Iterator
+from contextlib import contextmanager
+from time import perf_counter, process_time
+
+from .models import ExtractionResult, ExtractionStage, ExtractionStats, StageTiming
+
+# ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+_MAXRSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+
+def bytes_read() -> int | None:
+    """Bytes this process has read so far, through any file or socket.
+
+    Returns:
+        The rchar counter of /proc/self/io, or None where it is unavailable.
+    """
+    try:
+        with open("/proc/self/io", "rb") as f:
+            for line in f:
+                if line.startswith(b"rchar:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def peak_rss_bytes() -> int:
+    """Peak resident memory of this process so far.
+
+    Returns:
+        Highest resident set size since the process started, in bytes.
+    """
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * _MAXRSS_UNIT
+
+
+class StatsRecorder:
+    """Measures one extraction from construction to finish().
+
+    Attributes:
+        stages: Wall and CPU seconds charged to each stage so far.
+    """
+
+    def __init__(self) -> None:
+        self.stages: dict[ExtractionStage, StageTiming] = {}
+        self._started = (perf_counter(), process_time())
+        self._bytes_read = bytes_read()
+        self._peak_rss = peak_rss_bytes()
+
+    @contextmanager
+    def stage(self, stage: ExtractionStage) -> Iterator[None]:
+        """Charge the time spent in a with block to a stage.
+
+        The time is charged even if the block raises.
+
+        Args:
+            stage: Stage doing the work.
+        """
+        wall, cpu = perf_counter(), process_time()
+        try:
+            yield
+        finally:
+            self.add(stage, perf_counter() - wall, process_time() - cpu)
+
+    def add(self, stage: ExtractionStage, wall_seconds: float, cpu_seconds: float) -> None:
+        """Charge time measured elsewhere to a stage.
+
+        Args:
+            stage: Stage that did the work.
+            wall_seconds: Wall-clock seconds spent.
+            cpu_seconds: CPU seconds spent.
+        """
+        timing = self.stages.get(stage)
+        if timing is None:
+            timing = self.stages[stage] = StageTiming()
+        timing.wall_seconds += wall_seconds
+        timing.cpu_seconds += cpu_seconds
+
+    def finish(self, result: ExtractionResult) -> ExtractionStats:
+        """Complete the statistics of a finished extraction.
+
+        Fields the extractor already set on result.stats are kept; the
+        totals, stage timings and result counts are added to them.
+
+        Args:
+            result: Result of the extraction.
+
+        Returns:
+            Statistics to attach to the result.
+        """
+        wall, cpu = perf_counter(), process_time()
+        stats = result.stats or ExtractionStats()
+        stats.wall_seconds = wall - self._started[0]
+        stats.cpu_seconds = cpu - self._started[1]
+        for stage, timing in self.stages.items():
+            total = stats.stages.setdefault(stage, StageTiming())
+            total.wall_seconds += timing.wall_seconds
+            total.cpu_seconds += timing.cpu_seconds
+        if stats.text_blocks is None:
+            # Extractors emit one markdown block per heading or paragraph
+            stats.text_blocks = len(result.markdown.split("\n\n")) if result.markdown else 0
+        stats.tables_found = len(result.tables)
+        stats.images_found = len(result.images)
+        read = bytes_read()
+        if read is not None and self._bytes_read is not None:
+            stats.bytes_read = read - self._bytes_read
+        stats.peak_memory_delta_bytes = peak_rss_bytes() - self._peak_rss
+        return stats
+
+
+class Stopwatch:
+    """Splits the time of one page visit into stages.
+
+    Call reset() when the visit starts, lap() after each stage and
+    page() when the visit ends. Timings are kept as plain tuples, as
+    this runs once per page.
+
+    Attributes:
+        stages: (wall, cpu) seconds of each stage of the current visit.
+    """
+
+    __slots__ = ("stages", "_start_wall", "_start_cpu", "_wall", "_cpu")
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        """Start timing a new visit."""
+        self.stages: dict[ExtractionStage, tuple[float, float]] = {}
+        self._start_wall = self._wall = perf_counter()
+        self._start_cpu = self._cpu = process_time()
+
+    def lap(self, stage: ExtractionStage) -> None:
+        """Charge the time since the previous lap, or the reset, to a stage.
+
+        Args:
+            stage: Stage that just finished.
+        """
+        wall, cpu = perf_counter(), process_time()
+        self.stages[stage] = (wall - self._wall, cpu - self._cpu)
+        self._wall, self._cpu = wall, cpu
+
+    def page(self, page_num: int) -> tuple[int, float, float]:
+        """Timing of the whole visit so far.
+
+        Args:
+            page_num: 1-based number of the visited page.
+
+        Returns:
+            (page_num, wall seconds, cpu seconds) since the reset, the
+            fields of a PageTiming.
+        """
+        return (
+            page_num, perf_counter() - self._start_wall, process_time() - self._start_cpu
+        )
@@ -0,0 +1,231 @@
+"""
+Tracing hooks around extractions.
+
+Extractors report their work as spans to the process-wide tracer set
+with set_tracer():
+
+- "extract_all" around each BaseExtractor.extract_all() call, with the
+  extractor, document name and format as attributes.
+- One span per extraction stage ("text", "tables", "images",
+  "metadata"). DOCX reports its body walk, which reads text and tables
+  together, as a "body" span with a "tables" span per table.
+- "page" around each PDF page visit (attribute "page"), with the page's
+  stages nested inside it.
+
+A Tracer receives start_span() and end_span() callbacks. Subclass it to
+forward spans to an existing tracing system, or use one of the two
+built in: ChromeTraceExporter writes Chrome trace-event JSON for a trace
+viewer (chrome://tracing, Perfetto), and LoggingTracer logs each span.
+Without a tracer, span() returns a shared no-op context manager, so the
+hooks cost one global lookup each.
+
+Worker processes started by fork (process_many(), the scheduler, the
+sandbox and sharded PDF walks on Linux) inherit the tracer; spawned
+workers run untraced.
+"""
+
+import json
+import os
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from pathlib import Path
+from typing import Any
+
+from .logging_config import get_logger
+
+# Returned by span() while no tracer is set
+_NO_SPAN = nullcontext()
+
+_tracer: "Tracer | None" = None
+
+
+class Tracer:
+    """Receives the spans of extractions.
+
+    The base class ignores them. Subclasses override start_span() and
+    end_span(); both are called on the thread doing the work, with
+    spans properly nested per thread. They must not raise.
+    """
+
+    def start_span(self, name: str, attributes: dict[str, Any]) -> Any:
+        """Called when a span starts.
+
+        Args:
+            name: Span name, e.g. "page".
+            attributes: Attributes known at the start, e.g. {"page": 3}.
+
+        Returns:
+            Handle passed back to end_span(), e.g. a span object of the
+            wrapped tracing system.
+        """
+        return None
+
+    def end_span(self, handle: Any, attributes: dict[str, Any]) -> None:
+        """Called when a span ends.
+
+        Args:
+            handle: Value start_span() returned for this span.
+            attributes: Attributes known at the end; "error" holds the
+                message if the spanned work raised, and "stopped" is
+                True if a span around a yield ended because the
+                consumer closed the generator early.
+        """
+
+
+def set_tracer(tracer: Tracer | None) -> Tracer | None:
+    """Install the process-wide tracer.
+
+    Args:
+        tracer: Tracer to receive spans, or None to stop tracing.
+
+    Returns:
+        The previously installed tracer.
+    """
+    global _tracer
+    previous, _tracer = _tracer, tracer
+    return previous
+
+
+def get_tracer() -> Tracer | None:
+    """The process-wide tracer, or None while tracing is off."""
+    return _tracer
+
+
+def span(name: str, **attributes: Any) -> AbstractContextManager[None]:
+    """Report the work of a with block as a span.
+
+    Args:
+        name: Span name.
+        **attributes: Attributes of the span.
+
+    Returns:
+        Context manager reporting the span, or a no-op one while no
+        tracer is set.
+    """
+    if _tracer is None:
+        return _NO_SPAN
+    return _traced(_tracer, name, attributes)
+
+
+@contextmanager
+def _traced(tracer: Tracer, name: str, attributes: dict[str, Any]) -> Iterator[None]:
+    """Call the tracer around a with block.
+
+    Args:
+        tracer: Tracer to report to.
+        name: Span name.
+        attributes: Attributes of the span.
+    """
+    handle = tracer.start_span(name, attributes)
+    try:
+        yield
+    except GeneratorExit:
+        # A span around a yield, whose consumer closed the generator early
+        tracer.end_span(handle, {"stopped": True})
+        raise
+    except BaseException as e:
+        tracer.end_span(handle, {"error": str(e) or type(e).__name__})
+        raise
+    tracer.end_span(handle, {})
+
+
+class ChromeTraceExporter(Tracer):
+    """Writes spans as Chrome trace-event JSON.
+
+    Each finished span is appended to the file right away as a complete
+    ("X") event. Forked workers append to the same file, each under its
+    own pid. close() rewrites the file as one JSON object. A trace cut
+    short by a crash stays readable, because trace viewers accept an
+    unterminated event array.
+
+    Use as a context manager to install the exporter as the tracer and
+    close it at the end:
+
+        with ChromeTraceExporter("trace.json"):
+            router.process_many(paths)
+    """
+
+    def __init__(self, path: Path | str) -> None:
+        """Create the trace file, replacing an existing one.
+
+        Args:
+            path: Output file.
+        """
+        self.path = Path(path)
+        self._owner = os.getpid()
+        self._previous: Tracer | None = None
+        # O_APPEND keeps each event write whole when processes share the file
+        self._fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_APPEND, 0o644)
+        os.write(self._fd, b"[\n")
+
+    def __enter__(self) -> "ChromeTraceExporter":
+        self._previous = set_tracer(self)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        set_tracer(self._previous)
+        self.close()
+
+    def start_span(self, name: str, attributes: dict[str, Any]) -> Any:
+        """Note the start time and attributes of a span."""
+        return name, time.monotonic_ns(), attributes
+
+    def end_span(self, handle: Any, attributes: dict[str, Any]) -> None:
+        """Append the finished span as a complete event."""
+        if self._fd is None:
+            return
+        name, started, start_attributes = handle
+        event = {
+            "name": name,
+            "ph": "X",
+            "ts": started / 1000,
+            "dur": (time.monotonic_ns() - started) / 1000,
+            "pid": os.getpid(),
+            "tid": threading.get_native_id(),
+            "args": {**start_attributes, **attributes},
+        }
+        os.write(self._fd, json.dumps(event, default=str).encode() + b",\n")
+
+    def close(self) -> None:
+        """Finish the trace file as a JSON object with a traceEvents list.
+
+        Only the process that created the exporter finishes the file;
+        in forked workers close() just stops writing.
+        """
+        if self._fd is None:
+            return
+        os.close(self._fd)
+        self._fd = None
+        if os.getpid() != self._owner:
+            return
+        lines = self.path.read_text().splitlines()[1:]
+        events = [json.loads(line.rstrip(",")) for line in lines if line.strip()]
+        temp = self.path.with_name(self.path.name + ".tmp")
+        temp.write_text(json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}))
+        os.replace(temp, self.path)
+
+
+class LoggingTracer(Tracer):
+    """Logs each finished span with its duration at DEBUG level."""
+
+    def __init__(self, name: str = __name__) -> None:
+        """Create the logger.
+
+        Args:
+            name: Logger name.
+        """
+        self.logger = get_logger(name, level=10)
+
+    def start_span(self, name: str, attributes: dict[str, Any]) -> Any:
+        """Note the start time and attributes of a span."""
+        return name, time.perf_counter(), attributes
+
+    def end_span(self, handle: Any, attributes: dict[str, Any]) -> None:
+        """Log the span name, duration and attributes."""
+        name, started, start_attributes = handle
+        self.logger.debug(
+            "%s %.1f ms %s", name, (time.perf_counter() - started) * 1000,
+            {**start_attributes, **attributes},
+        )
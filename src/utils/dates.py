@@ -0,0 +1,54 @@
+"""
+Date parsing helpers for document metadata.
+"""
+
+from datetime import datetime, timezone
+
+
+def parse_pdf_date(date_str: str | None) -> datetime | None:
+    """Parse PDF date string to datetime.
+
+    Args:
+        date_str: PDF date format like "D:20240115120000"
+
+    Returns:
+        datetime object or None if parsing fails.
+    """
+    if not date_str:
+        return None
+    try:
+        # Format: D:YYYYMMDDHHmmSS with optional timezone
+        cleaned = date_str.replace("D:", "")[:14]
+        return datetime.strptime(cleaned, "%Y%m%d%H%M%S")
+    except Exception:
+        return None
+
+
+def parse_w3cdtf(date_str: str | None) -> datetime | None:
+    """Parse a W3CDTF date from OOXML core properties.
+
+    Matches python-docx: dates without a zone are taken as UTC, and
+    the result is always in UTC.
+
+    Args:
+        date_str: Date like "2024-01-15T12:00:00Z", "2024-01-15" or "2024".
+
+    Returns:
+        Timezone-aware datetime, or None if parsing fails.
+    """
+    if not date_str:
+        return None
+    try:
+        value = datetime.fromisoformat(date_str)
+    except ValueError:
+        for template in ("%Y-%m", "%Y"):
+            try:
+                value = datetime.strptime(date_str, template)
+                break
+            except ValueError:
+                continue
+        else:
+            return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
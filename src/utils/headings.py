@@ -0,0 +1,143 @@
+"""
+Heading-level detection helpers.
+
+Maps PDF text blocks to markdown heading levels, either from the font
+sizes used in the document or from the document outline (bookmarks).
+"""
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Headings are typically ≥14pt; smaller text is body/table content
+MIN_HEADING_SIZE = 14.0
+
+# Number of distinct font sizes mapped to heading levels (H1-H3)
+MAX_SIZE_LEVELS = 3
+
+# Characters a font size must carry before the estimator trusts it as a
+# heading size; keeps single oversize glyphs (drop caps, footnote marks) out
+MIN_HEADING_CHARS = 3
+
+
+def font_size_levels(font_sizes: set[float]) -> dict[float, int]:
+    """Map the largest heading-sized fonts to heading levels.
+
+    Args:
+        font_sizes: Distinct rounded font sizes used in the document.
+
+    Returns:
+        Dict from font size to heading level, largest size first (H1).
+    """
+    heading_sizes = sorted(
+        [s for s in font_sizes if s >= MIN_HEADING_SIZE],
+        reverse=True
+    )
+    return {size: i + 1 for i, size in enumerate(heading_sizes[:MAX_SIZE_LEVELS])}
+
+
+def estimate_heading_thresholds(
+    sizes: "np.ndarray",
+    char_counts: "np.ndarray",
+    min_chars: int = MIN_HEADING_CHARS,
+) -> list[float]:
+    """Estimate heading font-size thresholds from a character-weighted histogram.
+
+    Each span contributes its character count to the bin of its rounded
+    font size. The heaviest bin is taken as body text; heading candidates
+    must be ≥14pt, larger than the body size and carry at least
+    min_chars characters.
+
+    Args:
+        sizes: Font size of each span.
+        char_counts: Number of characters in each span.
+        min_chars: Minimum characters for a size to count as a heading size.
+
+    Returns:
+        Up to three thresholds in descending order (H1, H2, H3).
+    """
+    import numpy as np  # only the sampled heading mode needs it
+
+    if sizes.size == 0:
+        return []
+    bins, inverse = np.unique(np.round(sizes, 1), return_inverse=True)
+    chars = np.bincount(inverse, weights=char_counts)
+    body_size = bins[np.argmax(chars)]
+    candidates = bins[(bins >= MIN_HEADING_SIZE) & (bins > body_size) & (chars >= min_chars)]
+    return [float(s) for s in candidates[::-1][:MAX_SIZE_LEVELS]]
+
+
+def threshold_level(size: float | None, thresholds: list[float]) -> int | None:
+    """Map a font size to a heading level using descending thresholds.
+
+    Sizes between two thresholds take the level of the lower one, so
+    sizes that were not in the sample still get a sensible level.
+
+    Args:
+        size: Font size of the block.
+        thresholds: Output of estimate_heading_thresholds().
+
+    Returns:
+        Heading level (1-based), or None for body text.
+    """
+    if size is None:
+        return None
+    for level, threshold in enumerate(thresholds, start=1):
+        if size >= threshold:
+            return level
+    return None
+
+
+def sample_pages(page_count: int, sample_size: int) -> list[int]:
+    """Pick evenly spaced page indices, always including first and last.
+
+    Args:
+        page_count: Number of pages in the document.
+        sample_size: Maximum number of pages to pick.
+
+    Returns:
+        Sorted, de-duplicated 0-based page indices.
+    """
+    if page_count <= 0 or sample_size <= 0:
+        return []
+    if page_count <= sample_size:
+        return list(range(page_count))
+    import numpy as np  # only the sampled heading mode needs it
+
+    return np.unique(np.linspace(0, page_count - 1, sample_size).round().astype(int)).tolist()
+
+
+def normalize_heading(text: str) -> str:
+    """Normalize heading text for comparison.
+
+    Args:
+        text: Heading or block text.
+
+    Returns:
+        Text with whitespace collapsed and case folded.
+    """
+    return " ".join(text.split()).casefold()
+
+
+def outline_levels(toc: list[list], page_count: int) -> dict[int, dict[str, int]] | None:
+    """Index a document outline by target page.
+
+    Args:
+        toc: Outline entries as returned by PyMuPDF's get_toc():
+            [level, title, page] with 1-based pages (-1 if none).
+        page_count: Number of pages in the document.
+
+    Returns:
+        Dict from page number to {normalized title: level}, or None if
+        no entry points at a page of the document.
+    """
+    by_page: dict[int, dict[str, int]] = {}
+    for entry in toc:
+        level, title, page = entry[:3]
+        title = normalize_heading(title)
+        if not title or not 1 <= page <= page_count:
+            continue
+        # Keep the first entry when a title repeats on the same page
+        by_page.setdefault(page, {}).setdefault(title, level)
+    return by_page or None
@@ -177,6 +177,57 @@ def tmp_xlsx(tmp_path):
     return path
 
 
+@pytest.fixture
+def tmp_multipage_pdf(tmp_path):
+    """Generate a multi-page PDF for testing page-wise extraction.
+
+    Creates a 6-page PDF with:
+    - A title (18pt) on page 1 and section headings (14pt) on every page
+    - Body paragraphs on every page
+    - A ruled 2x2 table on page 3
+    - The same embedded image (one xref) placed on pages 2, 4 and 6
+
+    Returns:
+        Path to the generated PDF file.
+    """
+    pixmap = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 4, 3), False)
+    pixmap.set_rect(pixmap.irect, (0, 128, 255))
+    png_data = pixmap.tobytes("png")
+
+    doc = fitz.open()
+    image_xref = 0
+    for page_num in range(1, 7):
+        page = doc.new_page()
+        y = 72
+        if page_num == 1:
+            page.insert_text((72, y), "Annual Filing", fontsize=18)
+            y += 40
+        page.insert_text((72, y), f"Section {page_num}", fontsize=14)
+        page.insert_text((72, y + 30), f"Body text for page {page_num}.", fontsize=11)
+        page.insert_text((72, y + 50), "Another plain paragraph.", fontsize=11)
+
+        if page_num == 3:
+            page.draw_rect(fitz.Rect(72, 300, 272, 360), color=(0, 0, 0), width=0.5)
+            page.draw_line((72, 330), (272, 330), color=(0, 0, 0), width=0.5)
+            page.draw_line((172, 300), (172, 360), color=(0, 0, 0), width=0.5)
+            page.insert_text((76, 320), "Metric", fontsize=9)
+            page.insert_text((176, 320), "Value", fontsize=9)
+            page.insert_text((76, 350), "Revenue", fontsize=9)
+            page.insert_text((176, 350), "42", fontsize=9)
+
+        if page_num % 2 == 0:
+            rect = fitz.Rect(72, 400, 112, 430)
+            if image_xref:
+                page.insert_image(rect, xref=image_xref)
+            else:
+                image_xref = page.insert_image(rect, stream=png_data)
+
+    path = tmp_path / "multipage.pdf"
+    doc.save(path)
+    doc.close()
+    return path
+
+
 @pytest.fixture
 def tmp_empty_pdf(tmp_path):
     """Generate an empty PDF for edge case testing.
@@ -0,0 +1,237 @@
+"""
+Tests for the asyncio front end.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from src.aio import AsyncDocumentRouter
+from src.models import ExtractionOptions, ExtractionStage, MetadataEvent
+from src.router import DocumentRouter
+
+
+class SlowRouter(DocumentRouter):
+    """Router whose extractions take a fixed time and are counted."""
+
+    def __init__(self, delay: float) -> None:
+        super().__init__()
+        self.delay = delay
+        self.running = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def process_document(self, source, options=None, filename=None):
+        with self.lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        try:
+            time.sleep(self.delay)
+            return super().process_document(source, options, filename)
+        finally:
+            with self.lock:
+                self.running -= 1
+
+
+async def collect(aiterable) -> list:
+    """Drain an async iterable into a list."""
+    return [item async for item in aiterable]
+
+
+class TestAProcessDocument:
+    """Tests for AsyncDocumentRouter.aprocess_document()."""
+
+    def test_matches_sync_result(self, tmp_pdf):
+        """Test the awaited result equals process_document()."""
+        async def main():
+            async with AsyncDocumentRouter() as router:
+                return await router.aprocess_document(tmp_pdf)
+
+        assert asyncio.run(main()) == DocumentRouter().process_document(tmp_pdf)
+
+    def test_loop_stays_responsive(self, tmp_pdf):
+        """Test the event loop keeps running while a document is extracted."""
+        async def main():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0.01)
+
+            task = asyncio.ensure_future(ticker())
+            async with AsyncDocumentRouter(SlowRouter(0.3)) as router:
+                await router.aprocess_document(tmp_pdf)
+            task.cancel()
+            return ticks
+
+        assert asyncio.run(main()) >= 10
+
+    def test_timeout(self, tmp_pdf):
+        """Test a document that takes too long raises TimeoutError."""
+        async def main():
+            async with AsyncDocumentRouter(SlowRouter(0.5)) as router:
+                await router.aprocess_document(tmp_pdf, timeout=0.05)
+
+        with pytest.raises(TimeoutError):
+            asyncio.run(main())
+
+    def test_errors_propagate(self, tmp_path):
+        """Test routing errors are raised to the awaiting task."""
+        bad = tmp_path / "notes.txt"
+        bad.write_text("plain text")
+
+        async def main():
+            async with AsyncDocumentRouter() as router:
+                await router.aprocess_document(bad)
+
+        with pytest.raises(ValueError, match="Unsupported format"):
+            asyncio.run(main())
+
+    def test_process_executor(self, tmp_pdf):
+        """Test extraction can run on a caller-supplied process pool."""
+        async def main():
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                router = AsyncDocumentRouter(executor=pool)
+                return await router.aprocess_document(tmp_pdf.read_bytes(), filename="report.pdf")
+
+        result = asyncio.run(main())
+        assert result.metadata.source_filename == "report.pdf"
+        assert "Test Document Title" in result.markdown
+
+    def test_invalid_concurrency(self):
+        """Test max_concurrency below 1 is rejected."""
+        with pytest.raises(ValueError):
+            AsyncDocumentRouter(max_concurrency=0)
+
+
+class TestAProcessMany:
+    """Tests for AsyncDocumentRouter.aprocess_many()."""
+
+    def test_yields_every_path(self, tmp_pdf, tmp_docx, tmp_xlsx):
+        """Test each path is yielded once with its own result."""
+        paths = [tmp_pdf, tmp_docx, tmp_xlsx]
+
+        async def main():
+            async with AsyncDocumentRouter() as router:
+                return dict(await collect(router.aprocess_many(paths)))
+
+        results = asyncio.run(main())
+        assert set(results) == set(paths)
+        assert results[tmp_docx].metadata.source_filename == tmp_docx.name
+
+    def test_concurrency_is_capped(self, tmp_pdf):
+        """Test no more than max_concurrency documents run at once."""
+        slow = SlowRouter(0.05)
+
+        async def main():
+            async with AsyncDocumentRouter(slow, max_concurrency=2) as router:
+                return await collect(router.aprocess_many([tmp_pdf] * 8))
+
+        assert len(asyncio.run(main())) == 8
+        assert slow.peak == 2
+
+    def test_ordered(self, tmp_pdf, tmp_docx, tmp_multipage_pdf):
+        """Test ordered=True yields results in input order."""
+        paths = [tmp_multipage_pdf, tmp_docx, tmp_pdf] * 2
+
+        async def main():
+            async with AsyncDocumentRouter(max_concurrency=3) as router:
+                return [path async for path, _ in router.aprocess_many(paths, ordered=True)]
+
+        assert asyncio.run(main()) == paths
+
+    def test_failures_are_isolated(self, tmp_pdf, tmp_path):
+        """Test a failing file yields an error result, not an exception."""
+        missing = tmp_path / "missing.pdf"
+
+        async def main():
+            async with AsyncDocumentRouter() as router:
+                return dict(await collect(router.aprocess_many([missing, tmp_pdf])))
+
+        results = asyncio.run(main())
+        assert results[tmp_pdf].errors == []
+        assert "File not found" in results[missing].errors[0]
+
+    def test_timeouts_are_isolated(self, tmp_pdf):
+        """Test a file over the per-document timeout yields an error result."""
+        async def main():
+            async with AsyncDocumentRouter(SlowRouter(0.3)) as router:
+                return await collect(router.aprocess_many([tmp_pdf], timeout=0.1))
+
+        [(_, result)] = asyncio.run(main())
+        assert result.errors == ["Document extraction failed: timed out after 0.1s"]
+
+    def test_cancellation_drops_queued_work(self, tmp_pdf):
+        """Test cancelling the consumer stops documents not yet started."""
+        slow = SlowRouter(0.1)
+
+        async def main():
+            executor = ThreadPoolExecutor(max_workers=1)
+            router = AsyncDocumentRouter(slow, executor=executor, max_concurrency=1)
+
+            async def consume():
+                async for _ in router.aprocess_many([tmp_pdf] * 20):
+                    pass
+
+            task = asyncio.ensure_future(consume())
+            await asyncio.sleep(0.15)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            executor.shutdown(wait=True)
+
+        started = time.perf_counter()
+        asyncio.run(main())
+        assert time.perf_counter() - started < 1.0
+
+
+class TestAIterExtract:
+    """Tests for AsyncDocumentRouter.aiter_extract()."""
+
+    def test_matches_iter_extract(self, tmp_pdf):
+        """Test the async stream yields the same events as iter_extract()."""
+        async def main():
+            async with AsyncDocumentRouter() as router:
+                return await collect(router.aiter_extract(tmp_pdf))
+
+        expected = list(DocumentRouter().get_extractor(tmp_pdf).iter_extract())
+        assert asyncio.run(main()) == expected
+
+    def test_options_apply(self, tmp_docx):
+        """Test options reach the streamed extractor."""
+        options = ExtractionOptions(stages={ExtractionStage.METADATA})
+
+        async def main():
+            async with AsyncDocumentRouter() as router:
+                return await collect(router.aiter_extract(tmp_docx, options))
+
+        events = asyncio.run(main())
+        assert len(events) == 1
+        assert isinstance(events[0], MetadataEvent)
+
+    def test_early_exit_releases_slot(self, tmp_multipage_pdf):
+        """Test breaking out of the stream frees its concurrency slot."""
+        async def main():
+            async with AsyncDocumentRouter(max_concurrency=1) as router:
+                async for _ in router.aiter_extract(tmp_multipage_pdf, max_buffered=1):
+                    break
+                # Would wait forever if the producer still held the slot
+                return await asyncio.wait_for(router.aprocess_document(tmp_multipage_pdf), 5)
+
+        assert asyncio.run(main()).metadata.page_count == 6
+
+    def test_errors_propagate(self, tmp_path):
+        """Test a routing error surfaces from the stream."""
+        missing = tmp_path / "missing.pdf"
+
+        async def main():
+            async with AsyncDocumentRouter() as router:
+                await collect(router.aiter_extract(missing))
+
+        with pytest.raises(FileNotFoundError):
+            asyncio.run(main())
@@ -0,0 +1,161 @@
+"""
+Tests for BaseExtractor event streaming and collection.
+"""
+
+import pytest
+
+from src.base_extractor import BaseExtractor
+from src.models import (
+    DocumentMetadata,
+    FileFormat,
+    TableData,
+    ImageData,
+    HeadingEvent,
+    ParagraphEvent,
+    ErrorEvent,
+    ExtractionStage,
+    ExtractionOptions,
+)
+
+
+class StageExtractor(BaseExtractor):
+    """Minimal extractor built from canned stage results."""
+
+    def __init__(self, file_path, fail=(), options=None):
+        super().__init__(file_path, options)
+        self.fail = fail
+
+    def _check(self, stage):
+        if stage in self.fail:
+            raise RuntimeError(f"{stage} broke")
+
+    def extract_text(self):
+        self._check("text")
+        return "# Title\n\nFirst paragraph.\n\n## Part\n\n#hashtag line"
+
+    def extract_tables(self):
+        self._check("tables")
+        return [TableData(content=[["a", "b"]])]
+
+    def extract_images(self):
+        self._check("images")
+        return [ImageData(filename="image_0.png", format="png")]
+
+    def extract_metadata(self):
+        self._check("metadata")
+        return DocumentMetadata(
+            file_format=FileFormat.PDF,
+            file_size_bytes=self.file_path.stat().st_size,
+            source_filename=self.file_path.name,
+        )
+
+
+@pytest.fixture
+def plain_file(tmp_path):
+    """A file for StageExtractor to point at."""
+    path = tmp_path / "doc.bin"
+    path.write_bytes(b"content")
+    return path
+
+
+class TestDefaultIterExtract:
+    """Tests for the stage-by-stage iter_extract default."""
+
+    def test_splits_markdown_into_blocks(self, plain_file):
+        """Test headings and paragraphs become separate events."""
+        events = list(StageExtractor(plain_file).iter_extract())
+        text_events = [e for e in events if isinstance(e, (HeadingEvent, ParagraphEvent))]
+        assert [(e.type, e.text) for e in text_events] == [
+            ("heading", "Title"),
+            ("paragraph", "First paragraph."),
+            ("heading", "Part"),
+            ("paragraph", "#hashtag line"),
+        ]
+
+    def test_round_trips_markdown(self, plain_file):
+        """Test extract_all reproduces extract_text exactly."""
+        extractor = StageExtractor(plain_file)
+        assert extractor.extract_all().markdown == extractor.extract_text()
+
+    def test_failed_stage_yields_error_event(self, plain_file):
+        """Test a failing stage becomes an ErrorEvent."""
+        events = list(StageExtractor(plain_file, fail=("images",)).iter_extract())
+        errors = [e for e in events if isinstance(e, ErrorEvent)]
+        assert len(errors) == 1
+        assert errors[0].stage == ExtractionStage.IMAGES
+        assert errors[0].message == "Image extraction failed: images broke"
+
+
+class TestCollectEvents:
+    """Tests for building ExtractionResult from events."""
+
+    def test_errors_in_stage_order(self, plain_file):
+        """Test errors are listed text, tables, images, metadata."""
+        result = StageExtractor(plain_file, fail=("metadata", "text", "tables")).extract_all()
+        assert result.errors == [
+            "Text extraction failed: text broke",
+            "Table extraction failed: tables broke",
+            "Metadata extraction failed: metadata broke",
+        ]
+
+    def test_failed_stage_content_is_dropped(self, plain_file):
+        """Test content emitted before a stage error is discarded."""
+        extractor = StageExtractor(plain_file)
+        events = [
+            ParagraphEvent(text="partial"),
+            ErrorEvent(stage=ExtractionStage.TEXT, message="Text extraction failed: boom"),
+        ]
+        result = extractor._collect_events(events)
+        assert result.markdown == ""
+        assert result.errors == ["Text extraction failed: boom"]
+
+    def test_missing_metadata_falls_back(self, plain_file):
+        """Test a failed metadata stage still yields minimal metadata."""
+        result = StageExtractor(plain_file, fail=("metadata",)).extract_all()
+        assert result.metadata.file_format == FileFormat.UNKNOWN
+        assert result.metadata.source_filename == "doc.bin"
+
+
+class TestLifecycle:
+    """Tests for closing extractors."""
+
+    def test_context_manager_closes(self, plain_file):
+        """Test leaving a with block calls close(), also on error."""
+        closed = []
+
+        class ClosingExtractor(StageExtractor):
+            def close(self):
+                closed.append(True)
+
+        with ClosingExtractor(plain_file) as extractor:
+            extractor.extract_all()
+        with pytest.raises(RuntimeError):
+            with ClosingExtractor(plain_file, fail=("text",)) as extractor:
+                extractor.extract_text()
+        assert closed == [True, True]
+
+
+class TestStats:
+    """Tests for recording stats in the default extract_all()."""
+
+    def test_off_by_default(self, plain_file):
+        """Test no stats are attached unless requested."""
+        assert StageExtractor(plain_file).extract_all().stats is None
+
+    def test_records_every_stage(self, plain_file):
+        """Test each stage gets a timing and the result is counted."""
+        options = ExtractionOptions(record_stats=True)
+        stats = StageExtractor(plain_file, options=options).extract_all().stats
+
+        assert set(stats.stages) == set(ExtractionStage)
+        assert stats.wall_seconds >= sum(t.wall_seconds for t in stats.stages.values())
+        assert stats.text_blocks == 4
+        assert stats.tables_found == 1 and stats.images_found == 1
+        assert stats.page_timings == [] and stats.pages_processed is None
+
+    def test_failed_stage_is_timed(self, plain_file):
+        """Test a failing stage still reports the time it spent."""
+        options = ExtractionOptions(record_stats=True)
+        result = StageExtractor(plain_file, fail=("tables",), options=options).extract_all()
+        assert ExtractionStage.TABLES in result.stats.stages
+        assert result.stats.tables_found == 0
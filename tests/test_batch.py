@@ -0,0 +1,269 @@
+"""
+Tests for directory extraction and its resume manifest.
+"""
+
+import json
+import os
+import shutil
+import sys
+
+import pytest
+
+from src.__main__ import main
+from src.batch import (
+    MANIFEST_NAME,
+    Manifest,
+    ManifestEntry,
+    discover_documents,
+    extract_directory,
+    output_path_for,
+)
+from src.extractors import PDFExtractor
+from src.models import ExtractionOptions, ExtractionResult, ExtractionStage
+
+
+@pytest.fixture
+def input_dir(tmp_path, tmp_pdf, tmp_docx):
+    """Directory with a PDF, a nested DOCX, a corrupt PDF and a non-document."""
+    root = tmp_path / "in"
+    (root / "sub").mkdir(parents=True)
+    shutil.copy(tmp_pdf, root / "report.pdf")
+    shutil.copy(tmp_docx, root / "sub" / "notes.docx")
+    (root / "sub" / "broken.pdf").write_bytes(b"not a pdf")
+    (root / "readme.txt").write_text("ignored")
+    return root
+
+
+def read_manifest(output_dir) -> list[ManifestEntry]:
+    """Parse every line of a manifest."""
+    lines = (output_dir / MANIFEST_NAME).read_text().splitlines()
+    return [ManifestEntry.model_validate_json(line) for line in lines]
+
+
+class TestDiscoverDocuments:
+    """Tests for discover_documents function."""
+
+    def test_top_level_only(self, input_dir):
+        """Test only supported files directly in the directory are listed."""
+        assert discover_documents(input_dir) == [input_dir / "report.pdf"]
+
+    def test_recursive(self, input_dir):
+        """Test recursive discovery includes subdirectories, sorted."""
+        assert discover_documents(input_dir, recursive=True) == [
+            input_dir / "report.pdf",
+            input_dir / "sub" / "broken.pdf",
+            input_dir / "sub" / "notes.docx",
+        ]
+
+
+class TestExtractDirectory:
+    """Tests for extract_directory function."""
+
+    def test_writes_one_output_per_document(self, input_dir, tmp_path):
+        """Test outputs mirror the input tree and parse as results."""
+        out = tmp_path / "out"
+        summary = extract_directory(input_dir, out, recursive=True, workers=2)
+
+        assert (summary.extracted, summary.failed, summary.skipped) == (2, 1, 0)
+        result = ExtractionResult.model_validate_json((out / "sub" / "notes.docx.json").read_text())
+        assert result.metadata.source_filename == "notes.docx"
+        assert (out / "report.pdf.json").exists()
+        assert not (out / "sub" / "broken.pdf.json").exists()
+
+    def test_manifest_records_each_document(self, input_dir, tmp_path):
+        """Test the manifest holds size, mtime, digest, status and duration."""
+        out = tmp_path / "out"
+        extract_directory(input_dir, out, recursive=True, workers=1)
+
+        entries = {entry.path: entry for entry in read_manifest(out)}
+        assert set(entries) == {"report.pdf", "sub/notes.docx", "sub/broken.pdf"}
+        report = entries["report.pdf"]
+        assert report.status == "ok"
+        assert report.size == (input_dir / "report.pdf").stat().st_size
+        assert report.duration_seconds > 0
+        assert len(report.digest) == 40
+        assert entries["sub/broken.pdf"].status == "failed"
+        assert entries["sub/broken.pdf"].error.startswith("Document extraction failed:")
+
+    def test_rerun_skips_unchanged(self, input_dir, tmp_path):
+        """Test a second run extracts only failed and changed documents."""
+        out = tmp_path / "out"
+        extract_directory(input_dir, out, recursive=True, workers=1)
+        shutil.copy(input_dir / "sub" / "notes.docx", input_dir / "sub" / "copy.docx")
+
+        summary = extract_directory(input_dir, out, recursive=True, workers=1)
+        # Failed file is retried, the new copy is extracted
+        assert (summary.extracted, summary.failed, summary.skipped) == (1, 1, 2)
+
+    def test_touched_file_with_same_content_is_skipped(self, input_dir, tmp_path):
+        """Test a new mtime alone does not trigger re-extraction."""
+        out = tmp_path / "out"
+        extract_directory(input_dir, out, workers=1)
+        stat = (input_dir / "report.pdf").stat()
+        os.utime(input_dir / "report.pdf", (stat.st_atime, stat.st_mtime + 60))
+
+        summary = extract_directory(input_dir, out, workers=1)
+        assert (summary.extracted, summary.skipped) == (0, 1)
+        assert read_manifest(out)[-1].mtime == stat.st_mtime + 60
+
+    def test_modified_file_is_reextracted(self, input_dir, tmp_path, tmp_multipage_pdf):
+        """Test changed content is extracted again."""
+        out = tmp_path / "out"
+        extract_directory(input_dir, out, workers=1)
+        shutil.copy(tmp_multipage_pdf, input_dir / "report.pdf")
+
+        summary = extract_directory(input_dir, out, workers=1)
+        assert summary.extracted == 1
+        result = ExtractionResult.model_validate_json((out / "report.pdf.json").read_text())
+        assert result.metadata.page_count == 6
+
+    def test_deleted_output_is_regenerated(self, input_dir, tmp_path):
+        """Test a document whose output is missing is extracted again."""
+        out = tmp_path / "out"
+        extract_directory(input_dir, out, workers=1)
+        (out / "report.pdf.json").unlink()
+
+        assert extract_directory(input_dir, out, workers=1).extracted == 1
+
+    def test_changed_options_reextract(self, input_dir, tmp_path):
+        """Test output extracted with other options is not reused."""
+        out = tmp_path / "out"
+        metadata_only = ExtractionOptions(stages=frozenset({ExtractionStage.METADATA}))
+        extract_directory(input_dir, out, workers=1, options=metadata_only)
+        assert extract_directory(input_dir, out, workers=1, options=metadata_only).skipped == 1
+
+        summary = extract_directory(input_dir, out, workers=1)
+        assert (summary.extracted, summary.skipped) == (1, 0)
+        result = ExtractionResult.model_validate_json((out / "report.pdf.json").read_text())
+        assert result.markdown
+
+    def test_new_extractor_version_reextracts(self, input_dir, tmp_path, monkeypatch):
+        """Test output of an older extractor version is not reused."""
+        out = tmp_path / "out"
+        extract_directory(input_dir, out, workers=1)
+        monkeypatch.setattr(PDFExtractor, "version", "2")
+
+        summary = extract_directory(input_dir, out, workers=1)
+        assert (summary.extracted, summary.skipped) == (1, 0)
+        assert read_manifest(out)[-1].extractor == "PDFExtractor:2"
+
+    def test_entries_without_extractor_are_stale(self, input_dir, tmp_path):
+        """Test entries from manifests that predate the extractor field are redone."""
+        out = tmp_path / "out"
+        extract_directory(input_dir, out, workers=1)
+        lines = [
+            json.dumps({k: v for k, v in json.loads(line).items() if k not in ("extractor", "options")})
+            for line in (out / MANIFEST_NAME).read_text().splitlines()
+        ]
+        (out / MANIFEST_NAME).write_text("\n".join(lines) + "\n")
+
+        assert extract_directory(input_dir, out, workers=1).extracted == 1
+
+    def test_resume_ignores_truncated_manifest_line(self, input_dir, tmp_path):
+        """Test a line cut short by a crash is ignored on resume."""
+        out = tmp_path / "out"
+        extract_directory(input_dir, out, workers=1)
+        with open(out / MANIFEST_NAME, "a") as f:
+            f.write('{"path": "sub/notes.do')
+
+        manifest = Manifest(out / MANIFEST_NAME)
+        assert set(manifest.entries) == {"report.pdf"}
+
+
+class TestOutputPath:
+    """Tests for output_path_for function."""
+
+    def test_keeps_full_name(self, tmp_path):
+        """Test documents differing only by extension get separate outputs."""
+        pdf = output_path_for(tmp_path / "in" / "a" / "r.pdf", tmp_path / "in", tmp_path / "out")
+        docx = output_path_for(tmp_path / "in" / "a" / "r.docx", tmp_path / "in", tmp_path / "out")
+        assert pdf == tmp_path / "out" / "a" / "r.pdf.json"
+        assert pdf != docx
+
+
+class TestDirectoryCLI:
+    """Tests for the CLI directory mode."""
+
+    def run(self, monkeypatch, *args) -> int:
+        """Run the CLI with the given arguments."""
+        monkeypatch.setattr(sys, "argv", ["document-extractor", *map(str, args)])
+        return main()
+
+    def test_directory_mode(self, input_dir, tmp_path, monkeypatch, capsys):
+        """Test a directory input extracts into --output-dir and reports failures."""
+        out = tmp_path / "out"
+        code = self.run(monkeypatch, input_dir, "--recursive", "--workers", 2, "--output-dir", out)
+
+        assert code == 1  # broken.pdf failed
+        assert (out / "sub" / "notes.docx.json").exists()
+        captured = capsys.readouterr()
+        assert "failed: sub/broken.pdf" in captured.err
+        assert "Extracted 2" in captured.out
+
+    def test_default_output_dir(self, input_dir, monkeypatch):
+        """Test outputs default to a sibling <dir>_extracted directory."""
+        assert self.run(monkeypatch, input_dir, "--workers", 1) == 0
+        assert (input_dir.parent / "in_extracted" / "report.pdf.json").exists()
+
+    def test_output_file_rejected_for_directory(self, input_dir, tmp_path, monkeypatch):
+        """Test -o cannot be combined with a directory input."""
+        assert self.run(monkeypatch, input_dir, "-o", tmp_path / "x.json") == 1
+
+    def test_recycle_flags(self, input_dir, tmp_path, monkeypatch):
+        """Test the worker recycling flags reach the batch."""
+        out = tmp_path / "out"
+        code = self.run(
+            monkeypatch, input_dir, "--workers", 2, "--recycle-after", 1,
+            "--recycle-memory", 4096, "--output-dir", out,
+        )
+        assert code == 0
+        assert (out / "report.pdf.json").exists()
+
+    def test_invalid_recycle_limit(self, input_dir, monkeypatch, capsys):
+        """Test a zero recycling limit is reported as a usage error."""
+        assert self.run(monkeypatch, input_dir, "--recycle-after", 0) == 1
+        assert "Error:" in capsys.readouterr().err
+
+
+class TestFileCLI:
+    """Tests for the CLI single-file mode."""
+
+    def run(self, monkeypatch, *args) -> int:
+        """Run the CLI with the given arguments."""
+        monkeypatch.setattr(sys, "argv", ["document-extractor", *map(str, args)])
+        return main()
+
+    def test_output_includes_stats(self, tmp_pdf, tmp_path, monkeypatch):
+        """Test the JSON output has timings and counts by default."""
+        out = tmp_path / "out.json"
+        assert self.run(monkeypatch, tmp_pdf, "-o", out) == 0
+        stats = json.loads(out.read_text())["stats"]
+        assert stats["wall_seconds"] > 0
+        assert set(stats["stages"]) == {"text", "tables", "images", "metadata"}
+        assert stats["pages_processed"] == 1
+
+    def test_no_stats(self, tmp_docx, tmp_path, monkeypatch):
+        """Test --no-stats leaves the stats section out."""
+        out = tmp_path / "out.json"
+        assert self.run(monkeypatch, tmp_docx, "-o", out, "--no-stats") == 0
+        assert json.loads(out.read_text())["stats"] is None
+
+    def test_trace(self, tmp_pdf, tmp_path, monkeypatch):
+        """Test --trace writes a Chrome trace of the extraction."""
+        trace = tmp_path / "trace.json"
+        assert self.run(monkeypatch, tmp_pdf, "-o", tmp_path / "out.json", "--trace", trace) == 0
+        names = {event["name"] for event in json.loads(trace.read_text())["traceEvents"]}
+        assert {"extract_all", "page", "text"} <= names
+
+    def test_profile(self, tmp_pdf, tmp_path, monkeypatch, capsys):
+        """Test --profile writes per-stage profiles and prints the hot functions."""
+        profile = tmp_path / "profile"
+        assert self.run(monkeypatch, tmp_pdf, "-o", tmp_path / "out.json", "--profile", profile) == 0
+        assert {"text.pstats", "text.collapsed", "all.pstats"} <= {p.name for p in profile.iterdir()}
+        out = capsys.readouterr().out
+        assert "== text:" in out and "by library:" in out
+
+    def test_profile_rejects_sandbox(self, tmp_pdf, tmp_path, monkeypatch):
+        """Test --profile refuses options that move work out of the process."""
+        assert self.run(monkeypatch, tmp_pdf, "--profile", tmp_path, "--timeout", 10) == 1
+        assert self.run(monkeypatch, tmp_pdf.parent, "--profile", tmp_path, "--workers", 2) == 1
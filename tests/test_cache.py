@@ -0,0 +1,190 @@
+"""
+Tests for the on-disk extraction result cache.
+"""
+
+import os
+import shutil
+
+from src.cache import ResultCache, cache_key, file_digest
+from src.extractors import PDFExtractor, DOCXExtractor
+from src.models import ExtractionResult, DocumentMetadata, FileFormat, ExtractionOptions
+from src.router import DocumentRouter
+
+
+def make_result(markdown: str) -> ExtractionResult:
+    """Build a small ExtractionResult for cache tests."""
+    return ExtractionResult(
+        markdown=markdown,
+        metadata=DocumentMetadata(
+            file_format=FileFormat.PDF,
+            file_size_bytes=1,
+            source_filename="doc.pdf",
+        ),
+    )
+
+
+class TestCacheKey:
+    """Tests for content hashing and key derivation."""
+
+    def test_digest_depends_only_on_content(self, tmp_pdf, tmp_path):
+        """Test a renamed copy has the same digest."""
+        copy = tmp_path / "renamed.pdf"
+        shutil.copy(tmp_pdf, copy)
+        assert file_digest(copy) == file_digest(tmp_pdf)
+
+    def test_key_includes_extractor(self, tmp_pdf):
+        """Test different extractors give different keys for the same bytes."""
+        digest = file_digest(tmp_pdf)
+        assert cache_key(digest, PDFExtractor) != cache_key(digest, DOCXExtractor)
+
+    def test_key_includes_version(self, tmp_pdf, monkeypatch):
+        """Test bumping an extractor version changes its keys."""
+        digest = file_digest(tmp_pdf)
+        before = cache_key(digest, PDFExtractor)
+        monkeypatch.setattr(PDFExtractor, "version", "2")
+        assert cache_key(digest, PDFExtractor) != before
+
+    def test_key_includes_options(self, tmp_pdf):
+        """Test non-default options get their own key; defaults share one."""
+        digest = file_digest(tmp_pdf)
+        plain = cache_key(digest, PDFExtractor)
+        assert cache_key(digest, PDFExtractor, ExtractionOptions()) == plain
+        assert cache_key(digest, PDFExtractor, ExtractionOptions(max_tables=1)) != plain
+
+    def test_key_ignores_record_stats(self, tmp_pdf):
+        """Test runs with and without stats share their entries."""
+        digest = file_digest(tmp_pdf)
+        assert cache_key(digest, PDFExtractor, ExtractionOptions(record_stats=True)) == cache_key(
+            digest, PDFExtractor
+        )
+        assert cache_key(
+            digest, PDFExtractor, ExtractionOptions(max_tables=1, record_stats=True)
+        ) == cache_key(digest, PDFExtractor, ExtractionOptions(max_tables=1))
+
+
+class TestResultCache:
+    """Tests for ResultCache storage and eviction."""
+
+    def test_round_trip_and_counters(self, tmp_path):
+        """Test put/get return the stored result and count hits and misses."""
+        cache = ResultCache(tmp_path / "cache")
+        assert cache.get("a" * 40) is None
+        cache.put("a" * 40, make_result("hello"))
+        assert cache.get("a" * 40).markdown == "hello"
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_writes_leave_no_temp_files(self, tmp_path):
+        """Test atomic writes clean up after themselves."""
+        cache = ResultCache(tmp_path / "cache")
+        cache.put("b" * 40, make_result("x"))
+        assert [p.suffix for p in cache.directory.iterdir()] == [".json"]
+
+    def test_corrupt_entry_is_a_miss(self, tmp_path):
+        """Test an unreadable entry is treated as missing."""
+        cache = ResultCache(tmp_path / "cache")
+        (cache.directory / f"{'c' * 40}.json").write_text("{not json")
+        assert cache.get("c" * 40) is None
+        assert cache.misses == 1
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        """Test the oldest unused entry goes first when over the limit."""
+        cache = ResultCache(tmp_path / "cache")
+        entry_size = len(make_result("x" * 100).model_dump_json())
+        cache.max_bytes = entry_size * 2
+        cache.put("1" * 40, make_result("x" * 100))
+        cache.put("2" * 40, make_result("x" * 100))
+        # Age the second entry and touch the first, so the second is LRU
+        os.utime(cache.directory / f"{'2' * 40}.json", (1, 1))
+        cache.get("1" * 40)
+        cache.put("3" * 40, make_result("x" * 100))
+
+        remaining = sorted(p.stem[0] for p in cache.directory.glob("*.json"))
+        assert remaining == ["1", "3"]
+
+    def test_puts_do_not_rescan(self, tmp_path, monkeypatch):
+        """Test writes to a full cache scan the directory only now and then."""
+        cache = ResultCache(tmp_path / "cache")
+        cache.max_bytes = len(make_result("x" * 100).model_dump_json()) * 20
+        scans = []
+        scan = cache._scan
+        monkeypatch.setattr(cache, "_scan", lambda: scans.append(1) or scan())
+        for i in range(200):
+            cache.put(f"{i:040d}", make_result("x" * 100))
+        # One initial scan, then one per quarter of the limit written
+        assert len(scans) <= 1 + 200 // 5
+        assert len(list(cache.directory.glob("*.json"))) == 20
+
+    def test_rescan_sees_other_writers(self, tmp_path):
+        """Test entries written by another cache on the directory count toward the limit."""
+        entry_size = len(make_result("x" * 100).model_dump_json())
+        ours = ResultCache(tmp_path / "cache", max_bytes=entry_size * 4)
+        theirs = ResultCache(tmp_path / "cache", max_bytes=entry_size * 100)
+        ours.put("0" * 40, make_result("x" * 100))
+        for i in range(1, 5):
+            theirs.put(f"{i:040d}", make_result("x" * 100))
+        for i in range(5, 9):
+            ours.put(f"{i:040d}", make_result("x" * 100))
+        # Going over its own view of the limit makes ours rescan and trim all entries
+        assert len(list(ours.directory.glob("*.json"))) == 4
+
+
+class TestRouterCache:
+    """Tests for DocumentRouter with a result cache."""
+
+    def test_second_call_hits_cache(self, tmp_pdf, tmp_path):
+        """Test a repeated document is served from the cache."""
+        router = DocumentRouter(cache=ResultCache(tmp_path / "cache"))
+        options = ExtractionOptions(record_stats=True)
+        first = router.process_document(tmp_pdf, options)
+        second = router.process_document(tmp_pdf, options)
+        assert second.model_dump(exclude={"stats"}) == first.model_dump(exclude={"stats"})
+        assert second.stats.from_result_cache
+        assert (router.cache.hits, router.cache.misses) == (1, 1)
+
+    def test_renamed_duplicate_hits_cache(self, tmp_pdf, tmp_path, monkeypatch):
+        """Test identical bytes under another name skip extraction."""
+        router = DocumentRouter(cache=ResultCache(tmp_path / "cache"))
+        router.process_document(tmp_pdf)
+        copy = tmp_path / "upload_copy.pdf"
+        shutil.copy(tmp_pdf, copy)
+
+        def fail_extract(self):
+            raise AssertionError("should have been served from the cache")
+
+        monkeypatch.setattr(PDFExtractor, "extract_all", fail_extract)
+        result = router.process_document(copy)
+        assert result.metadata.source_filename == "upload_copy.pdf"
+        assert router.cache.hits == 1
+
+    def test_uploaded_bytes_hit_file_entry(self, tmp_pdf, tmp_path):
+        """Test an in-memory upload shares the cache entry of its file."""
+        router = DocumentRouter(cache=ResultCache(tmp_path / "cache"))
+        router.process_document(tmp_pdf)
+        result = router.process_document(tmp_pdf.read_bytes(), filename="upload.pdf")
+        assert result.metadata.source_filename == "upload.pdf"
+        assert router.cache.hits == 1
+
+    def test_hit_drops_original_timings(self, tmp_pdf, tmp_path):
+        """Test a cached result is marked as such instead of repeating old timings."""
+        router = DocumentRouter(cache=ResultCache(tmp_path / "cache"))
+        first = router.process_document(tmp_pdf, ExtractionOptions(record_stats=True))
+        assert first.stats.wall_seconds > 0 and not first.stats.from_result_cache
+
+        second = router.process_document(tmp_pdf, ExtractionOptions(record_stats=True))
+        assert router.cache.hits == 1
+        assert second.stats.from_result_cache
+        assert second.stats.wall_seconds is None and second.stats.stages == {}
+        assert second.stats.peak_memory_delta_bytes is None
+        assert second.stats.tables_found == first.stats.tables_found
+        assert second.model_dump(exclude={"stats"}) == first.model_dump(exclude={"stats"})
+
+    def test_hit_without_record_stats_has_no_stats(self, tmp_pdf, tmp_path):
+        """Test stats stored by an earlier run are not returned when none are asked for."""
+        router = DocumentRouter(cache=ResultCache(tmp_path / "cache"))
+        router.process_document(tmp_pdf, ExtractionOptions(record_stats=True))
+        assert router.process_document(tmp_pdf).stats is None
+        assert router.cache.hits == 1
+
+    def test_no_cache_by_default(self, tmp_pdf):
+        """Test routers extract every time unless given a cache."""
+        assert DocumentRouter().cache is None
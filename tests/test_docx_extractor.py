@@ -5,7 +5,7 @@ Tests for DOCX extractor.
 import pytest
 
 from src.extractors import DOCXExtractor
-from src.models import ExtractionResult, FileFormat
+from src.models import ExtractionOptions, ExtractionResult, ExtractionStage, FileFormat
 
 
 class TestDOCXExtractorInit:
@@ -118,3 +118,86 @@ class TestDOCXExtractAll:
         extractor = DOCXExtractor(tmp_docx)
         result = extractor.extract_all()
         assert result.errors == []
+
+
+class TestDOCXIterExtract:
+    """Tests for DOCX event streaming."""
+
+    def test_collected_events_match_stages(self, tmp_docx):
+        """Test extract_all equals the separately extracted stages."""
+        extractor = DOCXExtractor(tmp_docx)
+        result = extractor.extract_all()
+        assert result.markdown == extractor.extract_text()
+        assert result.tables == extractor.extract_tables()
+        assert result.images == extractor.extract_images()
+        assert result.metadata == extractor.extract_metadata()
+
+    def test_events_follow_body_order(self, tmp_docx):
+        """Test headings, paragraphs and tables stream in document order."""
+        events = list(DOCXExtractor(tmp_docx).iter_extract())
+        kinds = [e.type for e in events]
+        assert kinds == ["metadata", "heading", "heading", "paragraph", "paragraph", "table"]
+        assert events[1].level == 1
+        assert events[5].table.content[0] == ["Header1", "Header2", "Header3"]
+
+    def test_table_failure_keeps_text(self, tmp_docx, monkeypatch):
+        """Test a failing table stage is reported without losing the text."""
+        extractor = DOCXExtractor(tmp_docx)
+
+        def broken_table(table):
+            raise RuntimeError("bad table")
+
+        monkeypatch.setattr(extractor, "_read_table", broken_table)
+        result = extractor.extract_all()
+        assert "Section One" in result.markdown
+        assert result.tables == []
+        assert result.errors == ["Table extraction failed: bad table"]
+
+
+class TestDOCXExtractionOptions:
+    """Tests for stage and limit selection on DOCX."""
+
+    def test_tables_only(self, tmp_docx):
+        """Test selecting only tables skips text and metadata."""
+        options = ExtractionOptions(stages={ExtractionStage.TABLES})
+        events = list(DOCXExtractor(tmp_docx, options).iter_extract())
+        assert [e.type for e in events] == ["table"]
+
+    def test_table_limit(self, tmp_docx):
+        """Test max_tables=0 reads no tables but keeps the text."""
+        result = DOCXExtractor(tmp_docx, ExtractionOptions(max_tables=0)).extract_all()
+        assert result.tables == []
+        assert "Section One" in result.markdown
+
+
+class TestDOCXClose:
+    """Tests for releasing DOCX resources."""
+
+    def test_close_releases_buffer(self, tmp_docx):
+        """Test an in-memory document's stream is closed and the parse dropped."""
+        with DOCXExtractor(tmp_docx.read_bytes()) as extractor:
+            stream = extractor._stream
+            assert extractor.extract_all().errors == []
+        assert stream.closed
+        assert extractor._doc is None
+        extractor.close()  # idempotent
+
+
+class TestDOCXStats:
+    """Tests for recording DOCX extraction statistics."""
+
+    def test_stage_timings_and_counts(self, tmp_docx):
+        """Test the body walk is timed per stage and the content counted."""
+        options = ExtractionOptions(record_stats=True)
+        result = DOCXExtractor(tmp_docx, options).extract_all()
+        stats = result.stats
+
+        assert set(stats.stages) == set(ExtractionStage)
+        assert stats.wall_seconds > 0
+        assert stats.text_blocks == len(result.markdown.split("\n\n"))
+        assert stats.tables_found == len(result.tables) > 0
+        assert stats.page_timings == [] and stats.text_spans is None
+
+    def test_not_recorded_by_default(self, tmp_docx):
+        """Test DOCX results carry no stats unless requested."""
+        assert DOCXExtractor(tmp_docx).extract_all().stats is None
@@ -0,0 +1,74 @@
+"""
+Tests for startup import cost.
+
+Each test imports an entry point in a fresh interpreter under
+`python -X importtime` (see benchmarks/bench_import_time.py) and checks
+which libraries it pulled in, so a module-level import that makes every
+CLI call and worker start load PyMuPDF or python-docx fails here.
+"""
+
+from benchmarks.bench_import_time import import_profile
+
+# Libraries behind the PDF and OOXML extractors
+DOCUMENT_LIBRARIES = ("fitz", "docx", "pptx", "openpyxl", "numpy")
+
+# Generous ceiling on all imports for `python -m src --help`, in
+# microseconds; the lazy CLI needs well under a tenth of it
+HELP_IMPORT_BUDGET_US = 500_000
+
+
+def loaded(modules: dict[str, int], names: tuple[str, ...]) -> list[str]:
+    """Return which of the named top-level modules were imported."""
+    return [name for name in names if name in modules]
+
+
+class TestImportTime:
+    """Tests for lazy loading of extractors and their libraries."""
+
+    def test_cli_help_loads_nothing_heavy(self):
+        """Test --help parses arguments without pydantic or any backend."""
+        modules, total = import_profile(["-m", "src", "--help"])
+        assert loaded(modules, DOCUMENT_LIBRARIES + ("pydantic",)) == []
+        assert total < HELP_IMPORT_BUDGET_US
+
+    def test_package_import_is_lazy(self):
+        """Test `import src` defers its exports until first access."""
+        modules, _ = import_profile(["-c", "import src"])
+        assert "src.router" not in modules
+        assert "src.models" not in modules
+
+    def test_router_import_loads_no_backend(self):
+        """Test importing the router leaves every extractor unloaded."""
+        modules, _ = import_profile(["-c", "import src.router"])
+        assert loaded(modules, DOCUMENT_LIBRARIES) == []
+        assert not [name for name in modules if name.startswith("src.extractors.")]
+
+    def test_extractor_loads_only_its_backend(self):
+        """Test importing one extractor does not load the others' libraries."""
+        modules, _ = import_profile(["-c", "import src.extractors.docx_extractor"])
+        assert loaded(modules, DOCUMENT_LIBRARIES) == ["docx"]
+
+    def test_routing_loads_backend_on_first_use(self, tmp_docx):
+        """Test the router imports an extractor only for the format it routes."""
+        code = f"from src.router import DocumentRouter; DocumentRouter().get_extractor({str(tmp_docx)!r})"
+        modules, _ = import_profile(["-c", code])
+        assert loaded(modules, DOCUMENT_LIBRARIES) == ["docx"]
+
+    def test_probing_ooxml_skips_pymupdf(self, tmp_xlsx):
+        """Test probing a workbook never loads PyMuPDF."""
+        code = f"from src.router import DocumentRouter; DocumentRouter().probe({str(tmp_xlsx)!r})"
+        modules, _ = import_profile(["-c", code])
+        assert loaded(modules, DOCUMENT_LIBRARIES) == []
+
+    def test_pdf_extraction_skips_numpy(self, tmp_pdf):
+        """Test only the sampled heading mode loads numpy."""
+        code = f"from src.router import DocumentRouter; DocumentRouter().process_document({str(tmp_pdf)!r})"
+        modules, _ = import_profile(["-c", code])
+        assert loaded(modules, DOCUMENT_LIBRARIES) == ["fitz"]
+
+        code = (
+            "from src.extractors.pdf_extractor import PDFExtractor; "
+            f"PDFExtractor({str(tmp_pdf)!r}, heading_mode='sampled').extract_all()"
+        )
+        modules, _ = import_profile(["-c", code])
+        assert loaded(modules, DOCUMENT_LIBRARIES) == ["fitz", "numpy"]
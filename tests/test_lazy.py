@@ -0,0 +1,100 @@
+"""
+Tests for lazily extracted results.
+"""
+
+import pytest
+
+from src.extractors import DOCXExtractor, PDFExtractor
+from src.lazy import LazyExtractionResult
+from src.models import ExtractionOptions, ExtractionStage, FileFormat
+from src.router import DocumentRouter
+
+
+def fail_if_called(*args, **kwargs):
+    """Stand-in for extraction methods a test expects to stay unused."""
+    raise AssertionError("stage should not have run")
+
+
+class TestLazyExtractionResult:
+    """Tests for LazyExtractionResult."""
+
+    def test_metadata_does_not_extract_content(self, tmp_pdf, monkeypatch):
+        """Test reading metadata leaves text, tables and images untouched."""
+        extractor = PDFExtractor(tmp_pdf)
+        for method in ("extract_text", "extract_tables", "extract_images", "extract_all"):
+            monkeypatch.setattr(extractor, method, fail_if_called)
+        result = LazyExtractionResult(extractor)
+        assert result.metadata.file_format == FileFormat.PDF
+        assert result.metadata.page_count == 1
+
+    def test_fields_are_memoized(self, tmp_docx, monkeypatch):
+        """Test each stage runs at most once."""
+        extractor = DOCXExtractor(tmp_docx)
+        calls = []
+        extract_text = extractor.extract_text
+
+        def counting():
+            calls.append(1)
+            return extract_text()
+
+        monkeypatch.setattr(extractor, "extract_text", counting)
+        result = LazyExtractionResult(extractor)
+        assert result.markdown == result.markdown
+        assert len(calls) == 1
+
+    def test_failed_stage_is_reported(self, tmp_docx, monkeypatch):
+        """Test a failing stage yields its empty value and an error."""
+        extractor = DOCXExtractor(tmp_docx)
+
+        def broken():
+            raise RuntimeError("bad table")
+
+        monkeypatch.setattr(extractor, "extract_tables", broken)
+        result = LazyExtractionResult(extractor)
+        assert result.errors == []
+        assert result.tables == []
+        assert result.errors == ["Table extraction failed: bad table"]
+
+    def test_untouched_result_uses_extract_all(self, tmp_pdf):
+        """Test to_result() on an unread result matches extract_all()."""
+        result = LazyExtractionResult(PDFExtractor(tmp_pdf)).to_result()
+        assert result.model_dump() == PDFExtractor(tmp_pdf).extract_all().model_dump()
+
+    def test_partial_result_matches_eager(self, tmp_pdf):
+        """Test to_result() after some reads still matches extract_all()."""
+        lazy = LazyExtractionResult(PDFExtractor(tmp_pdf))
+        lazy.tables
+        eager = PDFExtractor(tmp_pdf).extract_all()
+        assert lazy.to_result().model_dump(exclude={"stats"}) == eager.model_dump(exclude={"stats"})
+
+    def test_unselected_stage_is_empty(self, tmp_pdf, monkeypatch):
+        """Test stages left out of the options are never run."""
+        extractor = PDFExtractor(tmp_pdf, ExtractionOptions(stages={ExtractionStage.TABLES}))
+        monkeypatch.setattr(extractor, "extract_text", fail_if_called)
+        monkeypatch.setattr(extractor, "extract_metadata", fail_if_called)
+        result = LazyExtractionResult(extractor)
+        assert result.markdown == ""
+        assert result.metadata.file_format == FileFormat.PDF
+        assert result.metadata.page_count is None
+
+    def test_close_keeps_computed_fields(self, tmp_pdf):
+        """Test computed fields survive close() and others raise."""
+        with LazyExtractionResult(PDFExtractor(tmp_pdf)) as result:
+            title = result.metadata.title
+        assert result.closed
+        assert result.metadata.title == title
+        with pytest.raises(ValueError, match="closed"):
+            result.markdown
+        result.close()
+
+
+class TestRouterOpenDocument:
+    """Tests for DocumentRouter.open_document()."""
+
+    def test_returns_lazy_result(self, tmp_multipage_pdf):
+        """Test open_document() returns a lazy result with options applied."""
+        options = ExtractionOptions(page_range=(4, 6))
+        with DocumentRouter().open_document(tmp_multipage_pdf, options) as result:
+            assert isinstance(result, LazyExtractionResult)
+            assert result.tables == []
+            assert [i.page_or_slide for i in result.images] == [4, 6]
@@ -0,0 +1,28 @@
+"""
+Tests for logging configuration.
+"""
+
+import logging
+import sys
+
+from src.logging_config import DEFAULT_FORMAT, get_logger
+
+
+class TestGetLogger:
+    """Tests for get_logger()."""
+
+    def test_configures_stderr_handler(self):
+        """Test a new logger gets one stderr handler with the default format."""
+        logger = get_logger("tests.logging.fresh")
+        assert isinstance(logger, logging.Logger)
+        [handler] = logger.handlers
+        assert handler.stream is sys.stderr
+        assert handler.formatter._fmt == DEFAULT_FORMAT
+        assert logger.level == logging.INFO
+
+    def test_repeated_calls_add_no_handlers(self):
+        """Test asking again only changes the level."""
+        get_logger("tests.logging.repeat")
+        logger = get_logger("tests.logging.repeat", level=logging.DEBUG)
+        assert len(logger.handlers) == 1
+        assert logger.level == logging.DEBUG
@@ -12,6 +12,9 @@ from src.models import (
     ImageData,
     DocumentMetadata,
     ExtractionResult,
+    ExtractionOptions,
+    ExtractionStage,
+    WorkerRecycling,
 )
 
 
@@ -170,3 +173,59 @@ class TestExtractionResult:
         )
         with pytest.raises(ValidationError):
             ExtractionResult(markdown=123, metadata=metadata)
+
+
+class TestExtractionOptions:
+    """Tests for ExtractionOptions model."""
+
+    def test_defaults_select_everything(self):
+        """Test default options run every stage over every page."""
+        options = ExtractionOptions()
+        assert all(options.wants(stage) for stage in ExtractionStage)
+        assert options.reads_full_pages
+        assert options.page_indices(4) == range(4)
+
+    def test_page_range_is_clipped(self):
+        """Test page ranges convert to 0-based indices within the document."""
+        assert ExtractionOptions(page_range=(2, 3)).page_indices(5) == range(1, 3)
+        assert ExtractionOptions(page_range=(4, 99)).page_indices(5) == range(3, 5)
+        assert len(ExtractionOptions(page_range=(7, 9)).page_indices(5)) == 0
+
+    def test_rejects_invalid_page_range(self):
+        """Test empty or 0-based ranges are rejected."""
+        with pytest.raises(ValidationError):
+            ExtractionOptions(page_range=(0, 2))
+        with pytest.raises(ValidationError):
+            ExtractionOptions(page_range=(5, 2))
+
+    def test_rejects_negative_limits(self):
+        """Test limits cannot be negative."""
+        with pytest.raises(ValidationError):
+            ExtractionOptions(max_tables=-1)
+
+    def test_limits_or_subsets_are_partial(self):
+        """Test selecting fewer stages or adding limits reads partial pages."""
+        assert not ExtractionOptions(stages={ExtractionStage.TEXT}).reads_full_pages
+        assert not ExtractionOptions(max_images=2).reads_full_pages
+
+    def test_stages_serialize_in_stage_order(self):
+        """Test stage order in JSON does not depend on set iteration order."""
+        options = ExtractionOptions(stages={ExtractionStage.METADATA, ExtractionStage.TEXT})
+        assert json.loads(options.model_dump_json())["stages"] == ["text", "metadata"]
+
+
+class TestWorkerRecycling:
+    """Tests for WorkerRecycling model."""
+
+    def test_defaults_never_recycle(self):
+        """Test both limits are off by default."""
+        recycle = WorkerRecycling()
+        assert recycle.max_documents is None
+        assert recycle.max_rss_bytes is None
+
+    def test_limits_must_be_positive(self):
+        """Test zero limits are rejected."""
+        with pytest.raises(ValidationError):
+            WorkerRecycling(max_documents=0)
+        with pytest.raises(ValidationError):
+            WorkerRecycling(max_rss_bytes=0)
@@ -2,10 +2,25 @@
 Tests for PDF extractor.
 """
 
+import fitz  # pymupdf
 import pytest
 
-from src.extractors.pdf_extractor import PDFExtractor
-from src.models import ExtractionResult, DocumentMetadata, FileFormat
+from src.base_extractor import BaseExtractor
+from src.cache import PageCache
+from src.extractors.pdf_extractor import PDFExtractor, LEAN_TEXT_FLAGS, _shard_ranges, shrink_store
+from src.models import (
+    ExtractionOptions,
+    ExtractionResult,
+    ExtractionStage,
+    DocumentMetadata,
+    FileFormat,
+    MetadataEvent,
+    BoundaryEvent,
+    HeadingEvent,
+)
+
+# Options that attach stats, for the tests that read their counters
+STATS = ExtractionOptions(record_stats=True)
 
 
 class TestPDFExtractorInit:
@@ -182,3 +197,583 @@ class TestPDFExtractAll:
         assert isinstance(result, ExtractionResult)
         # Empty PDF is valid, should have no extraction errors
         assert result.markdown == ""
+
+
+class TestPDFFusedExtractAll:
+    """Tests for the single-pass extract_all page walk."""
+
+    @pytest.mark.parametrize("fixture", ["tmp_pdf", "tmp_multipage_pdf", "tmp_empty_pdf"])
+    def test_matches_per_stage_extraction(self, fixture, request):
+        """Test fused extract_all is identical to running each stage separately."""
+        path = request.getfixturevalue(fixture)
+        fused = PDFExtractor(path).extract_all()
+        staged = BaseExtractor.extract_all(PDFExtractor(path))
+        # Only the fused walk records stats
+        assert fused.model_dump_json(exclude={"stats"}) == staged.model_dump_json(exclude={"stats"})
+
+    def test_loads_each_page_once(self, tmp_multipage_pdf, monkeypatch):
+        """Test extract_all visits every page exactly once."""
+        extractor = PDFExtractor(tmp_multipage_pdf)
+        loads = []
+        original = extractor._doc.load_page
+
+        def counting_load_page(*args, **kwargs):
+            page = original(*args, **kwargs)
+            loads.append(page.number)
+            return page
+
+        monkeypatch.setattr(extractor._doc, "load_page", counting_load_page)
+        extractor.extract_all()
+        assert loads == list(range(6))
+
+    def test_multipage_content(self, tmp_multipage_pdf):
+        """Test extract_all finds headings, the table and every image placement."""
+        result = PDFExtractor(tmp_multipage_pdf).extract_all()
+        assert result.markdown.startswith("# Annual Filing")
+        assert "## Section 6" in result.markdown
+        assert [t.page_or_slide for t in result.tables] == [3]
+        assert [i.page_or_slide for i in result.images] == [2, 4, 6]
+        assert result.errors == []
+
+
+class TestPDFLeanText:
+    """Tests for the lean text-only parse mode."""
+
+    def test_lean_text_matches_full_parse(self, tmp_multipage_pdf):
+        """Test lean and full text flags produce the same markdown."""
+        lean = PDFExtractor(tmp_multipage_pdf, lean_text=True).extract_text()
+        full = PDFExtractor(tmp_multipage_pdf, lean_text=False).extract_text()
+        assert lean == full
+
+    def test_lean_flags_skip_image_blocks(self, tmp_pdf):
+        """Test the lean flags keep image blocks out of the text dict."""
+        page = fitz.open(tmp_pdf)[0]
+        textpage = page.get_textpage(flags=LEAN_TEXT_FLAGS)
+        blocks = page.get_text("dict", textpage=textpage)["blocks"]
+        assert blocks
+        assert all(block["type"] == 0 for block in blocks)
+
+
+class TestPDFParallelExtractAll:
+    """Tests for page-sharded extraction across worker processes."""
+
+    def test_matches_serial_result(self, tmp_multipage_pdf):
+        """Test sharded extract_all gives the same result as the serial walk."""
+        serial = PDFExtractor(tmp_multipage_pdf).extract_all()
+        sharded = PDFExtractor(tmp_multipage_pdf, workers=2).extract_all()
+        assert sharded.model_dump_json() == serial.model_dump_json()
+
+    def test_single_page_stays_serial(self, tmp_pdf):
+        """Test a one-page document is extracted without a pool."""
+        result = PDFExtractor(tmp_pdf, workers=4).extract_all()
+        assert "Test Document Title" in result.markdown
+
+    def test_rejects_zero_workers(self, tmp_pdf):
+        """Test workers below 1 raise ValueError."""
+        with pytest.raises(ValueError):
+            PDFExtractor(tmp_pdf, workers=0)
+
+    def test_shard_ranges_cover_pages_in_order(self):
+        """Test shard ranges are contiguous and cover every page."""
+        ranges = _shard_ranges(10, 4)
+        assert ranges == [(0, 3), (3, 6), (6, 8), (8, 10)]
+        assert _shard_ranges(2, 8) == [(0, 1), (1, 2)]
+
+
+class TestPDFImageMetadata:
+    """Tests for header-only image metadata and the xref cache."""
+
+    def test_matches_extract_image(self, tmp_multipage_pdf):
+        """Test header metadata agrees with a full extract_image decode."""
+        extractor = PDFExtractor(tmp_multipage_pdf)
+        doc = fitz.open(tmp_multipage_pdf)
+        for image in extractor.extract_images():
+            xref = doc[image.page_or_slide - 1].get_images(full=True)[0][0]
+            decoded = doc.extract_image(xref)
+            assert image.format == decoded["ext"]
+            assert (image.width, image.height) == (decoded["width"], decoded["height"])
+
+    def test_jpeg_image_format(self, tmp_path):
+        """Test a DCT-encoded image is reported as jpeg with its size."""
+        pixmap = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 8, 5), False)
+        pixmap.set_rect(pixmap.irect, (200, 10, 10))
+        doc = fitz.open()
+        doc.new_page().insert_image(fitz.Rect(0, 0, 80, 50), stream=pixmap.tobytes("jpeg"))
+        path = tmp_path / "jpeg.pdf"
+        doc.save(path)
+
+        images = PDFExtractor(path).extract_images()
+        assert [(i.format, i.width, i.height) for i in images] == [("jpeg", 8, 5)]
+
+    def test_repeated_image_inspected_once(self, tmp_multipage_pdf, monkeypatch):
+        """Test an image reused on several pages is looked up once and never decoded."""
+        extractor = PDFExtractor(tmp_multipage_pdf)
+        lookups = []
+        original = extractor._doc.xref_get_key
+
+        def counting_xref_get_key(xref, key):
+            lookups.append(xref)
+            return original(xref, key)
+
+        def fail_extract_image(xref):
+            raise AssertionError("image stream should not be decoded")
+
+        monkeypatch.setattr(extractor._doc, "xref_get_key", counting_xref_get_key)
+        monkeypatch.setattr(extractor._doc, "extract_image", fail_extract_image)
+        images = extractor.extract_images()
+        assert len(images) == 3
+        assert len(lookups) == 1
+
+
+class TestPDFTablePrefilter:
+    """Tests for skipping table detection on pages without ruled tables."""
+
+    def test_counts_skipped_pages(self, tmp_multipage_pdf):
+        """Test only the page with drawings reaches table detection."""
+        result = PDFExtractor(tmp_multipage_pdf, STATS).extract_all()
+        assert result.stats.table_pages_skipped == 5
+        assert [t.page_or_slide for t in result.tables] == [3]
+
+    def test_same_tables_without_prefilter(self, tmp_pdf, tmp_multipage_pdf):
+        """Test the prefilter never drops a table find_tables would return."""
+        for path in (tmp_pdf, tmp_multipage_pdf):
+            gated = PDFExtractor(path).extract_tables()
+            ungated = PDFExtractor(path, table_prefilter=False).extract_tables()
+            assert gated == ungated
+
+    def test_disabled_prefilter_skips_nothing(self, tmp_multipage_pdf):
+        """Test table_prefilter=False runs detection on every page."""
+        result = PDFExtractor(tmp_multipage_pdf, STATS, table_prefilter=False).extract_all()
+        assert result.stats.table_pages_skipped == 0
+
+    def test_setting_reaches_shard_workers(self, tmp_multipage_pdf):
+        """Test sharded walks use the extractor's prefilter setting."""
+        for table_prefilter in (True, False):
+            serial = PDFExtractor(tmp_multipage_pdf, STATS, table_prefilter=table_prefilter).extract_all()
+            sharded = PDFExtractor(
+                tmp_multipage_pdf, STATS, table_prefilter=table_prefilter, workers=2
+            ).extract_all()
+            assert sharded.stats.table_pages_skipped == serial.stats.table_pages_skipped
+
+    def test_skips_drawings_away_from_text(self, tmp_path):
+        """Test a page whose drawings do not touch any text is skipped."""
+        doc = fitz.open()
+        page = doc.new_page()
+        page.insert_text((72, 72), "Prose above a decorative rule.", fontsize=11)
+        page.draw_rect(fitz.Rect(72, 500, 300, 560), color=(0, 0, 0))
+        path = tmp_path / "rule.pdf"
+        doc.save(path)
+
+        result = PDFExtractor(path, STATS).extract_all()
+        assert result.stats.table_pages_skipped == 1
+
+
+class TestPDFOutlineHeadings:
+    """Tests for outline-driven heading detection."""
+
+    @pytest.fixture
+    def outlined_pdf(self, tmp_multipage_pdf, tmp_path):
+        """Copy of the multi-page PDF with a bookmark outline."""
+        doc = fitz.open(tmp_multipage_pdf)
+        doc.set_toc([
+            [1, "Annual Filing", 1],
+            [2, "Section 1", 1],
+            [2, "Section 2", 2],
+            [3, "Section 3", 3],
+        ])
+        path = tmp_path / "outlined.pdf"
+        doc.save(path)
+        doc.close()
+        return path
+
+    def test_levels_follow_outline(self, outlined_pdf):
+        """Test heading levels come from the outline, not font sizes."""
+        markdown = PDFExtractor(outlined_pdf, heading_mode="outline").extract_text()
+        assert "# Annual Filing" in markdown
+        assert "## Section 1" in markdown
+        assert "### Section 3" in markdown
+        # Not in the outline, so plain text despite its 14pt font
+        assert "# Section 4" not in markdown
+        assert "Section 4" in markdown
+
+    def test_falls_back_to_fonts_without_outline(self, tmp_multipage_pdf):
+        """Test a PDF without bookmarks uses font-size headings."""
+        outline = PDFExtractor(tmp_multipage_pdf, heading_mode="outline").extract_text()
+        fonts = PDFExtractor(tmp_multipage_pdf).extract_text()
+        assert outline == fonts
+
+    def test_extract_all_matches_extract_text(self, outlined_pdf):
+        """Test the fused walk applies outline headings too."""
+        extractor = PDFExtractor(outlined_pdf, heading_mode="outline")
+        assert extractor.extract_all().markdown == extractor.extract_text()
+
+    def test_rejects_unknown_mode(self, tmp_pdf):
+        """Test an unknown heading mode raises ValueError."""
+        with pytest.raises(ValueError):
+            PDFExtractor(tmp_pdf, heading_mode="magic")
+
+
+class TestPDFSampledHeadings:
+    """Tests for sampled, character-weighted heading estimation."""
+
+    def test_matches_font_mode_on_clean_document(self, tmp_multipage_pdf):
+        """Test sampled thresholds reproduce the font-size headings."""
+        sampled = PDFExtractor(tmp_multipage_pdf, heading_mode="sampled").extract_text()
+        fonts = PDFExtractor(tmp_multipage_pdf).extract_text()
+        assert sampled == fonts
+
+    def test_oversize_glyph_does_not_take_h1(self, tmp_path):
+        """Test a single large footnote mark leaves the real title at H1."""
+        doc = fitz.open()
+        page = doc.new_page()
+        page.insert_text((72, 72), "Report Title", fontsize=20)
+        page.insert_text((72, 120), "Body text of the report.", fontsize=11)
+        page.insert_text((72, 700), "*", fontsize=40)
+        path = tmp_path / "glyph.pdf"
+        doc.save(path)
+
+        markdown = PDFExtractor(path, heading_mode="sampled").extract_text()
+        assert "# Report Title" in markdown
+        assert "## Report Title" not in markdown
+
+    def test_pre_pass_reads_only_the_sample(self, tmp_multipage_pdf, monkeypatch):
+        """Test the threshold estimate loads at most heading_sample_pages pages."""
+        extractor = PDFExtractor(tmp_multipage_pdf, heading_mode="sampled", heading_sample_pages=2)
+        loads = []
+        original = extractor._doc.load_page
+
+        def counting_load_page(*args, **kwargs):
+            page = original(*args, **kwargs)
+            loads.append(page.number)
+            return page
+
+        monkeypatch.setattr(extractor._doc, "load_page", counting_load_page)
+        extractor._sampled_thresholds()
+        assert loads == [0, 5]
+
+
+class TestPDFIterExtract:
+    """Tests for page-by-page event streaming."""
+
+    @pytest.mark.parametrize("heading_mode", ["fonts", "outline", "sampled"])
+    def test_collected_events_match_extract_all(self, tmp_multipage_pdf, heading_mode):
+        """Test collecting iter_extract gives the extract_all result."""
+        extractor = PDFExtractor(tmp_multipage_pdf, heading_mode=heading_mode)
+        streamed = extractor._collect_events(extractor.iter_extract())
+        batch = PDFExtractor(tmp_multipage_pdf, heading_mode=heading_mode).extract_all()
+        assert streamed.model_dump_json(exclude={"stats"}) == batch.model_dump_json(exclude={"stats"})
+
+    def test_event_sequence(self, tmp_multipage_pdf):
+        """Test metadata comes first and every page opens with a boundary."""
+        events = list(PDFExtractor(tmp_multipage_pdf).iter_extract())
+        assert isinstance(events[0], MetadataEvent)
+        boundaries = [e.number for e in events if isinstance(e, BoundaryEvent)]
+        assert boundaries == [1, 2, 3, 4, 5, 6]
+        heading = next(e for e in events if isinstance(e, HeadingEvent))
+        assert (heading.text, heading.level, heading.page_or_slide) == ("Annual Filing", 1, 1)
+
+    def test_streams_before_reading_later_pages(self, tmp_multipage_pdf, monkeypatch):
+        """Test the first page's events arrive before later pages are loaded."""
+        extractor = PDFExtractor(tmp_multipage_pdf, heading_mode="sampled", heading_sample_pages=1)
+        loads = []
+        original = extractor._doc.load_page
+
+        def counting_load_page(*args, **kwargs):
+            page = original(*args, **kwargs)
+            loads.append(page.number)
+            return page
+
+        monkeypatch.setattr(extractor._doc, "load_page", counting_load_page)
+        events = extractor.iter_extract()
+        while not isinstance(next(events), BoundaryEvent):
+            pass
+        # Sample pre-pass (page 0) plus the first content page
+        assert loads == [0, 0]
+
+
+class TestPDFPageCache:
+    """Tests for reusing unchanged pages across documents."""
+
+    def test_second_extraction_reuses_every_page(self, tmp_multipage_pdf, tmp_path):
+        """Test a repeated document is rebuilt entirely from cached pages."""
+        cache = PageCache(tmp_path / "pages")
+        first = PDFExtractor(tmp_multipage_pdf, STATS, page_cache=cache).extract_all()
+        second = PDFExtractor(tmp_multipage_pdf, STATS, page_cache=cache).extract_all()
+        assert first.stats.pages_from_cache == 0
+        assert second.stats.pages_from_cache == 6
+        assert second.model_dump_json(exclude={"stats"}) == first.model_dump_json(exclude={"stats"})
+
+    def test_revision_reparses_only_changed_page(self, tmp_multipage_pdf, tmp_path):
+        """Test a new revision with one edited page reuses the rest."""
+        cache = PageCache(tmp_path / "pages")
+        PDFExtractor(tmp_multipage_pdf, page_cache=cache).extract_all()
+
+        doc = fitz.open(tmp_multipage_pdf)
+        doc[1].insert_text((72, 600), "Added in revision 2.", fontsize=11)
+        revision = tmp_path / "multipage_v2.pdf"
+        # garbage=4 renumbers objects, as a re-export from an editor would
+        doc.save(revision, garbage=4)
+        doc.close()
+
+        result = PDFExtractor(revision, STATS, page_cache=cache).extract_all()
+        uncached = PDFExtractor(revision).extract_all()
+        assert result.stats.pages_from_cache == 5
+        assert "Added in revision 2." in result.markdown
+        assert result.model_dump_json(exclude={"stats"}) == uncached.model_dump_json(exclude={"stats"})
+
+    def test_cached_pages_get_new_page_numbers(self, tmp_multipage_pdf, tmp_path):
+        """Test cached tables and images are renumbered for their new position."""
+        cache = PageCache(tmp_path / "pages")
+        PDFExtractor(tmp_multipage_pdf, page_cache=cache).extract_all()
+
+        doc = fitz.open(tmp_multipage_pdf)
+        doc.select([2, 3])  # Old pages 3 and 4 become pages 1 and 2
+        subset = tmp_path / "subset.pdf"
+        doc.save(subset)
+        doc.close()
+
+        result = PDFExtractor(subset, STATS, page_cache=cache).extract_all()
+        assert result.stats.pages_from_cache == 2
+        assert [t.page_or_slide for t in result.tables] == [1]
+        assert [i.filename for i in result.images] == ["image_p2_i0.png"]
+
+    def test_streaming_uses_page_cache(self, tmp_multipage_pdf, tmp_path):
+        """Test iter_extract reads through the same page cache."""
+        cache = PageCache(tmp_path / "pages")
+        PDFExtractor(tmp_multipage_pdf, page_cache=cache).extract_all()
+        extractor = PDFExtractor(tmp_multipage_pdf, page_cache=cache)
+        streamed = extractor._collect_events(extractor.iter_extract())
+        assert "## Section 6" in streamed.markdown
+        assert cache.hits == 6
+
+    def test_key_ignores_linked_pages(self, tmp_path):
+        """Test editing a link target leaves the linking page's key alone."""
+        doc = fitz.open()
+        for page_num in range(1, 4):
+            page = doc.new_page()
+            page.insert_text((72, 72), f"Page {page_num} body text.", fontsize=11)
+        doc[0].insert_link({"kind": fitz.LINK_GOTO, "from": fitz.Rect(72, 60, 200, 80), "page": 2})
+        original = tmp_path / "links.pdf"
+        doc.save(original)
+        doc[2].insert_text((72, 120), "Edited.", fontsize=11)
+        edited = tmp_path / "links_v2.pdf"
+        doc.save(edited, garbage=4)
+        doc.close()
+
+        def keys(path):
+            with PDFExtractor(path) as extractor:
+                return [extractor._page_cache_key(page) for page in extractor._doc]
+
+        before, after = keys(original), keys(edited)
+        assert [a == b for a, b in zip(before, after)] == [True, True, False]
+
+    def test_long_link_chain_is_keyed(self, tmp_path):
+        """Test every page of a long chain of page links gets a key."""
+        doc = fitz.open()
+        for page_num in range(1200):
+            page = doc.new_page()
+            page.insert_text((72, 72), f"Page {page_num + 1}", fontsize=11)
+            if page_num:
+                doc[page_num - 1].insert_link(
+                    {"kind": fitz.LINK_GOTO, "from": fitz.Rect(72, 60, 200, 80), "page": page_num}
+                )
+        path = tmp_path / "chain.pdf"
+        doc.save(path)
+        doc.close()
+
+        with PDFExtractor(path) as extractor:
+            assert all(extractor._page_cache_key(page) for page in extractor._doc)
+
+    def test_key_independent_of_page_range(self, tmp_multipage_pdf):
+        """Test a page's key does not depend on which pages were keyed first."""
+        with PDFExtractor(tmp_multipage_pdf) as extractor:
+            forward = [extractor._page_cache_key(page) for page in extractor._doc]
+        with PDFExtractor(tmp_multipage_pdf) as extractor:
+            backward = [extractor._page_cache_key(extractor._doc[i]) for i in reversed(range(6))]
+        assert forward == backward[::-1]
+
+    def test_unkeyable_page_is_logged(self, tmp_multipage_pdf, monkeypatch):
+        """Test a page that cannot be fingerprinted is reported, not skipped silently."""
+        from src.extractors import pdf_extractor
+
+        def broken_stream(xref):
+            raise ValueError("bad xref")
+
+        warnings = []
+        monkeypatch.setattr(pdf_extractor.logger, "warning", lambda *args: warnings.append(args))
+        with PDFExtractor(tmp_multipage_pdf) as extractor:
+            page = extractor._doc[0]
+            monkeypatch.setattr(extractor._doc, "xref_stream_raw", broken_stream)
+            assert extractor._page_cache_key(page) is None
+        assert warnings and warnings[0][1] == 1
+
+    def test_full_cache_does_not_rescan_per_page(self, tmp_multipage_pdf, tmp_path, monkeypatch):
+        """Test page writes to a full cache evict from the index, not by rescanning."""
+        cache = PageCache(tmp_path / "pages")
+        PDFExtractor(tmp_multipage_pdf, page_cache=cache).extract_all()
+        cache.max_bytes = 4 * sum(p.stat().st_size for p in cache.directory.glob("*.json"))
+        scans = []
+        scan = cache._scan
+        monkeypatch.setattr(cache, "_scan", lambda: scans.append(1) or scan())
+
+        for revision_num in range(2, 7):
+            doc = fitz.open(tmp_multipage_pdf)
+            for page in doc:
+                page.insert_text((72, 700), f"Revision {revision_num}.", fontsize=11)
+            revision = tmp_path / f"multipage_v{revision_num}.pdf"
+            doc.save(revision)
+            doc.close()
+            assert PDFExtractor(revision, STATS, page_cache=cache).extract_all().stats.pages_from_cache == 0
+
+        # 30 page writes of about 1/24 of the limit each: at most one scan per
+        # quarter of the limit written, rather than one per page over it
+        assert 1 <= len(scans) <= 1 + 30 // 6
+        assert sum(p.stat().st_size for p in cache.directory.glob("*.json")) <= cache.max_bytes
+
+class TestPDFExtractionOptions:
+    """Tests for stage, page range and limit selection."""
+
+    def test_text_only_skips_other_stages(self, tmp_multipage_pdf, monkeypatch):
+        """Test unselected stages are never read."""
+        options = ExtractionOptions(stages={ExtractionStage.TEXT})
+        extractor = PDFExtractor(tmp_multipage_pdf, options)
+
+        def unexpected(*args, **kwargs):
+            raise AssertionError("unselected stage was read")
+
+        monkeypatch.setattr(extractor, "_read_tables", unexpected)
+        monkeypatch.setattr(extractor, "_read_images", unexpected)
+        monkeypatch.setattr(extractor, "extract_metadata", unexpected)
+        result = extractor.extract_all()
+        assert "## Section 6" in result.markdown
+        assert result.tables == [] and result.images == [] and result.errors == []
+        assert result.metadata.file_format == FileFormat.PDF
+        assert result.metadata.page_count is None
+
+    def test_page_range_limits_pages(self, tmp_multipage_pdf):
+        """Test only pages inside the range are extracted."""
+        options = ExtractionOptions(page_range=(3, 4))
+        result = PDFExtractor(tmp_multipage_pdf, options).extract_all()
+        assert "Section 3" in result.markdown and "Section 4" in result.markdown
+        assert "Section 2" not in result.markdown and "Section 5" not in result.markdown
+        assert [t.page_or_slide for t in result.tables] == [3]
+        assert [i.page_or_slide for i in result.images] == [4]
+        assert result.metadata.page_count == 6
+
+    def test_image_limit_stops_early(self, tmp_multipage_pdf, monkeypatch):
+        """Test pages after the image limit are not inspected for images."""
+        extractor = PDFExtractor(tmp_multipage_pdf, ExtractionOptions(max_images=1))
+        pages_read = []
+        read_images = extractor._read_images
+
+        def counting(page, page_num, limit=None):
+            pages_read.append(page_num)
+            return read_images(page, page_num, limit)
+
+        monkeypatch.setattr(extractor, "_read_images", counting)
+        result = extractor.extract_all()
+        assert [i.page_or_slide for i in result.images] == [2]
+        assert pages_read == [1, 2]
+
+    def test_streaming_honours_options(self, tmp_multipage_pdf):
+        """Test iter_extract emits only the selected pages and stages."""
+        options = ExtractionOptions(
+            stages={ExtractionStage.TABLES}, page_range=(2, 3), max_tables=1
+        )
+        events = list(PDFExtractor(tmp_multipage_pdf, options).iter_extract())
+        assert [e.type for e in events] == ["boundary", "boundary", "table"]
+
+    def test_parallel_matches_serial(self, tmp_multipage_pdf):
+        """Test sharded walks honour the page range and limits."""
+        options = ExtractionOptions(page_range=(2, 6), max_images=2)
+        serial = PDFExtractor(tmp_multipage_pdf, options).extract_all()
+        parallel = PDFExtractor(tmp_multipage_pdf, options, workers=2).extract_all()
+        assert parallel.model_dump() == serial.model_dump()
+        assert len(serial.images) == 2
+
+
+class TestPDFClose:
+    """Tests for releasing PDF resources."""
+
+    def test_context_manager_closes_document(self, tmp_pdf):
+        """Test the PyMuPDF document is closed on leaving the with block."""
+        with PDFExtractor(tmp_pdf) as extractor:
+            extractor.extract_all()
+        assert extractor._doc.is_closed
+
+    def test_close_is_idempotent(self, tmp_pdf):
+        """Test closing twice is harmless."""
+        extractor = PDFExtractor(tmp_pdf)
+        extractor.close()
+        extractor.close()
+
+    def test_close_keeps_mupdf_store(self, tmp_pdf, monkeypatch):
+        """Test closing one document leaves the store other documents share."""
+        shrinks = []
+        monkeypatch.setattr(fitz.TOOLS, "store_shrink", shrinks.append)
+        with PDFExtractor(tmp_pdf) as other, PDFExtractor(tmp_pdf) as extractor:
+            extractor.extract_all()
+            extractor.close()
+            assert shrinks == []
+            assert other.extract_text()
+
+    def test_shrink_store(self, monkeypatch):
+        """Test shrink_store() empties MuPDF's store."""
+        shrinks = []
+        monkeypatch.setattr(fitz.TOOLS, "store_shrink", shrinks.append)
+        shrink_store()
+        assert shrinks == [100]
+
+
+class TestPDFStats:
+    """Tests for per-stage and per-page statistics."""
+
+    def test_not_recorded_by_default(self, tmp_multipage_pdf):
+        """Test no stats are attached without record_stats."""
+        assert PDFExtractor(tmp_multipage_pdf).extract_all().stats is None
+
+    def test_counts_and_timings(self, tmp_multipage_pdf):
+        """Test pages, blocks, spans and stage timings are recorded."""
+        options = ExtractionOptions(record_stats=True)
+        result = PDFExtractor(tmp_multipage_pdf, options).extract_all()
+        stats = result.stats
+
+        assert stats.pages_processed == 6
+        assert [t.page for t in stats.page_timings] == [1, 2, 3, 4, 5, 6]
+        assert set(stats.stages) == set(ExtractionStage)
+        assert stats.text_blocks >= 6 and stats.text_spans >= stats.text_blocks
+        assert stats.tables_found == len(result.tables)
+        assert stats.images_found == len(result.images)
+        assert sum(t.wall_seconds for t in stats.page_timings) <= stats.wall_seconds
+        assert stats.bytes_read is None or stats.bytes_read >= 0
+
+    def test_content_unchanged(self, tmp_multipage_pdf):
+        """Test recording stats does not change the extracted content."""
+        options = ExtractionOptions(record_stats=True)
+        recorded = PDFExtractor(tmp_multipage_pdf, options).extract_all()
+        plain = PDFExtractor(tmp_multipage_pdf).extract_all()
+        assert recorded.model_dump(exclude={"stats"}) == plain.model_dump(exclude={"stats"})
+
+    def test_page_range_times_selected_pages(self, tmp_multipage_pdf):
+        """Test only the selected pages are timed."""
+        options = ExtractionOptions(record_stats=True, page_range=(2, 3))
+        stats = PDFExtractor(tmp_multipage_pdf, options).extract_all().stats
+        assert [t.page for t in stats.page_timings] == [2, 3]
+        assert stats.pages_processed == 2
+
+    def test_sharded_walk_keeps_page_timings(self, tmp_multipage_pdf):
+        """Test shards walked in workers report every page's timing."""
+        options = ExtractionOptions(record_stats=True)
+        stats = PDFExtractor(tmp_multipage_pdf, options, workers=2).extract_all().stats
+        assert [t.page for t in stats.page_timings] == [1, 2, 3, 4, 5, 6]
+        assert stats.text_spans == PDFExtractor(tmp_multipage_pdf, options).extract_all().stats.text_spans
+
+    def test_cached_pages_are_not_parsed(self, tmp_multipage_pdf, tmp_path):
+        """Test pages from the page cache count as processed but parse no spans."""
+        cache = PageCache(tmp_path / "pages")
+        options = ExtractionOptions(record_stats=True)
+        PDFExtractor(tmp_multipage_pdf, options, page_cache=cache).extract_all()
+        stats = PDFExtractor(tmp_multipage_pdf, options, page_cache=cache).extract_all().stats
+        assert stats.pages_processed == 6 and stats.pages_from_cache == 6
+        assert stats.text_spans == 0
+        assert len(stats.page_timings) == 6
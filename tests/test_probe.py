@@ -0,0 +1,74 @@
+"""
+Tests for metadata probes.
+"""
+
+import fitz  # pymupdf
+import pytest
+
+from src.extractors import DOCXExtractor, PDFExtractor
+from src.models import FileFormat
+from src.probe import probe_document
+from src.router import DocumentRouter
+
+
+class TestProbePDF:
+    """Tests for PDF probing."""
+
+    def test_matches_extract_metadata(self, tmp_path):
+        """Test the probe returns the same metadata as the extractor."""
+        path = tmp_path / "info.pdf"
+        doc = fitz.open()
+        for _ in range(3):
+            doc.new_page()
+        doc.set_metadata({
+            "title": "Annual Report",
+            "author": "Finance",
+            "creationDate": "D:20240115120000",
+        })
+        doc.save(path)
+        doc.close()
+
+        probed = DocumentRouter().probe(path)
+        assert probed == PDFExtractor(path).extract_metadata()
+        assert probed.page_count == 3
+        assert probed.title == "Annual Report"
+
+
+class TestProbeOOXML:
+    """Tests for DOCX, PPTX and XLSX probing."""
+
+    def test_docx_matches_core_properties(self, tmp_docx):
+        """Test title, author and dates match python-docx's reading."""
+        probed = DocumentRouter().probe(tmp_docx)
+        extracted = DOCXExtractor(tmp_docx).extract_metadata()
+        assert probed.model_dump(exclude={"page_count"}) == extracted.model_dump(exclude={"page_count"})
+        assert probed.page_count == 1  # Recorded in docProps/app.xml
+
+    def test_pptx_counts_slides(self, tmp_pptx):
+        """Test slides are counted from the presentation part."""
+        probed = DocumentRouter().probe(tmp_pptx)
+        assert probed.file_format == FileFormat.PPTX
+        assert probed.page_count == 1
+
+    def test_xlsx_counts_sheets(self, tmp_xlsx):
+        """Test sheets are counted from the workbook part."""
+        probed = DocumentRouter().probe(tmp_xlsx)
+        assert probed.file_format == FileFormat.XLSX
+        assert probed.page_count == 1
+        assert probed.author == "openpyxl"
+
+    def test_does_not_parse_document_body(self, tmp_docx, monkeypatch):
+        """Test probing never constructs a python-docx Document."""
+        import src.extractors.docx_extractor as docx_module
+
+        def fail(*args, **kwargs):
+            raise AssertionError("document body was parsed")
+
+        monkeypatch.setattr(docx_module, "Document", fail)
+        assert DocumentRouter().probe(tmp_docx).file_format == FileFormat.DOCX
+
+    def test_unknown_format_is_rejected(self, tmp_pdf):
+        """Test formats without a probe raise ValueError."""
+        with pytest.raises(ValueError, match="Cannot probe"):
+            probe_document(tmp_pdf, FileFormat.UNKNOWN)
+
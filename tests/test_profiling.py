@@ -0,0 +1,129 @@
+"""
+Tests for the per-stage profiler.
+"""
+
+import pstats
+
+import pytest
+
+from src import tracing
+from src.profiling import OTHER, StageProfiler, library_of
+from src.router import DocumentRouter
+
+
+def stage_functions(profiler, stage):
+    """Names of the functions profiled under a stage."""
+    return {function for _, _, function in profiler.stats(stage).stats}
+
+
+class TestStageProfiler:
+    """Tests for StageProfiler."""
+
+    def test_installs_and_restores_tracer(self):
+        """Test the profiler is the tracer only inside its with block."""
+        with StageProfiler() as profiler:
+            assert tracing.get_tracer() is profiler
+        assert tracing.get_tracer() is None
+
+    def test_work_charged_to_stage(self):
+        """Test functions run in a stage span are profiled under that stage."""
+        def inside():
+            return sum(range(100))
+
+        def outside():
+            return sum(range(100))
+
+        with StageProfiler() as profiler:
+            with tracing.span("tables"):
+                with tracing.span("page", page=1):
+                    inside()
+            outside()
+        assert "inside" in stage_functions(profiler, "tables")
+        assert "outside" not in stage_functions(profiler, "tables")
+        assert "outside" in stage_functions(profiler, OTHER)
+
+    def test_nested_stages_restore_parent(self):
+        """Test the enclosing stage resumes when a nested stage ends."""
+        def after_table():
+            return 1
+
+        with StageProfiler() as profiler:
+            with tracing.span("body"):
+                with tracing.span("tables"):
+                    pass
+                after_table()
+        assert "after_table" in stage_functions(profiler, "body")
+
+    def test_pdf_stages(self, tmp_pdf):
+        """Test a PDF extraction is split into its stages."""
+        with StageProfiler() as profiler:
+            DocumentRouter().process_document(tmp_pdf)
+        assert {"text", "tables", "images", "metadata", OTHER} <= set(profiler.profiles)
+
+    def test_docx_body(self, tmp_docx):
+        """Test a DOCX body walk is profiled as the body stage."""
+        with StageProfiler() as profiler:
+            DocumentRouter().process_document(tmp_docx)
+        assert "body" in profiler.profiles
+
+    def test_samples_collapsed_stacks(self):
+        """Test the sampler records stacks of the profiled thread per stage."""
+        def busy():
+            total = 0
+            for i in range(2_000_000):
+                total += i
+            return total
+
+        with StageProfiler(sample_interval=0.0005) as profiler:
+            with tracing.span("text"):
+                busy()
+        stacks = profiler.samples["text"]
+        assert stacks
+        assert any(stack.endswith("busy (test_profiling.py)") for stack in stacks)
+
+    def test_write(self, tmp_pdf, tmp_path):
+        """Test write() saves loadable pstats and collapsed stacks per stage."""
+        with StageProfiler() as profiler:
+            DocumentRouter().process_document(tmp_pdf)
+        written = profiler.write(tmp_path / "profile")
+        assert tmp_path / "profile" / "all.pstats" in written
+        for stage in profiler.profiles:
+            assert pstats.Stats(str(tmp_path / "profile" / f"{stage}.pstats")).total_tt >= 0
+            for line in (tmp_path / "profile" / f"{stage}.collapsed").read_text().splitlines():
+                stack, count = line.rsplit(" ", 1)
+                assert stack and int(count) > 0
+
+    def test_report(self, tmp_pdf):
+        """Test the report has a section per stage with library shares."""
+        with StageProfiler() as profiler:
+            DocumentRouter().process_document(tmp_pdf)
+        report = profiler.report(top=3)
+        assert "== tables:" in report
+        assert "[PyMuPDF]" in report
+        assert report.count("by library:") == len(profiler.profiles)
+
+
+class TestLibraryOf:
+    """Tests for library_of()."""
+
+    @pytest.mark.parametrize(
+        ("filename", "function", "library"),
+        [
+            ("/venv/site-packages/pymupdf/table.py", "make_chars", "PyMuPDF"),
+            ("~", "<built-in method pymupdf._extra.page_get_textpage>", "PyMuPDF"),
+            ("/venv/site-packages/docx/oxml/xmlchemy.py", "xpath", "python-docx"),
+            ("/venv/site-packages/pydantic/main.py", "model_dump", "pydantic"),
+            ("~", "<method 'xpath' of 'lxml.etree._Element' objects>", "lxml"),
+            ("~", "<built-in method builtins.len>", "stdlib"),
+            ("/somewhere/else.py", "f", "other"),
+        ],
+    )
+    def test_known_libraries(self, filename, function, library):
+        """Test functions are attributed by their file or built-in name."""
+        assert library_of(filename, function) == library
+
+    def test_own_modules(self):
+        """Test functions of this package are attributed to it."""
+        import src.router
+
+        assert library_of(src.router.__file__, "process_document") == "document-extractor"
@@ -2,11 +2,16 @@
 Tests for DocumentRouter.
 """
 
+import io
+import os
+
 import pytest
 
+from src.cache import ResultCache
 from src.router import DocumentRouter, process_document
+from src.sandbox import resident_bytes
 from src.extractors import PDFExtractor, DOCXExtractor, PPTXExtractor, XLSXExtractor
-from src.models import ExtractionResult
+from src.models import ExtractionOptions, ExtractionResult, ExtractionStage, WorkerRecycling
 
 
 class TestDocumentRouter:
@@ -111,6 +116,253 @@ class TestDocumentRouter:
         assert len(result.errors) > 0
         assert "not yet implemented" in result.errors[0].lower()
 
+    @pytest.mark.parametrize("fixture", ["tmp_pptx", "tmp_xlsx"])
+    def test_stub_extractors_stream_their_result(self, fixture, request):
+        """Test a stub's streamed events collect to its extract_all() result."""
+        extractor = DocumentRouter().get_extractor(request.getfixturevalue(fixture))
+        result = extractor.extract_all()
+        assert extractor._collect_events(extractor.iter_extract()) == result
+        assert result.metadata.file_format == extractor.file_format
+        assert len(result.errors) == 1
+
+    def test_get_extractor_passes_options(self, tmp_docx):
+        """Test get_extractor hands the options to the extractor."""
+        options = ExtractionOptions(max_images=0)
+        assert DocumentRouter().get_extractor(tmp_docx, options).options is options
+
+    def test_process_document_with_options(self, tmp_pdf):
+        """Test process_document runs only the selected stages."""
+        options = ExtractionOptions(stages={ExtractionStage.METADATA})
+        result = DocumentRouter().process_document(tmp_pdf, options)
+        assert result.markdown == ""
+        assert result.metadata.page_count is not None
+
+
+class TestFormatSniffing:
+    """Tests for content-based extractor selection."""
+
+    def test_misnamed_docx_routes_to_docx(self, tmp_docx, tmp_path):
+        """Test a DOCX saved as .pdf is still read as a DOCX."""
+        misnamed = tmp_path / "actually_word.pdf"
+        misnamed.write_bytes(tmp_docx.read_bytes())
+        router = DocumentRouter()
+        assert isinstance(router.get_extractor(misnamed), DOCXExtractor)
+        result = router.process_document(misnamed)
+        assert result.errors == []
+        assert result.metadata.source_filename == "actually_word.pdf"
+
+    def test_misnamed_pdf_routes_to_pdf(self, tmp_pdf, tmp_path):
+        """Test a PDF saved as .xlsx is read as a PDF."""
+        misnamed = tmp_path / "export.xlsx"
+        misnamed.write_bytes(tmp_pdf.read_bytes())
+        assert isinstance(DocumentRouter().get_extractor(misnamed), PDFExtractor)
+
+    def test_sniffing_can_be_disabled(self, tmp_docx, tmp_path):
+        """Test sniff=False dispatches on the extension alone."""
+        misnamed = tmp_path / "actually_word.pptx"
+        misnamed.write_bytes(tmp_docx.read_bytes())
+        assert isinstance(DocumentRouter(sniff=False).get_extractor(misnamed), PPTXExtractor)
+
+
+class TestInMemoryDocuments:
+    """Tests for routing documents held in memory."""
+
+    def test_pdf_bytes_match_file(self, tmp_pdf):
+        """Test extracting PDF bytes gives the same result as the file."""
+        router = DocumentRouter()
+        from_bytes = router.process_document(tmp_pdf.read_bytes(), filename="test.pdf")
+        assert from_bytes.model_dump() == router.process_document(tmp_pdf).model_dump()
+
+    def test_docx_file_object(self, tmp_docx):
+        """Test a DOCX can be extracted from a BytesIO."""
+        result = DocumentRouter().process_document(
+            io.BytesIO(tmp_docx.read_bytes()), filename="upload.docx"
+        )
+        assert "Section One" in result.markdown
+        assert result.metadata.source_filename == "upload.docx"
+        assert result.metadata.file_size_bytes == tmp_docx.stat().st_size
+
+    def test_memoryview_gets_pdf_extractor(self, tmp_pdf):
+        """Test get_extractor picks the extractor from the filename."""
+        extractor = DocumentRouter().get_extractor(
+            memoryview(tmp_pdf.read_bytes()), filename="scan.PDF"
+        )
+        assert isinstance(extractor, PDFExtractor)
+        assert extractor.file_path is None
+
+    def test_unnamed_buffer_is_sniffed(self, tmp_docx):
+        """Test a buffer without a filename is routed by its content."""
+        extractor = DocumentRouter().get_extractor(tmp_docx.read_bytes())
+        assert isinstance(extractor, DOCXExtractor)
+
+    def test_unrecognised_unnamed_buffer_is_rejected(self):
+        """Test an unnamed buffer of unknown content cannot be routed."""
+        with pytest.raises(ValueError, match="pass a filename"):
+            DocumentRouter().process_document(b"plain text")
+
+    def test_probe_bytes(self, tmp_pptx):
+        """Test in-memory documents can be probed."""
+        meta = DocumentRouter().probe(tmp_pptx.read_bytes(), filename="deck.pptx")
+        assert meta.page_count == 1
+        assert meta.source_filename == "deck.pptx"
+
+
+class TestProcessMany:
+    """Tests for DocumentRouter.process_many()."""
+
+    def test_worker_empties_mupdf_store_after_each_document(self, tmp_pdf, monkeypatch):
+        """Test batch workers, which hold one document at a time, release MuPDF's store."""
+        import fitz
+        from src import router as router_module
+
+        shrinks = []
+        monkeypatch.setattr(fitz.TOOLS, "store_shrink", shrinks.append)
+        monkeypatch.setattr(router_module, "_batch_router", DocumentRouter(), raising=False)
+        result, pid, _ = router_module._process_in_worker(tmp_pdf, None)
+        assert result.markdown and pid == os.getpid()
+        assert shrinks == [100]
+
+    def test_yields_every_path(self, tmp_pdf, tmp_docx, tmp_xlsx):
+        """Test each path is yielded once with its own result."""
+        paths = [tmp_pdf, tmp_docx, tmp_xlsx]
+        results = dict(DocumentRouter().process_many(paths, workers=2))
+        assert set(results) == set(paths)
+        for path in paths:
+            assert results[path].metadata.source_filename == path.name
+
+    def test_results_match_process_document(self, tmp_pdf):
+        """Test a worker extracts exactly what process_document() does."""
+        router = DocumentRouter()
+        [(_, result)] = router.process_many([tmp_pdf], workers=2)
+        assert result == router.process_document(tmp_pdf)
+
+    def test_ordered_keeps_input_order(self, tmp_pdf, tmp_docx, tmp_multipage_pdf):
+        """Test ordered=True yields results in input order."""
+        paths = [tmp_multipage_pdf, tmp_docx, tmp_pdf] * 3
+        yielded = [path for path, _ in DocumentRouter().process_many(paths, workers=3, ordered=True)]
+        assert yielded == paths
+
+    def test_failures_are_isolated(self, tmp_pdf, tmp_path):
+        """Test a corrupt or missing file yields an error result, not an exception."""
+        corrupt = tmp_path / "corrupt.pdf"
+        corrupt.write_bytes(b"%PDF-1.7 this is not a pdf")
+        missing = tmp_path / "missing.docx"
+        results = dict(DocumentRouter().process_many([corrupt, tmp_pdf, missing], workers=2))
+
+        assert results[tmp_pdf].errors == []
+        for path in (corrupt, missing):
+            assert results[path].errors[0].startswith("Document extraction failed:")
+            assert results[path].metadata.source_filename == path.name
+        assert "File not found" in results[missing].errors[0]
+
+    def test_single_worker_runs_in_process(self, tmp_pdf, tmp_path):
+        """Test workers=1 processes files here, with the same error isolation."""
+        bad = tmp_path / "notes.txt"
+        bad.write_text("plain text")
+        results = list(DocumentRouter().process_many([tmp_pdf, bad], workers=1))
+        assert [path for path, _ in results] == [tmp_pdf, bad]
+        assert "Unsupported format" in results[1][1].errors[0]
+
+    def test_bounded_in_flight(self, tmp_pdf):
+        """Test paths are pulled from the iterable only as results are consumed."""
+        pulled = []
+
+        def paths():
+            for i in range(20):
+                pulled.append(i)
+                yield tmp_pdf
+
+        batch = DocumentRouter().process_many(paths(), workers=2, max_in_flight=3)
+        next(batch)
+        # Three submitted up front, one more to replace the first result
+        assert len(pulled) == 4
+        assert len(list(batch)) == 19
+
+    def test_invalid_worker_count(self, tmp_pdf):
+        """Test workers below 1 are rejected before anything runs."""
+        with pytest.raises(ValueError):
+            DocumentRouter().process_many([tmp_pdf], workers=0)
+
+    def test_uses_shared_cache(self, tmp_pdf, tmp_path):
+        """Test workers write to the router's cache directory."""
+        cache = ResultCache(tmp_path / "cache")
+        router = DocumentRouter(cache=cache)
+        list(router.process_many([tmp_pdf], workers=2))
+        assert router.process_document(tmp_pdf).metadata.source_filename == tmp_pdf.name
+        assert cache.hits == 1
+
+    def count_pools(self, router, monkeypatch) -> list:
+        """Record every worker pool the router starts."""
+        pools = []
+        start_pool = router._batch_pool
+
+        def recording_pool(workers):
+            pools.append(start_pool(workers))
+            return pools[-1]
+
+        monkeypatch.setattr(router, "_batch_pool", recording_pool)
+        return pools
+
+    def test_recycles_after_max_documents(self, tmp_pdf, tmp_docx, monkeypatch):
+        """Test workers are replaced once one reaches its document limit."""
+        router = DocumentRouter()
+        pools = self.count_pools(router, monkeypatch)
+        paths = [tmp_pdf, tmp_docx] * 4
+        results = list(router.process_many(paths, workers=2, recycle=WorkerRecycling(max_documents=2)))
+
+        assert len(results) == 8
+        assert all(result.errors == [] for _, result in results)
+        assert len(pools) > 1
+
+    def test_recycles_above_memory_limit(self, tmp_pdf, monkeypatch):
+        """Test workers are replaced once one holds more than the RSS limit."""
+        router = DocumentRouter()
+        pools = self.count_pools(router, monkeypatch)
+        recycle = WorkerRecycling(max_rss_bytes=1)
+        results = list(router.process_many([tmp_pdf] * 4, workers=2, recycle=recycle))
+
+        assert all(result.errors == [] for _, result in results)
+        assert len(pools) > 1
+
+    def test_no_recycling_by_default(self, tmp_pdf, monkeypatch):
+        """Test one pool serves the whole batch without a policy."""
+        router = DocumentRouter()
+        pools = self.count_pools(router, monkeypatch)
+        list(router.process_many([tmp_pdf] * 6, workers=2))
+        assert len(pools) == 1
+
+
+class TestResourceLifecycle:
+    """Tests for releasing extractor resources."""
+
+    def test_process_document_closes_extractor(self, tmp_pdf, monkeypatch):
+        """Test the extractor is closed once its result is built."""
+        closed = []
+        close = PDFExtractor.close
+        monkeypatch.setattr(PDFExtractor, "close", lambda self: closed.append(close(self)))
+        DocumentRouter().process_document(tmp_pdf)
+        assert len(closed) == 1
+
+    def test_soak_memory_stays_flat(self, tmp_pdf, tmp_docx):
+        """Test repeated extractions leak neither file descriptors nor memory.
+
+        A short in-suite version of benchmarks/bench_soak.py.
+        """
+        router = DocumentRouter()
+        for _ in range(20):  # warm up caches and allocator pools
+            router.process_document(tmp_pdf)
+            router.process_document(tmp_docx)
+        fds = len(os.listdir("/proc/self/fd"))
+        rss = resident_bytes(os.getpid())
+        for _ in range(60):
+            router.process_document(tmp_pdf)
+            router.process_document(tmp_docx)
+
+        assert len(os.listdir("/proc/self/fd")) == fds
+        # The allocator may keep one step of freed heap (tens of MB);
+        # a leak of even 1 MB per document would exceed this
+        assert resident_bytes(os.getpid()) - rss < 64 << 20
+
 
 class TestProcessDocument:
     """Tests for process_document convenience function."""
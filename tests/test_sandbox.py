@@ -0,0 +1,169 @@
+"""
+Tests for sandboxed extraction.
+"""
+
+import faulthandler
+import os
+import signal
+import time
+
+import pytest
+
+from src.cache import ResultCache
+from src.extractors import PDFExtractor
+from src.models import FileFormat, SandboxLimits
+from src.router import DocumentRouter
+from src.sandbox import run_sandboxed, was_stopped
+from src.source import DocumentSource
+
+
+class StallingExtractor(PDFExtractor):
+    """PDF extractor that hangs after streaming its first page."""
+
+    def iter_extract(self):
+        for event in super().iter_extract():
+            yield event
+            if event.type == "paragraph":
+                time.sleep(60)
+
+
+class BloatingExtractor(PDFExtractor):
+    """PDF extractor that grows its memory 10 MB at a time after the metadata."""
+
+    def iter_extract(self):
+        events = super().iter_extract()
+        yield next(events)
+        hoard = []
+        while True:
+            hoard.append(bytearray(10 << 20))
+            time.sleep(0.005)
+
+
+class GreedyExtractor(PDFExtractor):
+    """PDF extractor that makes one huge allocation after the metadata."""
+
+    def iter_extract(self):
+        events = super().iter_extract()
+        yield next(events)
+        bytearray(64 << 30)
+
+
+class CrashingExtractor(PDFExtractor):
+    """PDF extractor whose process dies with a segfault after the metadata."""
+
+    def iter_extract(self):
+        events = super().iter_extract()
+        yield next(events)
+        faulthandler.disable()  # keep pytest's inherited handler quiet
+        os.kill(os.getpid(), signal.SIGSEGV)
+
+
+def sandboxed(extractor_class, path, **limits):
+    """Run an extractor class on a file in the sandbox."""
+    return run_sandboxed(extractor_class, DocumentSource.from_input(path), None, SandboxLimits(**limits))
+
+
+class TestRunSandboxed:
+    """Tests for run_sandboxed function."""
+
+    def test_matches_in_process_extraction(self, tmp_pdf):
+        """Test a document within its limits extracts as it does in-process."""
+        result = sandboxed(PDFExtractor, tmp_pdf, timeout_seconds=30, max_memory_bytes=1 << 30)
+        expected = PDFExtractor(tmp_pdf).extract_all()
+
+        assert result.markdown == expected.markdown
+        assert result.tables == expected.tables
+        assert result.images == expected.images
+        assert result.metadata == expected.metadata
+        assert result.errors == []
+        assert not was_stopped(result)
+
+    def test_timeout_keeps_partial_content(self, tmp_multipage_pdf):
+        """Test a stalled child is killed and earlier content is returned."""
+        started = time.monotonic()
+        result = sandboxed(StallingExtractor, tmp_multipage_pdf, timeout_seconds=1)
+
+        assert time.monotonic() - started < 10
+        assert result.errors == ["Extraction stopped: timed out after 1s"]
+        assert was_stopped(result)
+        assert result.markdown  # the first page made it out
+        assert result.metadata.page_count == 6
+
+    def test_resident_memory_limit(self, tmp_pdf):
+        """Test a child whose memory keeps growing is killed."""
+        result = sandboxed(BloatingExtractor, tmp_pdf, timeout_seconds=30, max_memory_bytes=300 << 20)
+
+        assert result.errors == ["Extraction stopped: exceeded the memory limit of 300 MB"]
+        assert result.metadata.file_format == FileFormat.PDF
+
+    def test_single_huge_allocation_fails_in_child(self, tmp_pdf):
+        """Test the address space cap stops an allocation polling cannot see."""
+        result = sandboxed(GreedyExtractor, tmp_pdf, timeout_seconds=30, max_memory_bytes=300 << 20)
+        assert result.errors == ["Extraction stopped: exceeded the memory limit of 300 MB"]
+
+    def test_crash_is_reported(self, tmp_pdf):
+        """Test a child killed by a signal yields a result explaining it."""
+        result = sandboxed(CrashingExtractor, tmp_pdf, timeout_seconds=30)
+
+        assert result.errors == ["Extraction stopped: extraction process died (killed by signal 11)"]
+        assert result.metadata.source_filename == tmp_pdf.name
+
+    def test_extractor_error_is_reported(self, tmp_path):
+        """Test an exception in the child becomes an error, not a crash."""
+        broken = tmp_path / "broken.pdf"
+        broken.write_bytes(b"%PDF-1.7 nothing else")
+        result = sandboxed(PDFExtractor, broken, timeout_seconds=30)
+
+        assert result.errors[0].startswith("Document extraction failed:")
+        assert not was_stopped(result)
+
+    def test_in_memory_document(self, tmp_pdf):
+        """Test buffers reach the child."""
+        document = DocumentSource.from_input(memoryview(tmp_pdf.read_bytes()), "report.pdf")
+        result = run_sandboxed(PDFExtractor, document, None, SandboxLimits(timeout_seconds=30))
+        assert "Test Document Title" in result.markdown
+
+
+class TestSandboxLimits:
+    """Tests for SandboxLimits model."""
+
+    def test_limits_must_be_positive(self):
+        """Test zero or negative limits are rejected."""
+        with pytest.raises(ValueError):
+            SandboxLimits(timeout_seconds=0)
+        with pytest.raises(ValueError):
+            SandboxLimits(max_memory_bytes=-1)
+
+
+class TestRouterSandbox:
+    """Tests for DocumentRouter(sandbox=...)."""
+
+    def test_process_document_in_sandbox(self, tmp_docx):
+        """Test the router extracts through the sandbox when configured."""
+        router = DocumentRouter(sandbox=SandboxLimits(timeout_seconds=30))
+        result = router.process_document(tmp_docx)
+        assert result.markdown == DocumentRouter().process_document(tmp_docx).markdown
+
+    @pytest.mark.parametrize("fixture", ["tmp_pdf", "tmp_docx", "tmp_pptx", "tmp_xlsx"])
+    def test_same_result_as_in_process(self, fixture, request):
+        """Test every supported format extracts the same with and without the sandbox."""
+        path = request.getfixturevalue(fixture)
+        sandboxed_result = DocumentRouter(sandbox=SandboxLimits(timeout_seconds=30)).process_document(path)
+        expected = DocumentRouter().process_document(path)
+        # Streamed extractions carry no stats (see LIMITATIONS.md)
+        assert sandboxed_result.model_dump(exclude={"stats"}) == expected.model_dump(exclude={"stats"})
+
+    def test_stopped_results_are_not_cached(self, tmp_multipage_pdf, tmp_path, monkeypatch):
+        """Test a result cut short by the sandbox never reaches the cache."""
+        monkeypatch.setattr("src.router.load_extractor", lambda spec: StallingExtractor)
+        cache = ResultCache(tmp_path / "cache")
+        router = DocumentRouter(cache=cache, sandbox=SandboxLimits(timeout_seconds=0.5))
+
+        assert was_stopped(router.process_document(tmp_multipage_pdf))
+        assert not any(cache.directory.iterdir())
+
+    def test_process_many_uses_sandbox(self, tmp_pdf, tmp_docx):
+        """Test batch workers inherit the sandbox limits."""
+        router = DocumentRouter(sandbox=SandboxLimits(timeout_seconds=30))
+        results = dict(router.process_many([tmp_pdf, tmp_docx], workers=2))
+        assert all(result.errors == [] for result in results.values())
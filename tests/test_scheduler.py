@@ -0,0 +1,174 @@
+"""
+Tests for size-aware batch scheduling.
+"""
+
+import pytest
+
+from src.cache import ResultCache
+from src.models import ExtractionOptions, FileFormat, SandboxLimits
+from src.router import DocumentRouter
+from src.scheduler import CostModel, DocumentScheduler, PartReport, ScheduleReport
+
+
+def splitting_scheduler(**kwargs) -> DocumentScheduler:
+    """Scheduler whose target task cost is small enough to split test PDFs."""
+    return DocumentScheduler(min_task_seconds=0, **kwargs)
+
+
+class TestCostModel:
+    """Tests for CostModel."""
+
+    def test_estimate(self):
+        """Test cost is the format's fixed cost plus units times its rate."""
+        model = CostModel(
+            seconds_per_document={FileFormat.PDF: 0.1},
+            seconds_per_unit={FileFormat.PDF: 0.01},
+        )
+        assert model.estimate(FileFormat.PDF, 50) == pytest.approx(0.6)
+        assert model.estimate(FileFormat.DOCX, 3) == 0.0
+
+    def test_calibrated_fits_line(self):
+        """Test calibration fits fixed cost and rate, ignoring failed parts."""
+        report = ScheduleReport(parts=[
+            PartReport(path="a.pdf", file_format=FileFormat.PDF, units=10,
+                       predicted_seconds=0.1, actual_seconds=0.3),
+            PartReport(path="b.pdf", file_format=FileFormat.PDF, units=30,
+                       predicted_seconds=0.2, actual_seconds=0.7),
+            PartReport(path="c.pdf", file_format=FileFormat.PDF, units=100,
+                       predicted_seconds=0.5, actual_seconds=0.0, failed=True),
+        ])
+
+        model = CostModel()
+        calibrated = model.calibrated(report)
+        assert calibrated.seconds_per_document[FileFormat.PDF] == pytest.approx(0.1)
+        assert calibrated.seconds_per_unit[FileFormat.PDF] == pytest.approx(0.02)
+        assert calibrated.seconds_per_unit[FileFormat.DOCX] == model.seconds_per_unit[FileFormat.DOCX]
+
+    def test_calibrated_same_size_keeps_fixed_cost(self):
+        """Test equal-sized parts refit only the rate."""
+        report = ScheduleReport(parts=[
+            PartReport(path=f"{i}.docx", file_format=FileFormat.DOCX, units=0.5,
+                       predicted_seconds=1.0, actual_seconds=seconds)
+            for i, seconds in enumerate([1.0, 1.2])
+        ])
+        model = CostModel(seconds_per_document={FileFormat.DOCX: 0.1})
+        calibrated = model.calibrated(report)
+
+        assert calibrated.seconds_per_document[FileFormat.DOCX] == 0.1
+        assert calibrated.seconds_per_unit[FileFormat.DOCX] == pytest.approx(2.0)
+
+
+class TestPlan:
+    """Tests for DocumentScheduler.plan()."""
+
+    def test_large_pdf_is_split_in_page_order(self, tmp_multipage_pdf):
+        """Test a PDF above the target cost becomes contiguous page ranges."""
+        tasks = splitting_scheduler(workers=2).plan([tmp_multipage_pdf])
+        ranges = sorted(part.pages for task in tasks for part in task)
+
+        assert len(ranges) > 1
+        assert ranges[0][0] == 0 and ranges[-1][1] == 6
+        assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:]))
+
+    def test_split_respects_page_range(self, tmp_multipage_pdf):
+        """Test only the selected pages are planned."""
+        options = ExtractionOptions(page_range=(2, 4))
+        tasks = splitting_scheduler(workers=2).plan([tmp_multipage_pdf], options)
+        ranges = sorted(part.pages for task in tasks for part in task)
+        assert ranges[0][0] == 1 and ranges[-1][1] == 4
+
+    def test_small_documents_are_packed(self, tmp_pdf, tmp_docx, tmp_xlsx):
+        """Test cheap documents share one task below the minimum task cost."""
+        tasks = DocumentScheduler(workers=2).plan([tmp_pdf, tmp_docx, tmp_xlsx])
+        assert len(tasks) == 1
+        assert all(part.pages is None for part in tasks[0])
+
+    def test_longest_first(self, tmp_pdf, tmp_multipage_pdf, tmp_docx):
+        """Test tasks are ordered by decreasing predicted cost."""
+        tasks = DocumentScheduler(workers=4, min_task_seconds=0.001).plan(
+            [tmp_pdf, tmp_docx, tmp_multipage_pdf]
+        )
+        costs = [sum(part.predicted_seconds for part in task) for task in tasks]
+        assert costs == sorted(costs, reverse=True)
+
+    def test_sandboxed_router_never_splits(self, tmp_multipage_pdf):
+        """Test documents stay whole when each must run in its own sandbox."""
+        router = DocumentRouter(sandbox=SandboxLimits(timeout_seconds=30))
+        tasks = splitting_scheduler(router=router, workers=2).plan([tmp_multipage_pdf])
+        assert [part.pages for task in tasks for part in task] == [None]
+
+    def test_unreadable_document_is_planned(self, tmp_path):
+        """Test a file that cannot be probed still gets a task."""
+        missing = tmp_path / "missing.pdf"
+        [[part]] = DocumentScheduler(workers=1).plan([missing])
+        assert part.file_format == FileFormat.UNKNOWN
+
+    def test_invalid_workers(self):
+        """Test workers below 1 is rejected."""
+        with pytest.raises(ValueError):
+            DocumentScheduler(workers=0)
+
+
+class TestRun:
+    """Tests for DocumentScheduler.run()."""
+
+    def test_split_result_matches_process_document(self, tmp_multipage_pdf, tmp_pdf):
+        """Test a PDF walked in page ranges gets its whole-document result."""
+        batch = splitting_scheduler(workers=2).run([tmp_multipage_pdf, tmp_pdf])
+        router = DocumentRouter()
+
+        assert [path for path, _ in batch.results] == [tmp_multipage_pdf, tmp_pdf]
+        assert batch.results[0][1] == router.process_document(tmp_multipage_pdf)
+        assert batch.results[1][1] == router.process_document(tmp_pdf)
+
+    def test_in_process(self, tmp_multipage_pdf, tmp_docx):
+        """Test workers=1 runs the same plan in this process."""
+        batch = splitting_scheduler(workers=1).run([tmp_docx, tmp_multipage_pdf])
+        assert batch.results[1][1] == DocumentRouter().process_document(tmp_multipage_pdf)
+        assert batch.results[0][1].errors == []
+
+    def test_report_covers_every_part(self, tmp_multipage_pdf, tmp_docx):
+        """Test the report has predicted and measured cost per part."""
+        batch = splitting_scheduler(workers=2).run([tmp_multipage_pdf, tmp_docx])
+        report = batch.report
+
+        pdf_parts = [part for part in report.parts if part.file_format == FileFormat.PDF]
+        assert sum(part.units for part in pdf_parts) == 6
+        assert all(part.actual_seconds > 0 for part in report.parts)
+        assert report.tasks >= len(pdf_parts)
+        assert report.wall_seconds > 0
+        assert report.predicted_seconds > 0
+
+    def test_failures_are_isolated(self, tmp_pdf, tmp_path):
+        """Test a failing file yields an error result and the rest succeed."""
+        broken = tmp_path / "broken.pdf"
+        broken.write_bytes(b"%PDF-1.7 nothing else")
+        batch = DocumentScheduler(workers=2).run([broken, tmp_pdf])
+
+        assert batch.results[0][1].errors[0].startswith("Document extraction failed:")
+        assert batch.results[1][1].errors == []
+        assert [part.failed for part in batch.report.parts] == [True, False]
+
+    def test_single_worker_keeps_callers_mupdf_store(self, tmp_multipage_pdf, monkeypatch):
+        """Test in-process tasks leave MuPDF's store of the caller alone."""
+        import fitz
+
+        shrinks = []
+        monkeypatch.setattr(fitz.TOOLS, "store_shrink", shrinks.append)
+        result = splitting_scheduler(workers=1).run([tmp_multipage_pdf])
+        assert result.results[0][1].markdown
+        assert shrinks == []
+
+    def test_split_pdf_is_cached(self, tmp_multipage_pdf, tmp_path):
+        """Test a split PDF is stored whole and served from the cache next time."""
+        cache = ResultCache(tmp_path / "cache")
+        scheduler = splitting_scheduler(router=DocumentRouter(cache=cache), workers=2)
+
+        options = ExtractionOptions(record_stats=True)
+        first = scheduler.run([tmp_multipage_pdf], options).results[0][1]
+        second = scheduler.run([tmp_multipage_pdf], options)
+        cached = second.results[0][1]
+        assert cached.model_dump(exclude={"stats"}) == first.model_dump(exclude={"stats"})
+        assert cached.stats.from_result_cache
+        assert second.report.parts == []
+        assert cache.hits == 1
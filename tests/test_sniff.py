@@ -0,0 +1,81 @@
+"""
+Tests for content-based format detection.
+"""
+
+import io
+import tracemalloc
+import zipfile
+
+from src.models import FileFormat
+from src.sniff import sniff_format
+from src.source import DocumentSource
+
+
+def sniff_bytes(data: bytes) -> FileFormat | None:
+    """Sniff an in-memory document."""
+    return sniff_format(DocumentSource.from_input(data))
+
+
+class TestSniffFormat:
+    """Tests for sniff_format function."""
+
+    def test_pdf(self, tmp_pdf):
+        """Test PDFs are recognised by their header."""
+        assert sniff_format(DocumentSource.from_input(tmp_pdf)) == FileFormat.PDF
+
+    def test_pdf_header_after_leading_junk(self, tmp_pdf):
+        """Test a header within the first KB is accepted, as readers do."""
+        assert sniff_bytes(b"\x00" * 100 + tmp_pdf.read_bytes()) == FileFormat.PDF
+
+    def test_ooxml_packages(self, tmp_docx, tmp_pptx, tmp_xlsx):
+        """Test OOXML packages are told apart by their part directories."""
+        assert sniff_format(DocumentSource.from_input(tmp_docx)) == FileFormat.DOCX
+        assert sniff_format(DocumentSource.from_input(tmp_pptx)) == FileFormat.PPTX
+        assert sniff_format(DocumentSource.from_input(tmp_xlsx)) == FileFormat.XLSX
+
+    def test_plain_zip_is_unknown(self):
+        """Test a zip without OOXML parts is not claimed."""
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as archive:
+            archive.writestr("notes.txt", "hello")
+        assert sniff_bytes(buffer.getvalue()) is None
+
+    def test_truncated_zip_is_unknown(self, tmp_docx):
+        """Test a zip cut short before its central directory is not claimed."""
+        assert sniff_bytes(tmp_docx.read_bytes()[:2000]) is None
+
+    def test_other_content_is_unknown(self):
+        """Test unrecognised content yields None."""
+        assert sniff_bytes(b"just some text") is None
+        assert sniff_bytes(b"") is None
+
+    def test_pdf_marker_in_package_head(self):
+        """Test a package whose first KB contains "%PDF-" is still sniffed as OOXML."""
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_STORED) as archive:
+            archive.writestr("%PDF-attachment.xml", "<x/>")
+            archive.writestr("word/document.xml", "<w:document/>")
+        assert b"%PDF-" in buffer.getvalue()[:1024]
+        assert sniff_bytes(buffer.getvalue()) == FileFormat.DOCX
+
+    def test_large_memoryview_is_not_copied(self, tmp_docx):
+        """Test sniffing a large buffer reads only its head and zip directory."""
+        package = tmp_docx.read_bytes()
+        # A 64 MB zip: stored padding entry first, real parts after
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_STORED) as archive:
+            archive.writestr("padding.bin", bytes(64 << 20))
+            with zipfile.ZipFile(io.BytesIO(package)) as docx:
+                for name in docx.namelist():
+                    archive.writestr(name, docx.read(name))
+        data = memoryview(buffer.getbuffer())
+
+        tracemalloc.start()
+        try:
+            file_format = sniff_format(DocumentSource.from_input(data, filename="big.bin"))
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+            data.release()
+        assert file_format == FileFormat.DOCX
+        assert peak < 1 << 20
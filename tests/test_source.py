@@ -0,0 +1,108 @@
+"""
+Tests for document sources.
+"""
+
+import io
+import mmap
+import tracemalloc
+import zipfile
+
+import pytest
+
+from src.cache import file_digest
+from src.source import UNNAMED_SOURCE, BufferReader, DocumentSource
+
+
+class TestDocumentSource:
+    """Tests for DocumentSource.from_input()."""
+
+    def test_path(self, tmp_pdf):
+        """Test paths keep their name and on-disk size."""
+        source = DocumentSource.from_input(str(tmp_pdf))
+        assert source.path == tmp_pdf and source.data is None
+        assert source.name == "test.pdf"
+        assert source.size == tmp_pdf.stat().st_size
+
+    def test_missing_path(self, tmp_path):
+        """Test a missing file raises FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            DocumentSource.from_input(tmp_path / "missing.pdf")
+
+    def test_bytes_are_not_copied(self, tmp_pdf):
+        """Test bytes are used as-is and named by the filename argument."""
+        data = tmp_pdf.read_bytes()
+        source = DocumentSource.from_input(data, filename="upload.pdf")
+        assert source.data is data
+        assert source.name == "upload.pdf" and source.suffix == ".pdf"
+        assert source.size == len(data)
+
+    def test_mmap_is_wrapped_in_memoryview(self, tmp_pdf):
+        """Test mmaps are read through a zero-copy memoryview."""
+        with open(tmp_pdf, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            source = DocumentSource.from_input(mapped)
+            assert isinstance(source.data, memoryview)
+            assert source.size == tmp_pdf.stat().st_size
+            assert source.name == UNNAMED_SOURCE
+            source.data.release()
+
+    def test_file_object_uses_its_name(self, tmp_pdf):
+        """Test binary file objects are read and named after their file."""
+        with open(tmp_pdf, "rb") as f:
+            source = DocumentSource.from_input(f)
+        assert source.name == "test.pdf"
+        assert source.open_binary().read() == tmp_pdf.read_bytes()
+
+    def test_text_stream_is_rejected(self):
+        """Test text-mode file objects raise TypeError."""
+        with pytest.raises(TypeError, match="binary mode"):
+            DocumentSource.from_input(io.StringIO("not a document"))
+
+    def test_unsupported_type_is_rejected(self):
+        """Test other objects raise TypeError."""
+        with pytest.raises(TypeError, match="Unsupported document source"):
+            DocumentSource.from_input(42)
+
+    def test_digest_matches_file(self, tmp_pdf):
+        """Test a buffer hashes like the file holding the same bytes."""
+        source = DocumentSource.from_input(tmp_pdf.read_bytes())
+        assert source.digest() == file_digest(tmp_pdf)
+
+
+class TestOpenBinary:
+    """Tests for DocumentSource.open_binary()."""
+
+    def test_memoryview_is_not_copied(self):
+        """Test a large memoryview is read in place, not copied into a BytesIO."""
+        data = memoryview(bytearray(64 << 20))
+        tracemalloc.start()
+        try:
+            with DocumentSource.from_input(data).open_binary() as f:
+                f.seek(-4, io.SEEK_END)
+                assert f.read() == b"\0" * 4
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        assert peak < 1 << 20
+
+    def test_bytes_use_bytesio(self, tmp_pdf):
+        """Test bytes are opened as a BytesIO, which shares their buffer."""
+        data = tmp_pdf.read_bytes()
+        with DocumentSource.from_input(data).open_binary() as f:
+            assert isinstance(f, io.BytesIO)
+            assert f.read() == data
+
+    def test_buffer_reader_reads_zip(self, tmp_docx):
+        """Test zipfile can read a package through a BufferReader."""
+        with zipfile.ZipFile(BufferReader(memoryview(tmp_docx.read_bytes()))) as package:
+            assert "word/document.xml" in package.namelist()
+            assert package.read("word/document.xml").startswith(b"<?xml")
+
+    def test_buffer_reader_seek_and_read(self):
+        """Test reads and seeks behave like a binary file."""
+        f = BufferReader(memoryview(b"0123456789"))
+        assert f.read(3) == b"012"
+        assert f.seek(2, io.SEEK_CUR) == 5
+        assert f.read() == b"56789"
+        assert f.read(1) == b""
+        f.seek(-2, io.SEEK_END)
+        assert f.tell() == 8 and f.read(5) == b"89"
@@ -0,0 +1,110 @@
+"""
+Tests for extraction statistics recording.
+"""
+
+import pytest
+
+from src.models import (
+    DocumentMetadata,
+    ExtractionResult,
+    ExtractionStage,
+    ExtractionStats,
+    FileFormat,
+    StageTiming,
+    TableData,
+)
+from src.stats import StatsRecorder, Stopwatch, bytes_read, peak_rss_bytes
+
+
+def make_result(**kwargs) -> ExtractionResult:
+    """ExtractionResult with minimal metadata."""
+    metadata = DocumentMetadata(file_format=FileFormat.PDF, file_size_bytes=1, source_filename="a.pdf")
+    return ExtractionResult(metadata=metadata, **kwargs)
+
+
+class TestStatsRecorder:
+    """Tests for StatsRecorder."""
+
+    def test_stage_accumulates(self):
+        """Test repeated stage blocks add up, also when a block raises."""
+        recorder = StatsRecorder()
+        with recorder.stage(ExtractionStage.TEXT):
+            sum(range(10_000))
+        with pytest.raises(RuntimeError):
+            with recorder.stage(ExtractionStage.TEXT):
+                raise RuntimeError("broke")
+        recorder.add(ExtractionStage.TEXT, 1.0, 0.5)
+
+        timing = recorder.stages[ExtractionStage.TEXT]
+        assert timing.wall_seconds > 1.0
+        assert timing.cpu_seconds > 0.5
+
+    def test_finish_fills_totals_and_counts(self):
+        """Test finish() adds totals and result counts to the stats."""
+        recorder = StatsRecorder()
+        recorder.add(ExtractionStage.TABLES, 0.25, 0.25)
+        result = make_result(markdown="# Title\n\nBody.", tables=[TableData(content=[["a"]])])
+        stats = recorder.finish(result)
+
+        assert stats.wall_seconds >= 0 and stats.cpu_seconds >= 0
+        assert stats.stages[ExtractionStage.TABLES].wall_seconds == 0.25
+        assert stats.text_blocks == 2
+        assert stats.tables_found == 1 and stats.images_found == 0
+        assert stats.peak_memory_delta_bytes >= 0
+
+    def test_finish_keeps_extractor_stats(self):
+        """Test counters set by the extractor survive and stage times are summed."""
+        recorder = StatsRecorder()
+        recorder.add(ExtractionStage.TEXT, 0.5, 0.5)
+        existing = ExtractionStats(
+            table_pages_skipped=3,
+            text_blocks=7,
+            stages={ExtractionStage.TEXT: StageTiming(wall_seconds=0.5, cpu_seconds=0.5)},
+        )
+        stats = recorder.finish(make_result(markdown="", stats=existing))
+
+        assert stats.table_pages_skipped == 3
+        assert stats.text_blocks == 7
+        assert stats.stages[ExtractionStage.TEXT].wall_seconds == 1.0
+
+
+class TestStopwatch:
+    """Tests for Stopwatch."""
+
+    def test_laps_split_the_page(self):
+        """Test stage laps add up to no more than the page time."""
+        watch = Stopwatch()
+        watch.reset()
+        sum(range(10_000))
+        watch.lap(ExtractionStage.TEXT)
+        watch.lap(ExtractionStage.IMAGES)
+        page, wall, cpu = watch.page(3)
+
+        assert page == 3
+        assert set(watch.stages) == {ExtractionStage.TEXT, ExtractionStage.IMAGES}
+        assert sum(w for w, _ in watch.stages.values()) <= wall
+
+    def test_reset_clears_stages(self):
+        """Test a new visit starts without the previous page's laps."""
+        watch = Stopwatch()
+        watch.lap(ExtractionStage.TEXT)
+        watch.reset()
+        assert watch.stages == {}
+
+
+class TestProcessCounters:
+    """Tests for the process counters."""
+
+    def test_bytes_read_counts_reads(self, tmp_path):
+        """Test reading a file advances the counter where it is available."""
+        before = bytes_read()
+        if before is None:
+            pytest.skip("/proc/self/io not available")
+        path = tmp_path / "data.bin"
+        path.write_bytes(b"x" * 100_000)
+        path.read_bytes()
+        assert bytes_read() - before >= 100_000
+
+    def test_peak_rss_is_positive(self):
+        """Test the peak resident memory is reported in bytes."""
+        assert peak_rss_bytes() > 1 << 20
@@ -0,0 +1,214 @@
+"""
+Tests for tracing hooks and the built-in tracers.
+"""
+
+import json
+import logging
+import os
+
+import pytest
+
+from src import tracing
+from src.extractors import DOCXExtractor, PDFExtractor
+from src.router import DocumentRouter
+from src.tracing import ChromeTraceExporter, LoggingTracer, Tracer
+
+
+class RecordingTracer(Tracer):
+    """Tracer that keeps every callback in order."""
+
+    def __init__(self):
+        self.calls = []
+
+    def start_span(self, name, attributes):
+        self.calls.append(("start", name, attributes))
+        return name
+
+    def end_span(self, handle, attributes):
+        self.calls.append(("end", handle, attributes))
+
+    def names(self, kind="start"):
+        """Span names in order of their start or end callbacks."""
+        return [name for call, name, _ in self.calls if call == kind]
+
+
+@pytest.fixture
+def recorder():
+    """A RecordingTracer installed for the duration of a test."""
+    tracer = RecordingTracer()
+    previous = tracing.set_tracer(tracer)
+    yield tracer
+    tracing.set_tracer(previous)
+
+
+class TestSpan:
+    """Tests for span() and the tracer registry."""
+
+    def test_noop_without_tracer(self):
+        """Test span() hands out one shared no-op context manager."""
+        assert tracing.get_tracer() is None
+        assert tracing.span("a") is tracing.span("b", page=1)
+        with tracing.span("a"):
+            pass
+
+    def test_calls_tracer(self, recorder):
+        """Test start and end callbacks carry the span's attributes."""
+        with tracing.span("page", page=3):
+            pass
+        assert recorder.calls == [("start", "page", {"page": 3}), ("end", "page", {})]
+
+    def test_error_attribute(self, recorder):
+        """Test a raising block ends its span with the error."""
+        with pytest.raises(ValueError):
+            with tracing.span("text"):
+                raise ValueError("bad font")
+        assert recorder.calls[-1] == ("end", "text", {"error": "bad font"})
+
+    def test_closed_generator_ends_span(self, recorder):
+        """Test a span around a yield ends as stopped when the consumer stops early."""
+        def events():
+            with tracing.span("body"):
+                yield 1
+                yield 2
+
+        stream = events()
+        next(stream)
+        stream.close()
+        assert recorder.calls[-1] == ("end", "body", {"stopped": True})
+
+    def test_set_tracer_returns_previous(self, recorder):
+        """Test installing a tracer hands back the one it replaces."""
+        other = Tracer()
+        assert tracing.set_tracer(other) is recorder
+        assert tracing.set_tracer(recorder) is other
+
+
+class TestExtractorSpans:
+    """Tests for the spans extractors report."""
+
+    def test_pdf_pages_nest_stages(self, recorder, tmp_multipage_pdf):
+        """Test a PDF reports extract_all, a span per page and stages inside pages."""
+        PDFExtractor(tmp_multipage_pdf).extract_all()
+
+        starts = recorder.names()
+        assert starts[0] == "extract_all"
+        assert starts[1:5] == ["page", "text", "tables", "images"]
+        assert starts.count("page") == 6
+        assert "metadata" in starts
+        assert recorder.calls[0][2]["extractor"] == "PDFExtractor"
+        assert recorder.calls[-1][:2] == ("end", "extract_all")
+
+    def test_page_attributes(self, recorder, tmp_multipage_pdf):
+        """Test page spans carry the page number and what was found."""
+        PDFExtractor(tmp_multipage_pdf).extract_all()
+        pages = [attrs["page"] for call, name, attrs in recorder.calls if (call, name) == ("start", "page")]
+        ends = [attrs for call, name, attrs in recorder.calls if (call, name) == ("end", "page")]
+        assert pages == [1, 2, 3, 4, 5, 6]
+        assert sum(attrs["tables"] for attrs in ends) == 1
+
+    def test_docx_body_span(self, recorder, tmp_docx):
+        """Test DOCX reports its body walk, with a span per table and none per paragraph."""
+        DOCXExtractor(tmp_docx).extract_all()
+        starts = recorder.names()
+        assert starts[:3] == ["extract_all", "metadata", "body"]
+        assert "tables" in starts and "text" not in starts
+        assert starts[-1] == "images"
+
+    def test_spans_balanced(self, recorder, tmp_multipage_pdf, tmp_docx):
+        """Test every started span is ended."""
+        PDFExtractor(tmp_multipage_pdf).extract_all()
+        DOCXExtractor(tmp_docx).extract_all()
+        assert sorted(recorder.names("start")) == sorted(recorder.names("end"))
+
+    @pytest.mark.parametrize(
+        ("extractor_class", "fixture"),
+        [(PDFExtractor, "tmp_multipage_pdf"), (DOCXExtractor, "tmp_docx")],
+    )
+    def test_spans_balanced_when_stream_stops_early(self, recorder, extractor_class, fixture, request):
+        """Test closing iter_extract() part way leaves no span open."""
+        with extractor_class(request.getfixturevalue(fixture)) as extractor:
+            stream = extractor.iter_extract()
+            for _ in zip(range(4), stream):
+                pass
+            stream.close()
+        assert recorder.names("start")
+        assert sorted(recorder.names("start")) == sorted(recorder.names("end"))
+
+    def test_page_span_ends_when_page_raises(self, recorder, tmp_multipage_pdf, monkeypatch):
+        """Test a page whose reading raises still ends its span, with the error."""
+        extractor = PDFExtractor(tmp_multipage_pdf)
+
+        def fail(*args):
+            raise RuntimeError("broken page")
+
+        monkeypatch.setattr(extractor, "_read_tables", fail)
+        with pytest.raises(RuntimeError):
+            list(extractor.iter_extract())
+        assert sorted(recorder.names("start")) == sorted(recorder.names("end"))
+        page_ends = [attrs for call, name, attrs in recorder.calls if (call, name) == ("end", "page")]
+        assert page_ends[-1] == {"error": "broken page"}
+
+
+class TestChromeTraceExporter:
+    """Tests for the Chrome trace-event exporter."""
+
+    def test_writes_complete_events(self, tmp_multipage_pdf, tmp_path):
+        """Test the trace is a JSON object of complete events with durations."""
+        path = tmp_path / "trace.json"
+        with ChromeTraceExporter(path) as exporter:
+            assert tracing.get_tracer() is exporter
+            PDFExtractor(tmp_multipage_pdf).extract_all()
+        assert tracing.get_tracer() is None
+
+        events = json.loads(path.read_text())["traceEvents"]
+        assert {event["ph"] for event in events} == {"X"}
+        assert [e["args"]["page"] for e in events if e["name"] == "page"] == [1, 2, 3, 4, 5, 6]
+        [outer] = [e for e in events if e["name"] == "extract_all"]
+        assert all(outer["ts"] <= e["ts"] and e["dur"] <= outer["dur"] for e in events)
+
+    def test_unfinished_trace_is_an_event_array(self, tmp_pdf, tmp_path):
+        """Test events are on disk before close(), as an unterminated array."""
+        path = tmp_path / "trace.json"
+        exporter = ChromeTraceExporter(path)
+        previous = tracing.set_tracer(exporter)
+        try:
+            PDFExtractor(tmp_pdf).extract_all()
+            lines = path.read_text().splitlines()
+        finally:
+            tracing.set_tracer(previous)
+            exporter.close()
+        assert lines[0] == "["
+        assert json.loads(lines[-1].rstrip(","))["name"] == "extract_all"
+
+    def test_worker_processes_share_the_trace(self, tmp_pdf, tmp_docx, tmp_path):
+        """Test batch workers append their spans under their own pids."""
+        path = tmp_path / "trace.json"
+        with ChromeTraceExporter(path):
+            list(DocumentRouter().process_many([tmp_pdf, tmp_docx], workers=2))
+
+        events = json.loads(path.read_text())["traceEvents"]
+        documents = {e["args"]["document"] for e in events if e["name"] == "extract_all"}
+        assert documents == {tmp_pdf.name, tmp_docx.name}
+        assert os.getpid() not in {e["pid"] for e in events}
+
+
+class TestLoggingTracer:
+    """Tests for LoggingTracer."""
+
+    def test_logs_spans(self, tmp_pdf):
+        """Test each finished span is logged with its name and attributes."""
+        tracer = LoggingTracer("tests.tracing")
+        records = []
+        handler = logging.Handler()
+        handler.emit = records.append
+        tracer.logger.addHandler(handler)
+        previous = tracing.set_tracer(tracer)
+        try:
+            PDFExtractor(tmp_pdf).extract_all()
+        finally:
+            tracing.set_tracer(previous)
+            tracer.logger.removeHandler(handler)
+
+        messages = [record.getMessage() for record in records]
+        assert messages[-1].startswith("extract_all ")
+        assert any(m.startswith("page ") and "'page': 1" in m for m in messages)
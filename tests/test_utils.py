@@ -2,6 +2,8 @@
 Tests for utility functions.
 """
 
+from datetime import datetime, timezone
+
 import pytest
 
 from src.utils.markdown_helpers import (
@@ -12,6 +14,17 @@ from src.utils.markdown_helpers import (
     normalize_whitespace,
     table_to_json,
 )
+import numpy as np
+
+from src.utils.headings import (
+    estimate_heading_thresholds,
+    font_size_levels,
+    normalize_heading,
+    outline_levels,
+    sample_pages,
+    threshold_level,
+)
+from src.utils.dates import parse_w3cdtf
 from src.models import TableData
 
 
@@ -145,3 +158,103 @@ class TestTableToJson:
         result = table_to_json(table)
         assert result["headers"] == ["a", "b"]
         assert result["rows"] == []
+
+
+class TestFontSizeLevels:
+    """Tests for font_size_levels function."""
+
+    def test_largest_sizes_become_top_levels(self):
+        """Test the three largest sizes ≥14pt map to H1-H3."""
+        levels = font_size_levels({11.0, 14.0, 16.0, 18.0, 24.0})
+        assert levels == {24.0: 1, 18.0: 2, 16.0: 3}
+
+    def test_small_sizes_are_not_headings(self):
+        """Test sizes below 14pt never become headings."""
+        assert font_size_levels({9.0, 11.0, 12.0}) == {}
+
+
+class TestOutlineLevels:
+    """Tests for outline_levels function."""
+
+    def test_indexes_titles_by_page(self):
+        """Test entries are grouped by page with normalized titles."""
+        toc = [[1, "Overview", 1], [2, "  Key   Results ", 2]]
+        assert outline_levels(toc, 3) == {1: {"overview": 1}, 2: {"key results": 2}}
+
+    def test_ignores_entries_outside_document(self):
+        """Test entries without a valid target page are dropped."""
+        assert outline_levels([[1, "External", -1], [1, "Late", 9]], 3) is None
+
+    def test_empty_outline_is_none(self):
+        """Test an empty outline is reported as unusable."""
+        assert outline_levels([], 3) is None
+
+    def test_normalize_heading(self):
+        """Test normalize_heading collapses whitespace and case."""
+        assert normalize_heading("  Annual\n  FILING ") == "annual filing"
+
+
+class TestEstimateHeadingThresholds:
+    """Tests for the character-weighted heading threshold estimator."""
+
+    def test_picks_sizes_above_body_text(self):
+        """Test heading sizes are the large sizes carrying real text."""
+        sizes = np.array([11.0, 11.0, 24.0, 18.0, 14.0])
+        chars = np.array([500, 300, 12, 20, 30])
+        assert estimate_heading_thresholds(sizes, chars) == [24.0, 18.0, 14.0]
+
+    def test_ignores_single_oversize_glyph(self):
+        """Test a lone large glyph does not become H1."""
+        sizes = np.array([11.0, 48.0, 20.0])
+        chars = np.array([800, 1, 15])
+        assert estimate_heading_thresholds(sizes, chars) == [20.0]
+
+    def test_body_size_is_never_a_heading(self):
+        """Test a document set entirely in a large font has no headings."""
+        sizes = np.array([16.0, 16.0])
+        chars = np.array([400, 400])
+        assert estimate_heading_thresholds(sizes, chars) == []
+
+    def test_empty_sample(self):
+        """Test an empty sample yields no thresholds."""
+        assert estimate_heading_thresholds(np.array([]), np.array([])) == []
+
+
+class TestThresholdLevel:
+    """Tests for threshold_level function."""
+
+    def test_maps_between_thresholds(self):
+        """Test sizes between thresholds take the lower threshold's level."""
+        thresholds = [24.0, 18.0, 14.0]
+        assert threshold_level(30.0, thresholds) == 1
+        assert threshold_level(20.0, thresholds) == 2
+        assert threshold_level(14.0, thresholds) == 3
+        assert threshold_level(11.0, thresholds) is None
+        assert threshold_level(None, thresholds) is None
+
+
+class TestSamplePages:
+    """Tests for sample_pages function."""
+
+    def test_small_documents_use_every_page(self):
+        """Test documents shorter than the sample are fully read."""
+        assert sample_pages(4, 10) == [0, 1, 2, 3]
+
+    def test_sample_is_bounded_and_spans_document(self):
+        """Test the sample size is capped and includes both ends."""
+        pages = sample_pages(1000, 5)
+        assert len(pages) == 5
+        assert pages[0] == 0 and pages[-1] == 999
+
+
+class TestParseW3CDTF:
+    """Tests for parse_w3cdtf function."""
+
+    def test_parses_zoned_and_partial_dates(self):
+        """Test UTC, offset and year-only dates all become UTC."""
+        utc = timezone.utc
+        assert parse_w3cdtf("2024-01-15T12:00:00Z") == datetime(2024, 1, 15, 12, tzinfo=utc)
+        assert parse_w3cdtf("2024-01-15T12:00:00+02:00") == datetime(2024, 1, 15, 10, tzinfo=utc)
+        assert parse_w3cdtf("2024") == datetime(2024, 1, 1, tzinfo=utc)
+        assert parse_w3cdtf("not a date") is None
+        assert parse_w3cdtf(None) is None